@@ -0,0 +1,112 @@
+# ============================================================
+# File: benchmarks/bench_common.py
+# ============================================================
+"""Shared helpers for the benchmark scripts"""
+import json
+import os
+import shutil
+import statistics
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+import screen_detector
+
+
+def configure_ocr():
+    """
+    Use the bundled Tesseract when present, else fall back to a system
+    `tesseract` on PATH (e.g. on Linux CI). Returns True if OCR is usable.
+    """
+    try:
+        import pytesseract
+    except ImportError:
+        return False
+
+    if screen_detector.OCR_AVAILABLE:
+        # The bundle ships tesseract.exe, which exists but cannot run off Windows
+        try:
+            pytesseract.get_tesseract_version()
+            return True
+        except Exception:
+            screen_detector.OCR_AVAILABLE = False
+
+    system_tesseract = shutil.which("tesseract")
+    if not system_tesseract:
+        return False
+
+    pytesseract.pytesseract.tesseract_cmd = system_tesseract
+    # The bundled tessdata path set by screen_detector does not apply here
+    os.environ.pop("TESSDATA_PREFIX", None)
+    screen_detector.OCR_AVAILABLE = True
+    print(f"✓ Using system Tesseract: {system_tesseract}")
+    return True
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def latency_summary(latencies):
+    """Throughput and latency percentiles (ms) for a list of durations in seconds"""
+    if not latencies:
+        return {"frames": 0}
+    total = sum(latencies)
+    return {
+        "frames": len(latencies),
+        "fps": round(len(latencies) / total, 2) if total > 0 else None,
+        "mean_ms": round(statistics.mean(latencies) * 1000.0, 2),
+        "p50_ms": round(percentile(latencies, 50) * 1000.0, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000.0, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000.0, 2),
+        "max_ms": round(max(latencies) * 1000.0, 2),
+    }
+
+
+def precision_recall(predictions, labels):
+    """Precision/recall for parallel lists of booleans"""
+    tp = sum(1 for p, l in zip(predictions, labels) if p and l)
+    fp = sum(1 for p, l in zip(predictions, labels) if p and not l)
+    fn = sum(1 for p, l in zip(predictions, labels) if not p and l)
+    precision = tp / (tp + fp) if (tp + fp) else None
+    recall = tp / (tp + fn) if (tp + fn) else None
+    return {
+        "tp": tp, "fp": fp, "fn": fn,
+        "precision": round(precision, 3) if precision is not None else None,
+        "recall": round(recall, 3) if recall is not None else None,
+    }
+
+
+def print_table(title, rows, columns):
+    """Print a list of dicts as a fixed-width table"""
+    print()
+    print("=" * 60)
+    print(title)
+    print("=" * 60)
+    widths = {c: max([len(c)] + [len(_fmt(r.get(c))) for r in rows]) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(_fmt(row.get(c)).ljust(widths[c]) for c in columns))
+
+
+def _fmt(value):
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def write_json(path, data):
+    if not path:
+        return
+    with open(path, 'w', encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"\n✓ Results written: {path}")
@@ -0,0 +1,121 @@
+# ============================================================
+# File: benchmarks/bench_detectors.py
+# ============================================================
+"""
+Detector benchmark: runs the login detectors over a labelled frame corpus
+and reports throughput, latency percentiles and precision/recall.
+
+Usage:
+    python benchmarks/bench_detectors.py
+    python benchmarks/bench_detectors.py --corpus path/to/corpus --repeat 5 --json results.json
+    python benchmarks/bench_detectors.py --generate      # (re)render the synthetic corpus
+
+Capture is replaced by file input, so this runs on Linux. OCR detectors need
+either the bundled Tesseract (Windows) or a `tesseract` binary on PATH; without
+one they are reported as skipped, and the run fails if nothing was measured.
+"""
+import argparse
+import time
+
+from bench_common import configure_ocr, latency_summary, precision_recall, print_table, write_json
+from corpus import (load_corpus, resolve_corpus_dir, generate_synthetic_corpus,
+                    FileScreenDetector, SYNTHETIC_CORPUS_DIR)
+
+import screen_detector
+
+
+# name -> (label key, detector method name, needs OCR)
+DETECTORS = {
+    "login_ready": ("login_ready", "detect_login_ready", True),
+    "tap_to_land": ("tap_to_land", "detect_tap_to_land_text", True),
+    "login_ready_density": ("login_ready", "detect_login_ready", False),
+    "tap_to_land_density": ("tap_to_land", "detect_tap_to_land_text", False),
+}
+
+
+def run_detector(detector, frames, name, repeat):
+    """Run one detector over all frames; returns the result row"""
+    label_key, method_name, _ = DETECTORS[name]
+    method = getattr(detector, method_name)
+
+    latencies = []
+    predictions = []
+    labels = []
+
+    for frame in frames:
+        detector.set_frame(frame)
+        window_info = detector.find_game_window()
+        screenshot = detector.capture_window(window_info)
+
+        detected = False
+        for _ in range(repeat):
+            start = time.perf_counter()
+            detected, _ = method(screenshot)
+            latencies.append(time.perf_counter() - start)
+
+        predictions.append(detected)
+        labels.append(frame.labels[label_key])
+
+    row = {"detector": name}
+    row.update(latency_summary(latencies))
+    row.update(precision_recall(predictions, labels))
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the login screen detectors")
+    parser.add_argument("--corpus", help="Corpus folder with labels.json (default: recorded, else synthetic)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per frame (default: 3)")
+    parser.add_argument("--detectors", nargs="+", choices=sorted(DETECTORS), help="Subset of detectors to run")
+    parser.add_argument("--generate", action="store_true", help="Regenerate the synthetic corpus first")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_synthetic_corpus(SYNTHETIC_CORPUS_DIR)
+
+    corpus_dir = resolve_corpus_dir(args.corpus)
+    frames = load_corpus(corpus_dir)
+    if not frames:
+        print(f"✗ No frames found in {corpus_dir}")
+        return 1
+
+    # Decode every frame up front so file IO is not timed
+    for frame in frames:
+        frame.load()
+
+    ocr_available = configure_ocr()
+    detector = FileScreenDetector()
+
+    names = args.detectors or list(DETECTORS)
+    skipped = [name for name in names if DETECTORS[name][2] and not ocr_available]
+    if skipped:
+        print(f"⚠ OCR skipped: no tesseract (bundled tesseract.exe only runs on Windows) - "
+              f"not run: {', '.join(skipped)}")
+
+    rows = []
+    for name in names:
+        if name in skipped:
+            continue
+
+        # Detectors read OCR_AVAILABLE at call time, so this selects OCR or pixel-density mode
+        screen_detector.OCR_AVAILABLE = DETECTORS[name][2]
+        try:
+            rows.append(run_detector(detector, frames, name, args.repeat))
+        finally:
+            screen_detector.OCR_AVAILABLE = ocr_available
+
+    if not rows:
+        print("✗ No detector could run")
+        return 1
+
+    print(f"\nCorpus: {corpus_dir} ({len(frames)} frames, {args.repeat} runs each)")
+    print_table("Detector benchmark", rows,
+                ["detector", "frames", "fps", "p50_ms", "p95_ms", "p99_ms", "max_ms", "precision", "recall"])
+
+    write_json(args.json, {"corpus": corpus_dir, "repeat": args.repeat, "results": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+# ============================================================
+# File: benchmarks/bench_fleet.py
+# ============================================================
+"""
+Fleet coordinator benchmark against a localhost coordinator and simulated nodes.
+
+Each simulated node is a real FleetClient flushing batched reports. The
+benchmark measures report latency and sustained reports/s for growing node
+counts, then estimates how many nodes one coordinator can serve at the
+configured flush interval.
+
+Usage:
+    python benchmarks/bench_fleet.py
+    python benchmarks/bench_fleet.py --nodes 10 100 500 --seconds 5 --flush-seconds 30
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import latency_summary, print_table, write_json
+
+from fleet import FleetCoordinator, FleetClient
+
+# Leave half the measured capacity as headroom for bursts
+CAPACITY_HEADROOM = 0.5
+
+
+def simulated_status(index, tick):
+    return {
+        "profile": "default",
+        "status": "playing" if index % 3 else "pending",
+        "playtime_seconds": tick * 30,
+        "requirement_met": tick * 30 >= 1800,
+        "game_running": index % 3 != 0,
+    }
+
+
+def run_round(coordinator, node_count, seconds, workers):
+    """Flush all simulated nodes as fast as possible for `seconds`; returns latencies"""
+    clients = [FleetClient(coordinator.address, node_id=f"node-{i}", flush_seconds=3600)
+               for i in range(node_count)]
+
+    latencies = []
+
+    def flush(client, index, tick):
+        client.report(simulated_status(index, tick))
+        start = time.perf_counter()
+        client.flush()
+        return time.perf_counter() - start
+
+    deadline = time.perf_counter() + seconds
+    tick = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while time.perf_counter() < deadline:
+            futures = [pool.submit(flush, client, i, tick) for i, client in enumerate(clients)]
+            latencies.extend(f.result() for f in futures)
+            tick += 1
+
+    errors = sum(1 for client in clients if client.last_error)
+    return latencies, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the fleet coordinator with simulated nodes")
+    parser.add_argument("--nodes", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=5.0, help="Duration of each round")
+    parser.add_argument("--workers", type=int, default=32, help="Concurrent client threads")
+    parser.add_argument("--flush-seconds", type=int, default=30, help="Client flush interval to size for")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    coordinator = FleetCoordinator("127.0.0.1", 0).start()
+
+    # Round trip check: a queued command comes back on the next report
+    coordinator.queue_command("node-0", "launch")
+    probe = FleetClient(coordinator.address, node_id="node-0")
+    probe.report({"profile": "default", "status": "pending"})
+    assert probe.flush() == [{"command": "launch", "profile": "default"}], "command round trip failed"
+
+    rows = []
+    try:
+        for node_count in args.nodes:
+            latencies, errors = run_round(coordinator, node_count, args.seconds, args.workers)
+            summary = latency_summary(latencies)
+            reports_per_second = len(latencies) / args.seconds
+            row = {
+                "nodes": node_count,
+                "reports": len(latencies),
+                "reports_per_s": round(reports_per_second, 1),
+                "p50_ms": summary.get("p50_ms"),
+                "p95_ms": summary.get("p95_ms"),
+                "max_ms": summary.get("max_ms"),
+                "errors": errors,
+                "est_capacity_nodes": int(reports_per_second * args.flush_seconds * CAPACITY_HEADROOM),
+            }
+            rows.append(row)
+    finally:
+        coordinator.stop()
+
+    print_table(f"Fleet coordinator (flush every {args.flush_seconds}s, {args.workers} client threads)", rows,
+                ["nodes", "reports", "reports_per_s", "p50_ms", "p95_ms", "max_ms", "errors", "est_capacity_nodes"])
+    if rows:
+        print(f"\nOne coordinator can serve roughly {min(r['est_capacity_nodes'] for r in rows)} nodes "
+              f"at a {args.flush_seconds}s flush interval ({int(CAPACITY_HEADROOM * 100)}% headroom).")
+
+    write_json(args.json, {"flush_seconds": args.flush_seconds, "results": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
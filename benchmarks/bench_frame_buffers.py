@@ -0,0 +1,163 @@
+# ============================================================
+# File: benchmarks/bench_frame_buffers.py
+# ============================================================
+"""
+Frame buffer pool benchmark: runs the per-check image work (OCR
+preprocessing and density fallback for both ROIs) with and without
+ScreenDetector's FrameBufferPool and reports memory churn.
+
+Each mode runs in its own subprocess so peak RSS is not shared:
+    python benchmarks/bench_frame_buffers.py
+    python benchmarks/bench_frame_buffers.py --repeat 20 --json results.json
+
+Reported per mode:
+    churn_kb_mean/max  tracemalloc peak above the baseline during one check
+                       (numpy buffers, including OpenCV outputs)
+    faults_per_check   minor page faults per check (fresh large allocations
+                       fault in; reused buffers do not) - Unix only
+    steady_faults      the same, leaving out each frame's first check (the
+                       warm-up after a resolution change)
+    pool_allocs/reuses FrameBufferPool counters (pooled mode)
+    peak_rss_mb        peak resident set size of the run
+Decoding the screenshot (one frame-sized array) is the same in both modes
+and happens outside the per-check measurement.
+
+On the synthetic corpus the pool only cuts churn: the C allocator already
+recycles the unpooled intermediates, so steady-state faults are zero in
+both modes and the pool's buffers add to peak RSS. That is why
+frame_buffer_pool_enabled is off by default.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from bench_common import print_table, write_json
+from corpus import load_corpus, resolve_corpus_dir, FileScreenDetector
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import psutil
+from PIL import Image
+
+ROIS = (("login_status", 150), ("tap_to_land", 180))
+MODES = ("unpooled", "pooled")
+
+
+def peak_rss_mb():
+    if resource is not None:
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale / (1024 * 1024)
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss) / (1024 * 1024)
+
+
+def minor_faults():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_minflt
+
+
+def image_size(path):
+    """Size from the file header, without decoding the frame"""
+    with Image.open(path) as image:
+        return image.size
+
+
+def run_check(detector, frame_np):
+    """The image work of one login check, both ROIs"""
+    height, width = frame_np.shape[:2]
+    for roi, threshold in ROIS:
+        detector.preprocessor.preprocess(frame_np, roi, detector.buffers)
+        rect = detector.preprocessor.roi_rect(roi, width, height)
+        detector.text_density(frame_np, rect, threshold, roi)
+
+
+def run_mode(mode, corpus_dir, repeat):
+    detector = FileScreenDetector(use_buffer_pool=(mode == "pooled"))
+    # Group by resolution, as a real session keeps checking one window size
+    frames = sorted(load_corpus(corpus_dir), key=lambda f: image_size(f.path))
+
+    tracemalloc.start()
+    churn = []
+    latencies = []
+    faults = 0
+    steady_faults = 0
+    for frame in frames:
+        frame_np = detector.decode_frame(frame.load())
+        frame.image = None
+        for index in range(repeat):
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            faults_before = minor_faults()
+            start = time.perf_counter()
+            run_check(detector, frame_np)
+            latencies.append(time.perf_counter() - start)
+            if faults_before is not None:
+                check_faults = minor_faults() - faults_before
+                faults += check_faults
+                if index:
+                    steady_faults += check_faults
+            churn.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+
+    checks = len(latencies)
+    result = {
+        "mode": mode,
+        "checks": checks,
+        "mean_ms": round(statistics.mean(latencies) * 1000.0, 2) if checks else None,
+        "churn_kb_mean": round(statistics.mean(churn) / 1024.0, 1) if checks else None,
+        "churn_kb_max": round(max(churn) / 1024.0, 1) if checks else None,
+        "faults_per_check": round(faults / checks, 1) if checks and resource is not None else None,
+        "steady_faults": (round(steady_faults / (checks - len(frames)), 1)
+                          if checks > len(frames) and resource is not None else None),
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
+    if detector.buffers is not None:
+        info = detector.buffers.info()
+        result.update(pool_allocs=info["allocations"], pool_reuses=info["reuses"],
+                      pool_kb=round(info["bytes"] / 1024.0, 1))
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pooled and unpooled frame buffers")
+    parser.add_argument("--corpus", help="Corpus folder with labels.json (default: recorded, else synthetic)")
+    parser.add_argument("--repeat", type=int, default=10, help="Checks per frame (default: 10)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    parser.add_argument("--mode", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    corpus_dir = resolve_corpus_dir(args.corpus)
+
+    if args.mode:
+        # Child process: one mode, result as JSON on the last stdout line
+        print(json.dumps(run_mode(args.mode, corpus_dir, args.repeat)))
+        return 0
+
+    rows = []
+    for mode in MODES:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--mode", mode,
+             "--corpus", corpus_dir, "--repeat", str(args.repeat)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        rows.append(json.loads(output.strip().splitlines()[-1]))
+
+    print_table(f"Frame buffers - {corpus_dir}", rows,
+                ["mode", "checks", "mean_ms", "churn_kb_mean", "churn_kb_max", "faults_per_check",
+                 "steady_faults", "pool_allocs", "pool_reuses", "pool_kb", "peak_rss_mb"])
+    write_json(args.json, {"corpus": corpus_dir, "repeat": args.repeat, "results": rows})
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
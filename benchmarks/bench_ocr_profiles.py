@@ -0,0 +1,104 @@
+# ============================================================
+# File: benchmarks/bench_ocr_profiles.py
+# ============================================================
+"""
+OCR profile benchmark: compares the generic Tesseract settings (--psm 6,
+full model and dictionaries) against the per-ROI profiles in ocr_profiles.py,
+reporting latency and precision/recall for each detector on the frame corpus.
+Fails if a tuned profile is less accurate or slower (p50) than the generic one.
+
+Usage:
+    python benchmarks/bench_ocr_profiles.py
+    python benchmarks/bench_ocr_profiles.py --corpus path/to/corpus --repeat 5 --json results.json
+
+Needs a working Tesseract: the bundled tesseract.exe (Windows) or a
+`tesseract` binary on PATH. Without one it exits 1 without measuring.
+"""
+import argparse
+
+from bench_common import configure_ocr, print_table, write_json
+from bench_detectors import run_detector
+from corpus import load_corpus, resolve_corpus_dir, FileScreenDetector
+
+import ocr_profiles
+from ocr_profiles import GENERIC_PROFILE, OCR_PROFILES, register_ocr_profile
+
+# Benchmark detector name -> ocr_profiles registry key
+PROFILED_DETECTORS = {
+    "login_ready": "login_status",
+    "tap_to_land": "tap_to_land",
+}
+
+
+def run_with_profile(detector, frames, bench_name, profile_key, profile, repeat):
+    """Run a detector with a given profile temporarily registered"""
+    previous = register_ocr_profile(profile_key, profile)
+    try:
+        row = run_detector(detector, frames, bench_name, repeat)
+    finally:
+        if previous is None:
+            OCR_PROFILES.pop(profile_key, None)
+        else:
+            register_ocr_profile(profile_key, previous)
+    row["profile"] = profile.name
+    row["config"] = profile.config
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare generic and per-ROI OCR profiles")
+    parser.add_argument("--corpus", help="Corpus folder with labels.json (default: recorded, else synthetic)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per frame (default: 3)")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    if not configure_ocr():
+        print("✗ OCR skipped: no tesseract (bundled tesseract.exe only runs on Windows; "
+              "elsewhere put tesseract on PATH) - nothing compared")
+        return 1
+
+    corpus_dir = resolve_corpus_dir(args.corpus)
+    frames = load_corpus(corpus_dir)
+    if not frames:
+        print(f"✗ No frames found in {corpus_dir}")
+        return 1
+    for frame in frames:
+        frame.load()
+
+    detector = FileScreenDetector()
+    rows = []
+    failures = []
+    for bench_name, profile_key in PROFILED_DETECTORS.items():
+        tuned = ocr_profiles.get_ocr_profile(profile_key)
+        for profile in (GENERIC_PROFILE, tuned):
+            row = run_with_profile(detector, frames, bench_name, profile_key, profile, args.repeat)
+            rows.append(row)
+
+        generic_row, tuned_row = rows[-2], rows[-1]
+        tuned_row["p50_change_%"] = (
+            round((tuned_row["p50_ms"] / generic_row["p50_ms"] - 1.0) * 100.0, 1)
+            if generic_row.get("p50_ms") else None
+        )
+        for metric in ("precision", "recall"):
+            if (tuned_row.get(metric) or 0) < (generic_row.get(metric) or 0):
+                failures.append(f"{bench_name}: {tuned_row['profile']} {metric} {tuned_row[metric]} "
+                                f"below generic {generic_row[metric]}")
+        if (tuned_row["p50_change_%"] or 0) > 0:
+            failures.append(f"{bench_name}: {tuned_row['profile']} p50 {tuned_row['p50_change_%']:+}% vs generic")
+
+    print(f"\nCorpus: {corpus_dir} ({len(frames)} frames, {args.repeat} runs each)")
+    print_table("OCR profile benchmark", rows,
+                ["detector", "profile", "fps", "p50_ms", "p95_ms", "p50_change_%", "precision", "recall"])
+    for row in rows:
+        print(f"  {row['detector']}/{row['profile']}: {row['config']}")
+
+    write_json(args.json, {"corpus": corpus_dir, "repeat": args.repeat, "results": rows})
+    for failure in failures:
+        print(f"✗ {failure}")
+    print("✓ Tuned profiles as accurate and faster than generic" if not failures
+          else f"✗ {len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,194 @@
+# ============================================================
+# File: benchmarks/bench_prewarm.py
+# ============================================================
+"""
+Prewarm benchmark on a synthetic game directory of large files.
+
+Measures how long a "launch" (reading every file once) takes cold and
+after Prewarmer has run, plus the prewarm's own time and throughput:
+    python benchmarks/bench_prewarm.py
+    python benchmarks/bench_prewarm.py --files 8 --file-mb 512 --cap-mb 100 --json results.json
+
+Cold reads need the files out of the page cache first. On Linux this uses
+posix_fadvise(DONTNEED), which works on clean pages without root, then
+checks with mincore() that the pages really left the cache (the kernel may
+keep them, e.g. on tmpfs or some overlay and VM filesystems). When the
+eviction can't be done or verified, the cold row is labelled "cache not
+dropped" and its numbers are warm-cache speeds. In a VM the host may still
+cache the disk image, so a verified cold read can look faster than real
+hardware would.
+"""
+import argparse
+import ctypes
+import ctypes.util
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from bench_common import print_table, write_json
+
+from prewarm import Prewarmer
+
+BLOCK = 4 * 1024 * 1024
+
+
+def create_directory(root, files, file_mb):
+    """Synthetic pak folder: `files` files of `file_mb` MB of incompressible data"""
+    paks = os.path.join(root, "Client", "Content", "Paks")
+    os.makedirs(paks, exist_ok=True)
+    chunk = os.urandom(BLOCK)
+    for index in range(files):
+        with open(os.path.join(paks, f"pakchunk{index}-WindowsNoEditor.pak"), "wb") as f:
+            for _ in range(max(1, file_mb * 1024 * 1024 // BLOCK)):
+                f.write(chunk)
+            f.flush()
+            os.fsync(f.fileno())
+    return paks
+
+
+def evict(root):
+    """Drop the files from the page cache; False if this platform can't"""
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    for directory, _, names in os.walk(root):
+        for name in names:
+            fd = os.open(os.path.join(directory, name), os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+    return True
+
+
+def _libc():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        libc.mmap.restype = ctypes.c_void_p
+        libc.mmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int, ctypes.c_int,
+                              ctypes.c_int, ctypes.c_long)
+        libc.munmap.argtypes = (ctypes.c_void_p, ctypes.c_size_t)
+        libc.mincore.argtypes = (ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p)
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+
+def resident_fraction(root):
+    """Fraction of the files' pages in the page cache (mincore), or None if it can't be checked"""
+    libc = _libc()
+    if libc is None or not hasattr(mmap, "MAP_SHARED"):
+        return None
+    page = mmap.PAGESIZE
+    resident = pages = 0
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            size = os.path.getsize(path)
+            if not size:
+                continue
+            fd = os.open(path, os.O_RDONLY)
+            try:
+                address = libc.mmap(None, size, mmap.PROT_READ, mmap.MAP_SHARED, fd, 0)
+                if address in (None, ctypes.c_void_p(-1).value):
+                    return None
+                try:
+                    count = (size + page - 1) // page
+                    vector = ctypes.create_string_buffer(count)
+                    if libc.mincore(address, size, vector) != 0:
+                        return None
+                    resident += sum(byte & 1 for byte in vector.raw)
+                    pages += count
+                finally:
+                    libc.munmap(address, size)
+            finally:
+                os.close(fd)
+    return resident / pages if pages else 0.0
+
+
+def dropped(root, max_resident=0.05):
+    """evict(), then True only if mincore confirms the files left the cache"""
+    if not evict(root):
+        return False
+    fraction = resident_fraction(root)
+    if fraction is None:
+        print("⚠ Could not check page cache residency - cold numbers unverified")
+        return False
+    if fraction > max_resident:
+        print(f"⚠ {fraction:.0%} of the files still cached after eviction")
+        return False
+    return True
+
+
+def read_all(root):
+    """The "launch": read every file once, as fast as possible"""
+    buffer = bytearray(BLOCK)
+    total = 0
+    start = time.perf_counter()
+    for directory, _, names in os.walk(root):
+        for name in sorted(names):
+            with open(os.path.join(directory, name), "rb", buffering=0) as f:
+                while True:
+                    read = f.readinto(buffer)
+                    if not read:
+                        break
+                    total += read
+    return time.perf_counter() - start, total
+
+
+def run_prewarm(root, cap_mb):
+    prewarmer = Prewarmer(root, extensions=(".pak",), max_bytes_per_second=cap_mb * 1024 * 1024,
+                          ram_fraction=0.9)
+    start = time.perf_counter()
+    prewarmer.start()
+    while prewarmer.running:
+        time.sleep(0.05)
+    return time.perf_counter() - start, prewarmer.progress()
+
+
+def mb_per_s(total, seconds):
+    return round(total / (1024 * 1024) / seconds, 1) if seconds else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs prewarmed reads of a synthetic game directory")
+    parser.add_argument("--files", type=int, default=4, help="Number of pak files (default: 4)")
+    parser.add_argument("--file-mb", type=int, default=256, help="Size of each file in MB (default: 256)")
+    parser.add_argument("--cap-mb", type=int, default=0, help="Prewarm bandwidth cap in MB/s (default: none)")
+    parser.add_argument("--dir", help="Where to create the directory (default: system temp)")
+    parser.add_argument("--keep", action="store_true", help="Keep the synthetic directory")
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    root = tempfile.mkdtemp(prefix="ww_prewarm_", dir=args.dir)
+    try:
+        create_directory(root, args.files, args.file_mb)
+        rows = []
+
+        can_evict = dropped(root)
+        seconds, total = read_all(root)
+        rows.append({"run": "cold launch" if can_evict else "launch (cache not dropped)",
+                     "seconds": round(seconds, 2), "mb_per_s": mb_per_s(total, seconds)})
+
+        evict(root)
+        seconds, progress = run_prewarm(root, args.cap_mb)
+        rows.append({"run": f"prewarm (cap {args.cap_mb or '-'} MB/s)", "seconds": round(seconds, 2),
+                     "mb_per_s": mb_per_s(progress["bytes_done"], seconds)})
+
+        seconds, total = read_all(root)
+        rows.append({"run": "launch after prewarm", "seconds": round(seconds, 2),
+                     "mb_per_s": mb_per_s(total, seconds)})
+
+        print_table(f"Prewarm - {args.files} x {args.file_mb} MB", rows, ["run", "seconds", "mb_per_s"])
+        write_json(args.json, {"files": args.files, "file_mb": args.file_mb, "cap_mb": args.cap_mb,
+                               "cache_dropped": can_evict, "results": rows})
+    finally:
+        if not args.keep:
+            shutil.rmtree(root, ignore_errors=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
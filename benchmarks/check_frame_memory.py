@@ -0,0 +1,177 @@
+# ============================================================
+# File: benchmarks/check_frame_memory.py
+# ============================================================
+"""
+Checks that login checks don't keep full-resolution frames alive: runs a
+simulated detection session (loading -> login status -> tap to land) at
+4K through the login pipeline and compares process RSS before the
+session, after warm-up and at the end:
+    python benchmarks/check_frame_memory.py
+    python benchmarks/check_frame_memory.py --checks 200 --budget-mb 16 --ocr
+    python benchmarks/check_frame_memory.py --buffer-pool
+
+Every capture is a fresh image, as ImageGrab returns. The "keep last
+frame" row holds on to each check's screenshot and decoded frame the way
+the detector used to, for comparison. Fails if steady-state RSS grows
+during the session or the memory held between checks exceeds the budget.
+With --buffer-pool it also fails if the pool is reallocated after warm-up
+(cleared by the budget and refilled on the next check).
+
+On Linux, glibc keeps freed 4K frames cached in its heaps, so RSS would
+stay high even when nothing holds on to them; the heap is trimmed before
+each reading (malloc_trim) so the numbers show memory actually in use.
+Windows returns allocations this large to the OS when they are freed.
+"""
+import argparse
+import ctypes
+import gc
+import sys
+
+import psutil
+from PIL import Image
+
+from bench_common import configure_ocr, print_table
+from corpus import render_frame
+
+import screen_detector
+from login_pipeline import LoginPipeline
+
+MB = 1024 * 1024
+
+
+class SessionDetector(screen_detector.ScreenDetector):
+    """ScreenDetector whose captures are fresh copies of pre-rendered frames"""
+
+    def __init__(self, frames, **kwargs):
+        super().__init__(**kwargs)
+        self.frames = frames
+        self.index = 0
+
+    def find_game_window(self, pid=None, include_minimized=False):
+        height, width = self.frames[0].shape[:2]
+        return {"hwnd": 0, "title": "Wuthering Waves", "rect": (0, 0, width, height),
+                "width": width, "height": height}
+
+    def capture_window(self, window_info, backend=None, screen_fallback=True):
+        frame = self.frames[min(self.index, len(self.frames) - 1)]
+        self.index += 1
+        screenshot = Image.fromarray(frame.copy())
+        self.last_frame_size = screenshot.size
+        return screenshot
+
+
+def trim_heap():
+    """Return cached free heap memory to the OS where glibc allows it"""
+    try:
+        ctypes.CDLL("libc.so.6").malloc_trim(0)
+    except (OSError, AttributeError):
+        pass
+
+
+def rss_mb():
+    gc.collect()
+    trim_heap()
+    return psutil.Process().memory_info().rss / MB
+
+
+def session_frames(width, height, checks):
+    """Loading screen for the first half, then login status, then tap to land"""
+    loading, partial, login = (render_frame(category, width, height, seed=1)
+                               for category in ("loading", "login_partial", "login"))
+    return [loading] * (checks // 2) + [partial] * (checks // 2 - 1) + [login]
+
+
+def run_session(frames, keep_frames, budget_mb, thumbnail_width, warmup, buffer_pool=False):
+    """(row, detector) for one session"""
+    detector = SessionDetector(frames, thumbnail_width=thumbnail_width, memory_budget_mb=budget_mb,
+                               use_buffer_pool=buffer_pool)
+    pipeline = LoginPipeline(detector, save_debug_screenshot=False)
+    held = None
+    before = rss_mb()
+    warm = None
+    warm_allocations = None
+    results = {}
+
+    for check in range(len(frames)):
+        result, context = pipeline.run()
+        detector.frame_signature(context.screenshot)
+        results[result or "ready"] = results.get(result or "ready", 0) + 1
+        if keep_frames:
+            held = (context.screenshot, context.frame)
+        else:
+            pipeline.release(context)
+        del context
+        if check + 1 == warmup:
+            warm = rss_mb()
+            warm_allocations = detector.buffers.allocations if detector.buffers is not None else 0
+
+    end = rss_mb()
+    row = {
+        "mode": "keep last frame" if keep_frames else "release",
+        "checks": len(frames),
+        "rss_before_mb": round(before, 1),
+        "rss_warm_mb": round(warm, 1),
+        "rss_end_mb": round(end, 1),
+        "growth_mb": round(end - warm, 1),
+        "held_mb": round(end - before, 1),
+        "kept_mb": round(detector.retained_bytes / MB, 2),
+        "pool_reallocs": (detector.buffers.allocations - warm_allocations) if detector.buffers is not None else "-",
+        "results": ", ".join(f"{name} {count}" for name, count in sorted(results.items())),
+    }
+    del held
+    return row, detector
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check steady-state memory of a simulated detection session")
+    parser.add_argument("--checks", type=int, default=120, help="Login checks per session (default: 120)")
+    parser.add_argument("--width", type=int, default=3840)
+    parser.add_argument("--height", type=int, default=2160)
+    parser.add_argument("--budget-mb", type=float, default=32, help="frame_memory_budget_mb (default: 32)")
+    parser.add_argument("--thumbnail-width", type=int, default=320, help="screenshot_thumbnail_width (default: 320)")
+    parser.add_argument("--tolerance-mb", type=float, default=8, help="Allowed RSS growth after warm-up (default: 8)")
+    parser.add_argument("--ocr", action="store_true", help="Use Tesseract (slow at 4K); default: density checks")
+    parser.add_argument("--buffer-pool", action="store_true", help="Run with frame_buffer_pool_enabled")
+    args = parser.parse_args()
+
+    if not args.ocr or not configure_ocr():
+        screen_detector.OCR_AVAILABLE = False
+
+    frames = session_frames(args.width, args.height, max(10, args.checks))
+    warmup = max(5, len(frames) // 5)
+    frame_mb = args.width * args.height * 3 / MB
+
+    released, detector = run_session(frames, False, args.budget_mb, args.thumbnail_width, warmup, args.buffer_pool)
+    kept, _ = run_session(frames, True, args.budget_mb, args.thumbnail_width, warmup, args.buffer_pool)
+
+    print_table(f"Frame memory - {args.width}x{args.height} ({frame_mb:.1f} MB per frame), "
+                f"budget {args.budget_mb:g} MB", [released, kept],
+                ["mode", "checks", "rss_before_mb", "rss_warm_mb", "rss_end_mb", "growth_mb", "held_mb",
+                 "kept_mb", "pool_reallocs", "results"])
+    print()
+    print(detector.memory_status_text())
+
+    failures = []
+    if released["growth_mb"] > args.tolerance_mb:
+        failures.append(f"RSS grew {released['growth_mb']} MB after warm-up (tolerance {args.tolerance_mb:g} MB)")
+    if released["held_mb"] > args.budget_mb + args.tolerance_mb:
+        failures.append(f"{released['held_mb']} MB still held after the session "
+                        f"(budget {args.budget_mb:g} + {args.tolerance_mb:g} MB)")
+    if detector.retained_bytes > args.budget_mb * MB:
+        failures.append(f"detector keeps {released['kept_mb']} MB, over the budget")
+    # "-" once the pool was turned off for being over the budget on its own
+    if released["pool_reallocs"] not in ("-", 0):
+        failures.append(f"buffer pool reallocated {released['pool_reallocs']} time(s) after warm-up")
+    # A budget smaller than the thumbnail itself drops it, so only its size is checked
+    thumbnail = detector.last_thumbnail
+    if thumbnail is not None and thumbnail.size[0] > max(args.thumbnail_width, 1):
+        failures.append(f"thumbnail {thumbnail.size[0]}px wide, over {args.thumbnail_width}px")
+
+    for failure in failures:
+        print(f"✗ {failure}")
+    print("✓ Frame memory OK" if not failures else f"✗ {len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
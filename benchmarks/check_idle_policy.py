@@ -0,0 +1,113 @@
+# ============================================================
+# File: benchmarks/check_idle_policy.py
+# ============================================================
+"""
+Checks the post-login idle policy against a dummy child process, so it can
+be exercised on Linux (nice + CPU affinity) without the game:
+    python benchmarks/check_idle_policy.py
+    python benchmarks/check_idle_policy.py --cores 1 --priority idle --seconds 3
+
+The child burns CPU; the script applies idle mode, samples the child's
+CPU time to show the effect, restores it and checks every setting came
+back. Restoring a lower nice value needs root on Linux, so as a normal
+user that step is reported rather than failed.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import psutil
+
+from bench_common import print_table
+
+from idle_policy import IdlePolicy
+
+BUSY_CHILD = """
+import os, threading
+
+def spin():
+    while True:
+        pass
+
+for _ in range(os.cpu_count() or 1):
+    threading.Thread(target=spin).start()
+"""
+
+
+def cpu_percent(proc, seconds):
+    """Child CPU use over `seconds`, in percent of one core"""
+    before = sum(proc.cpu_times()[:2])
+    time.sleep(seconds)
+    return round((sum(proc.cpu_times()[:2]) - before) / seconds * 100.0, 1)
+
+
+def snapshot(proc):
+    return {"nice": proc.nice(), "affinity": proc.cpu_affinity() if hasattr(proc, "cpu_affinity") else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply and restore idle mode on a dummy process")
+    parser.add_argument("--cores", type=int, default=2, help="Cores to pin the child to (default: 2)")
+    parser.add_argument("--priority", choices=("below_normal", "idle"), default="below_normal")
+    parser.add_argument("--seconds", type=float, default=2.0, help="CPU sampling window (default: 2)")
+    args = parser.parse_args()
+
+    child = subprocess.Popen([sys.executable, "-c", BUSY_CHILD])
+    proc = psutil.Process(child.pid)
+    policy = IdlePolicy(priority=args.priority, cores=args.cores, minimize=False)
+    failures = []
+    rows = []
+    try:
+        time.sleep(0.5)
+        original = snapshot(proc)
+        rows.append({"phase": "normal", **original, "cpu_percent": cpu_percent(proc, args.seconds)})
+
+        policy.update(proc, wanted=True)
+        idle = snapshot(proc)
+        rows.append({"phase": "idle", **idle, "cpu_percent": cpu_percent(proc, args.seconds)})
+        if not policy.active:
+            failures.append("idle mode was not applied")
+        if idle["nice"] == original["nice"]:
+            failures.append("priority unchanged")
+        expected = policy.idle_cores(original["affinity"] or [])
+        if expected and idle["affinity"] != expected:
+            failures.append(f"affinity {idle['affinity']} != {expected}")
+
+        policy.update(proc, wanted=False)
+        restored = snapshot(proc)
+        rows.append({"phase": "restored", **restored, "cpu_percent": cpu_percent(proc, args.seconds)})
+        if policy.active:
+            failures.append("still active after restore")
+        if restored["affinity"] != original["affinity"]:
+            failures.append("affinity not restored")
+        if restored["nice"] != original["nice"]:
+            if os.name == "posix" and os.geteuid() != 0:
+                print("⚠ nice not restored - lowering nice needs root on Linux (expected as a normal user)")
+            else:
+                failures.append("priority not restored")
+
+        # A game that exits while idle must not leave the policy stuck
+        policy.update(proc, wanted=True)
+        child.kill()
+        child.wait()
+        policy.update(None, wanted=True)
+        if policy.active:
+            failures.append("still active after the process exited")
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+    print_table(f"Idle policy - priority {args.priority}, {args.cores} core(s), {psutil.cpu_count()} CPUs",
+                rows, ["phase", "nice", "affinity", "cpu_percent"])
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    print("✓ Idle policy OK" if not failures else f"✗ {len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+# ============================================================
+# File: benchmarks/check_window_state.py
+# ============================================================
+"""
+Checks the window-state gating of login checks with FakeWindowBackend, so
+it runs on Linux without the game:
+    python benchmarks/check_window_state.py
+
+Each scenario scripts the game window (minimized, cloaked, covered,
+off-screen, ...) and runs it through the probe and through a LoginPipeline
+whose detector only counts captures, to show that skipped checks never
+capture or OCR a frame.
+"""
+import sys
+
+from bench_common import print_table
+
+from login_pipeline import LoginPipeline
+from window_state import (WindowStateProbe, FakeWindowBackend, SKIP_MINIMIZED, SKIP_CLOAKED,
+                          SKIP_COVERED, SKIP_OFF_SCREEN)
+
+GAME, OTHER, DIALOG = 1, 2, 3
+GAME_PID = 100
+GAME_RECT = (0, 0, 1280, 720)
+
+# name -> (window changes, foreground, configured backend, background capture, expected (backend, reason))
+SCENARIOS = {
+    "foreground": ({}, GAME, "screen", True, ("screen", None)),
+    "no foreground": ({}, None, "screen", True, ("screen", None)),
+    "minimized": ({"minimized": True}, OTHER, "screen", True, (None, SKIP_MINIMIZED)),
+    "cloaked": ({"cloaked": True}, OTHER, "screen", True, (None, SKIP_CLOAKED)),
+    "covered": ({}, OTHER, "screen", True, ("window", SKIP_COVERED)),
+    "covered, no PrintWindow": ({}, OTHER, "screen", False, (None, SKIP_COVERED)),
+    "covered, window backend": ({}, OTHER, "window", True, ("window", SKIP_COVERED)),
+    "own dialog on top": ({}, DIALOG, "screen", True, ("screen", None)),
+    "off-screen": ({"rect": (-600, 0, 680, 720)}, GAME, "screen", True, ("window", SKIP_OFF_SCREEN)),
+    "off-screen, no PrintWindow": ({"rect": (-600, 0, 680, 720)}, GAME, "screen", False,
+                                   (None, SKIP_OFF_SCREEN)),
+    "across monitors": ({"rect": (1500, 0, 2780, 720)}, GAME, "screen", True, ("screen", None)),
+}
+
+
+class CountingDetector:
+    """Just enough of ScreenDetector for the stages up to decode"""
+
+    def __init__(self, capture_backend, background_capture):
+        self.capture_backend = capture_backend
+        self.background_capture_available = background_capture
+        self.captures = 0
+
+    def find_game_window(self, pid=None, include_minimized=False):
+        return {"hwnd": GAME, "title": "Wuthering Waves", "rect": GAME_RECT}
+
+    def capture_window(self, window_info, backend=None, screen_fallback=True):
+        self.captures += 1
+        return "frame"
+
+    def decode_frame(self, screenshot):
+        return None  # stop the pipeline before OCR
+
+
+def make_backend(changes, foreground):
+    backend = FakeWindowBackend(monitors=[(0, 0, 1920, 1080), (1920, 0, 3840, 1080)])
+    backend.add_window(GAME, GAME_RECT, pid=GAME_PID)
+    backend.add_window(OTHER, (200, 100, 1000, 600), pid=200)
+    backend.add_window(DIALOG, (300, 200, 900, 500), pid=GAME_PID)
+    backend.set(GAME, **changes)
+    backend.foreground = foreground
+    return backend
+
+
+def main():
+    failures = []
+    rows = []
+    for name, (changes, foreground, capture_backend, background, expected) in SCENARIOS.items():
+        probe = WindowStateProbe(make_backend(changes, foreground))
+        state = probe.probe(GAME)
+        decision = probe.decide(state, capture_backend, background)
+
+        detector = CountingDetector(capture_backend, background)
+        result, context = LoginPipeline(detector, save_debug_screenshot=False, window_probe=probe).run()
+        captured = detector.captures > 0
+
+        rows.append({"scenario": name, "visible": round(state.visible_fraction, 2),
+                     "backend": decision[0] or "-", "reason": decision[1] or "-",
+                     "captured": captured, "stopped_at": list(context.timings)[-1], "result": result})
+        if decision != expected:
+            failures.append(f"{name}: {decision} != {expected}")
+        if captured == (expected[0] is None):
+            failures.append(f"{name}: captured={captured} but expected backend {expected[0]}")
+
+    print_table("Window state gating", rows, ["scenario", "visible", "backend", "reason", "captured",
+                                               "stopped_at", "result"])
+    print()
+    for failure in failures:
+        print(f"✗ {failure}")
+    print("✓ Window state gating OK" if not failures else f"✗ {len(failures)} check(s) failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
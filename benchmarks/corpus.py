@@ -0,0 +1,222 @@
+# ============================================================
+# File: benchmarks/corpus.py
+# ============================================================
+"""
+Frame corpus for detector benchmarks.
+
+A corpus is a folder of screenshots plus a labels.json file:
+
+    {
+      "frames": [
+        {"file": "login_1920x1080.png", "category": "login",
+         "login_ready": true, "tap_to_land": true},
+        ...
+      ]
+    }
+
+Recorded screenshots (e.g. copies of debug_screenshot.png) can be dropped
+into benchmarks/corpus/ with their labels. When no recorded corpus exists,
+generate_synthetic_corpus() renders login, loading and patcher frames at
+several resolutions so the suite still runs on any machine.
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import cv2
+from PIL import Image
+
+# Make the launcher modules importable when running from benchmarks/
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from screen_detector import ScreenDetector
+
+CORPUS_DIR = os.path.join(REPO_ROOT, "benchmarks", "corpus")
+SYNTHETIC_CORPUS_DIR = os.path.join(CORPUS_DIR, "synthetic")
+LABELS_FILE = "labels.json"
+# Bump when render_frame changes so stale generated corpora are redrawn
+SYNTHETIC_CORPUS_VERSION = 2
+
+# Label keys, one per detector under test
+LABEL_KEYS = ("login_ready", "tap_to_land")
+
+DEFAULT_RESOLUTIONS = [(1280, 720), (1920, 1080), (2560, 1440), (3840, 2160)]
+
+
+class Frame:
+    """One labelled corpus frame"""
+
+    def __init__(self, path, category, labels):
+        self.path = path
+        self.category = category
+        self.labels = labels
+        self.image = None
+
+    @property
+    def name(self):
+        return os.path.basename(self.path)
+
+    def load(self):
+        """Load (and keep) the frame as an RGB PIL image"""
+        if self.image is None:
+            self.image = Image.open(self.path).convert("RGB")
+        return self.image
+
+
+def load_corpus(corpus_dir=CORPUS_DIR):
+    """Load labelled frames from corpus_dir/labels.json"""
+    labels_path = os.path.join(corpus_dir, LABELS_FILE)
+    with open(labels_path, 'r', encoding="utf-8") as f:
+        data = json.load(f)
+
+    frames = []
+    for entry in data.get("frames", []):
+        path = os.path.join(corpus_dir, entry["file"])
+        if not os.path.exists(path):
+            print(f"⚠ Missing corpus frame: {path}")
+            continue
+        labels = {key: bool(entry.get(key, False)) for key in LABEL_KEYS}
+        frames.append(Frame(path, entry.get("category", "unknown"), labels))
+    return frames
+
+
+def has_corpus(corpus_dir):
+    return os.path.exists(os.path.join(corpus_dir, LABELS_FILE))
+
+
+def corpus_version(corpus_dir):
+    try:
+        with open(os.path.join(corpus_dir, LABELS_FILE), 'r', encoding="utf-8") as f:
+            return json.load(f).get("version")
+    except (OSError, ValueError):
+        return None
+
+
+def _put_text(img, text, x_frac, y_frac, height_frac, color=(255, 255, 255), weight=2.0):
+    """
+    Draw text whose cap height is height_frac of the frame height. weight is
+    the stroke width per unit of font scale; strokes heavier than the default
+    are grown by dilation, since some OpenCV builds cap putText's thickness.
+    """
+    height, width = img.shape[:2]
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    (_, text_h), _ = cv2.getTextSize(text, font, 1.0, 2)
+    scale = (height * height_frac) / max(text_h, 1)
+    thickness = max(1, int(round(scale * 2)))
+    (text_w, _), _ = cv2.getTextSize(text, font, scale, thickness)
+    x = int(width * x_frac - text_w / 2) if x_frac is not None else int(width * 0.98 - text_w)
+    y = int(height * y_frac)
+
+    mask = np.zeros((height, width), dtype=np.uint8)
+    cv2.putText(mask, text, (x, y), font, scale, 255, thickness, cv2.LINE_AA)
+    if weight > 2.0:
+        grow = max(1, int(round(scale * (weight - 2.0) / 2)))
+        mask = cv2.dilate(mask, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2 * grow + 1, 2 * grow + 1)))
+    alpha = (mask.astype(np.float32) / 255.0)[:, :, None]
+    img[:] = (img * (1.0 - alpha) + np.array(color, dtype=np.float32) * alpha).astype(np.uint8)
+
+
+def _background(width, height, seed):
+    """Dark noisy gradient, roughly like the game's night-sky backdrop"""
+    rng = np.random.default_rng(seed)
+    gradient = np.linspace(20, 70, height, dtype=np.float32)[:, None]
+    img = np.repeat(gradient, width, axis=1)
+    img = np.stack([img * 0.6, img * 0.8, img], axis=2)
+    img += rng.normal(0, 6, img.shape).astype(np.float32)
+    return np.clip(img, 0, 255).astype(np.uint8)
+
+
+def render_frame(category, width, height, seed=0):
+    """Render one synthetic frame for a category: login, loading or patcher"""
+    img = _background(width, height, seed)
+
+    # The game's login text is heavy and the tap prompt sits on a bright divider;
+    # both are needed for the density fallback to fire, as it does on real frames
+    if category == "login":
+        _put_text(img, "Login Status: 0", None, 0.96, 0.018, weight=4.0)
+        _put_text(img, "Tap to land in Solaris-3", 0.5, 0.82, 0.028, weight=3.0)
+        cv2.rectangle(img, (int(width * 0.3), int(height * 0.85)), (int(width * 0.7), int(height * 0.865)),
+                      (240, 240, 240), -1)
+    elif category == "login_partial":
+        # Login screen still loading: status line visible, tap prompt not yet drawn
+        _put_text(img, "Login Status: 0", None, 0.96, 0.018, weight=4.0)
+    elif category == "loading":
+        bar_y = int(height * 0.92)
+        cv2.rectangle(img, (int(width * 0.2), bar_y), (int(width * 0.55), bar_y + max(2, height // 200)),
+                      (200, 200, 200), -1)
+    elif category == "patcher":
+        cv2.rectangle(img, (int(width * 0.3), int(height * 0.3)), (int(width * 0.7), int(height * 0.6)),
+                      (235, 235, 235), -1)
+        _put_text(img, "Downloading update 45%", 0.5, 0.45, 0.022, color=(30, 30, 30))
+    return img
+
+
+# Category -> expected detector labels
+SYNTHETIC_LABELS = {
+    "login": {"login_ready": True, "tap_to_land": True},
+    "login_partial": {"login_ready": True, "tap_to_land": False},
+    "loading": {"login_ready": False, "tap_to_land": False},
+    "patcher": {"login_ready": False, "tap_to_land": False},
+}
+
+
+def generate_synthetic_corpus(out_dir=SYNTHETIC_CORPUS_DIR, resolutions=None):
+    """Render a labelled synthetic corpus and return its directory"""
+    resolutions = resolutions or DEFAULT_RESOLUTIONS
+    os.makedirs(out_dir, exist_ok=True)
+
+    entries = []
+    for index, (width, height) in enumerate(resolutions):
+        for category, labels in SYNTHETIC_LABELS.items():
+            filename = f"{category}_{width}x{height}.png"
+            img = render_frame(category, width, height, seed=index)
+            Image.fromarray(img).save(os.path.join(out_dir, filename))
+            entries.append(dict(file=filename, category=category, **labels))
+
+    with open(os.path.join(out_dir, LABELS_FILE), 'w', encoding="utf-8") as f:
+        json.dump({"version": SYNTHETIC_CORPUS_VERSION, "frames": entries}, f, indent=2)
+
+    print(f"✓ Synthetic corpus written: {out_dir} ({len(entries)} frames)")
+    return out_dir
+
+
+def resolve_corpus_dir(corpus_dir=None):
+    """Pick the recorded corpus if present, else the synthetic one (generating it on first use)"""
+    if corpus_dir:
+        return corpus_dir
+    if has_corpus(CORPUS_DIR):
+        return CORPUS_DIR
+    if corpus_version(SYNTHETIC_CORPUS_DIR) != SYNTHETIC_CORPUS_VERSION:
+        generate_synthetic_corpus(SYNTHETIC_CORPUS_DIR)
+    return SYNTHETIC_CORPUS_DIR
+
+
+class FileScreenDetector(ScreenDetector):
+    """ScreenDetector whose window lookup and capture read from a corpus frame"""
+
+    def __init__(self, use_buffer_pool=False):
+        super().__init__(use_buffer_pool)
+        self.frame = None
+
+    def set_frame(self, frame):
+        self.frame = frame
+
+    def find_game_window(self, pid=None, include_minimized=False):
+        if self.frame is None:
+            return None
+        width, height = self.frame.load().size
+        return {
+            "hwnd": 0,
+            "title": self.frame.name,
+            "rect": (0, 0, width, height),
+            "width": width,
+            "height": height
+        }
+
+    def capture_window(self, window_info, backend=None, screen_fallback=True):
+        if self.frame is None:
+            return None
+        return self.frame.load()
@@ -3,24 +3,139 @@
 # ============================================================
 import json
 import os
-from datetime import datetime
-from pprint import pprint
+import re
+import threading
+from datetime import datetime, timedelta
+from types import MappingProxyType
 
-# Global debug flag
-DEBUG = True
+from log_manager import get_logger, DEFAULT_LOG_LEVEL, DEFAULT_LOG_FILE, LOG_LEVELS
+from metrics import metrics
 
+logger = get_logger(__name__)
 
-def debug_print(message, data=None):
-    """Print debug messages when DEBUG is True"""
-    if DEBUG:
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        print(f"[{timestamp}] {message}")
-        if data is not None:
-            pprint(data, indent=2)
+
+def parse_hhmm(value):
+    """Parse "HH:MM" into (hour, minute)"""
+    hour, minute = map(int, value.split(':'))
+    return hour, minute
+
+
+_HHMM = re.compile(r"^([01]?\d|2[0-3]):([0-5]\d)$")
+
+# Settings limited to a fixed set of values (everything else is checked against its default's type)
+CONFIG_CHOICES = {
+    "capture_backend": ("screen", "window"),
+    "click_mode": ("foreground", "background"),
+    "idle_priority": ("below_normal", "idle"),
+    "log_level": LOG_LEVELS,
+}
+CONFIG_TIME_KEYS = ("auto_launch_time", "reset_time")
+
+
+def _check_value(key, value, default):
+    """Normalised value for one setting, or raise ValueError"""
+    if key in CONFIG_TIME_KEYS:
+        match = _HHMM.match(value) if isinstance(value, str) else None
+        if not match:
+            raise ValueError(f"{key}: expected \"HH:MM\", got {value!r}")
+        return f"{int(match.group(1)):02d}:{match.group(2)}"
+
+    if key in CONFIG_CHOICES:
+        choices = CONFIG_CHOICES[key]
+        normalized = value.upper() if key == "log_level" and isinstance(value, str) else value
+        if normalized not in choices:
+            raise ValueError(f"{key}: expected one of {', '.join(choices)}, got {value!r}")
+        return normalized
+
+    if isinstance(default, bool):
+        if not isinstance(value, bool):
+            raise ValueError(f"{key}: expected true/false, got {value!r}")
+        return value
+
+    if isinstance(default, (int, float)):
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"{key}: expected a number, got {value!r}")
+        if value < 0:
+            raise ValueError(f"{key}: must not be negative, got {value!r}")
+        if isinstance(default, int):
+            if isinstance(value, float) and not value.is_integer():
+                raise ValueError(f"{key}: expected a whole number, got {value!r}")
+            return int(value)
+        return float(value)
+
+    if isinstance(default, str) and not isinstance(value, str):
+        raise ValueError(f"{key}: expected text, got {value!r}")
+
+    if isinstance(default, list):
+        if not isinstance(value, list):
+            raise ValueError(f"{key}: expected a list, got {value!r}")
+        if key == "profiles" and not all(isinstance(entry, dict) for entry in value):
+            raise ValueError("profiles: every entry must be an object")
+    return value
+
+
+def validate_config(data, defaults):
+    """
+    Check a loaded config against the defaults' schema.
+    Returns (config, errors): missing or invalid settings fall back to their defaults.
+    """
+    if not isinstance(data, dict):
+        return dict(defaults), ["config file must contain a JSON object"]
+
+    config = dict(defaults)
+    errors = []
+    for key, value in data.items():
+        if key not in defaults:
+            config[key] = value  # unknown keys are kept, so saving doesn't drop them
+            continue
+        try:
+            config[key] = _check_value(key, value, defaults[key])
+        except ValueError as e:
+            errors.append(str(e))
+    return config, errors
+
+
+def freeze(value):
+    """Read-only copy of a JSON value: dicts become MappingProxyType, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value):
+    """Plain JSON-serialisable copy of a frozen value"""
+    if isinstance(value, MappingProxyType):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def get_reset_start(reset_time, now=None):
+    """Start of the reset period containing now, for a "HH:MM" reset time"""
+    now = now or datetime.now()
+    reset_hour, reset_minute = parse_hhmm(reset_time)
+    today_reset = now.replace(hour=reset_hour, minute=reset_minute, second=0, microsecond=0)
+    return today_reset if now >= today_reset else today_reset - timedelta(days=1)
+
+
+def get_next_reset(reset_time, now=None):
+    """Next reset after now, for a "HH:MM" reset time"""
+    return get_reset_start(reset_time, now) + timedelta(days=1)
 
 
 class Config:
-    """Configuration manager"""
+    """
+    Configuration manager.
+
+    Settings are held as an immutable snapshot (`data`) that is replaced as a
+    whole, never edited in place, so a tick never sees a half-applied change.
+    Edits from the settings UI go through update(); edits to the file made
+    outside the app are picked up by ConfigWatcher, which stages a validated
+    snapshot that the GUI thread swaps in with apply_pending().
+    """
 
     def __init__(self, config_file="ww_launcher_config.json"):
         self.config_file = config_file
@@ -34,43 +149,165 @@ class Config:
             "login_wait_min_seconds": 15,
             "login_wait_max_seconds": 90,
             "screenshot_check_interval": 2,
-            "system_enabled": True  # NEW: Enable/disable entire system
+            "system_enabled": True,  # NEW: Enable/disable entire system
+            "log_level": DEFAULT_LOG_LEVEL,
+            "log_file": DEFAULT_LOG_FILE,
+            "slow_tick_budget_ms": 500,
+            "profiles": [],
+            "max_concurrent_instances": 2,
+            "launch_stagger_seconds": 60,
+            "min_free_ram_mb": 4096,
+            "max_cpu_percent": 80,
+            "max_gpu_percent": 90,
+            "fleet_enabled": False,
+            "fleet_coordinator_url": "http://127.0.0.1:8770",
+            "fleet_node_id": "",
+            "fleet_flush_seconds": 30,
+            "fleet_token": "",
+            "status_api_enabled": False,
+            "status_api_port": 8771,
+            "history_enabled": True,
+            "history_db": "ww_launcher_history.db",
+            "login_model_enabled": True,
+            "login_model_window": 20,
+            "login_model_percentile": 10,
+            "login_model_lead_seconds": 3,
+            "login_check_max_interval": 10,
+            "login_burst_interval_ms": 200,
+            "login_burst_seconds": 5,
+            "login_check_budget": 120,
+            "login_wait_hard_limit_seconds": 300,
+            "capture_backend": "screen",
+            "window_state_check_enabled": True,
+            "window_min_visible_fraction": 0.98,
+            "screenshot_thumbnail_width": 320,
+            "frame_memory_budget_mb": 32,
+            "frame_buffer_pool_enabled": False,
+            "click_mode": "foreground",
+            "click_verify_enabled": True,
+            "click_verify_timeout_seconds": 5,
+            "click_verify_threshold": 2.5,
+            "click_retry_count": 2,
+            "notice_ocr_interval_seconds": 10,
+            "early_launch_enabled": True,
+            "launch_safety_margin_minutes": 10,
+            "patch_probability_threshold": 0.2,
+            "default_patch_minutes": 20,
+            "prewarm_enabled": False,
+            "prewarm_minutes_before": 15,
+            "prewarm_max_mb_per_second": 200,
+            "prewarm_max_gb": 8,
+            "prewarm_dir": "",
+            "idle_mode_enabled": False,
+            "idle_priority": "below_normal",
+            "idle_cpu_cores": 2,
+            "idle_minimize": True,
+            "idle_power_throttling": False,
+            "idle_restore_on_focus": True,
+            "resource_sampler_enabled": True,
+            "resource_sample_seconds": 5,
+            "resource_history_samples": 360,
+            "resource_downsample_factor": 12,
+            "config_watch_enabled": True
         }
-        self.data = self.load()
+        # Called with the set of changed keys after a new snapshot is swapped in
+        self.listeners = []
+        self.version = 0
+        self._pending = None
+        self._pending_lock = threading.Lock()
+        self.data = freeze(self.load())
+
+    def read_file(self):
+        """(config, errors) from the file; raises OSError/ValueError if it can't be parsed"""
+        with open(self.config_file, 'r') as f:
+            return validate_config(json.load(f), self.default_config)
 
     def load(self):
         """Load configuration from file"""
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                # Merge with defaults
-                for key, value in self.default_config.items():
-                    if key not in config:
-                        config[key] = value
-                debug_print("✓ Config loaded from file")
+                config, errors = self.read_file()
+                for error in errors:
+                    logger.warning("⚠ Config: %s (using default)", error)
+                logger.info("✓ Config loaded from file")
                 return config
             except Exception as e:
-                debug_print(f"✗ Error loading config: {e}")
+                logger.error("✗ Error loading config: %s", e)
                 return self.default_config.copy()
         else:
-            debug_print("Using default config (file not found)")
+            logger.info("Using default config (file not found)")
             return self.default_config.copy()
 
+    def stage_reload(self):
+        """
+        Re-read the file (watcher thread). A valid, changed config is staged for
+        apply_pending(); an invalid one is rejected and the current one kept.
+        """
+        try:
+            config, errors = self.read_file()
+        except (OSError, ValueError) as e:
+            logger.error("✗ Config file not reloaded: %s", e)
+            return False
+        if errors:
+            logger.error("✗ Config file not reloaded: %s", "; ".join(errors))
+            return False
+
+        snapshot = freeze(config)
+        if snapshot == self.data:
+            return False  # e.g. our own save()
+        with self._pending_lock:
+            self._pending = snapshot
+        return True
+
+    def apply_pending(self):
+        """Swap in a staged reload (GUI thread, between ticks); returns the changed keys"""
+        with self._pending_lock:
+            snapshot, self._pending = self._pending, None
+        if snapshot is None:
+            return set()
+        changed = self._swap(snapshot)
+        if changed:
+            logger.info("✓ Config reloaded from file: %s", ", ".join(sorted(changed)))
+        return changed
+
+    def update(self, changes):
+        """Apply several settings as one new snapshot; raises ValueError if any is invalid"""
+        merged = thaw(self.data)
+        merged.update(changes)
+        config, errors = validate_config(merged, self.default_config)
+        if errors:
+            raise ValueError("; ".join(errors))
+        return self._swap(freeze(config))
+
+    def _swap(self, snapshot):
+        old = self.data
+        changed = {key for key in set(old) | set(snapshot) if old.get(key) != snapshot.get(key)}
+        if not changed:
+            return changed
+        self.data = snapshot
+        self.version += 1
+        for listener in self.listeners:
+            try:
+                listener(changed)
+            except Exception as e:
+                logger.exception("✗ Error applying config change: %s", e)
+        return changed
+
     def save(self):
         """Save configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.data, f, indent=4)
-            debug_print("✓ Config saved")
+            with metrics.span("json_save.config"):
+                with open(self.config_file, 'w') as f:
+                    json.dump(thaw(self.data), f, indent=4)
+            logger.info("✓ Config saved")
         except Exception as e:
-            debug_print(f"✗ Error saving config: {e}")
+            logger.error("✗ Error saving config: %s", e)
 
     def __getitem__(self, key):
         return self.data.get(key)
 
     def __setitem__(self, key, value):
-        self.data[key] = value
+        self.update({key: value})
 
     def get(self, key, default=None):
         """Get value with default fallback"""
@@ -80,8 +317,10 @@ class Config:
 class Tracking:
     """Tracking data manager with optimized saving"""
 
-    def __init__(self, tracking_file="ww_launcher_tracking.json"):
+    def __init__(self, tracking_file="ww_launcher_tracking.json", on_period_end=None):
         self.tracking_file = tracking_file
+        # Called with the finished period's data just before reset() clears it
+        self.on_period_end = on_period_end
         self.default_tracking = {
             "current_reset_period": None,
             "game_started": False,
@@ -99,7 +338,15 @@ class Tracking:
             "fallback_retry_count": 0,
             "login_clicked": False,
             "login_click_time": None,
-            "last_screenshot_check": None
+            "last_screenshot_check": None,
+            "launch_time": None,
+            "ocr_attempts": 0,
+            "patch_events": 0,
+            "login_ready_seconds": None,
+            "patch_seconds": 0,
+            "patch_started_at": None,
+            "patch_progress": None,
+            "resource_summary": None
         }
         self.data = self.load()
 
@@ -118,13 +365,13 @@ class Tracking:
                 for key, value in self.default_tracking.items():
                     if key not in tracking:
                         tracking[key] = value
-                debug_print("✓ Tracking loaded from file")
+                logger.info("✓ Tracking loaded from file")
                 return tracking
             except Exception as e:
-                debug_print(f"✗ Error loading tracking: {e}")
+                logger.error("✗ Error loading tracking: %s", e)
                 return self.default_tracking.copy()
         else:
-            debug_print("Using default tracking (file not found)")
+            logger.info("Using default tracking (file not found)")
             return self.default_tracking.copy()
 
     def save(self, force=False):
@@ -144,13 +391,14 @@ class Tracking:
 
         if should_save:
             try:
-                with open(self.tracking_file, 'w') as f:
-                    json.dump(self.data, f, indent=4)
+                with metrics.span("json_save.tracking"):
+                    with open(self.tracking_file, 'w') as f:
+                        json.dump(self.data, f, indent=4)
                 self.last_save_time = now
                 self.pending_save = False
-                debug_print("✓ Tracking saved")
+                logger.debug("✓ Tracking saved")
             except Exception as e:
-                debug_print(f"✗ Error saving tracking: {e}")
+                logger.error("✗ Error saving tracking: %s", e)
         else:
             # Mark that we have pending changes
             self.pending_save = True
@@ -161,7 +409,12 @@ class Tracking:
 
     def reset(self, current_period):
         """Reset tracking for new period"""
-        debug_print(f"Resetting tracking for period: {current_period}")
+        logger.info("Resetting tracking for period: %s", current_period)
+        if self.on_period_end and self.data.get("current_reset_period"):
+            try:
+                self.on_period_end(self.data)
+            except Exception as e:
+                logger.error("✗ Error recording finished period: %s", e)
         self.data = self.default_tracking.copy()
         self.data["current_reset_period"] = current_period
         self.force_save()
@@ -0,0 +1,97 @@
+# ============================================================
+# File: config_watcher.py
+# ============================================================
+"""
+Watches the config file and stages reloads on the Config object.
+
+On Windows the config folder is watched with a change notification
+(FindFirstChangeNotification, woken by writes in the folder); elsewhere,
+or if that fails, the file's mtime and size are polled. Either way the
+file is only re-read when its (mtime, size) actually changed, after a
+short settle delay so an editor's multi-step save is read once, complete.
+The new snapshot is applied by the GUI thread (Config.apply_pending).
+"""
+import os
+import threading
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import win32file
+    import win32event
+    import win32con
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+
+class ConfigWatcher:
+    """Background thread that calls config.stage_reload() when the file changes"""
+
+    def __init__(self, config, poll_seconds=2.0, settle_seconds=0.5):
+        self.config = config
+        self.poll_seconds = poll_seconds
+        self.settle_seconds = settle_seconds
+        self._stop = threading.Event()
+        self._thread = None
+        self._stamp = self.file_stamp()
+
+    def file_stamp(self):
+        try:
+            stat = os.stat(self.config.config_file)
+            return stat.st_mtime_ns, stat.st_size
+        except OSError:
+            return None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        if WIN32_AVAILABLE:
+            try:
+                self._watch_notifications()
+                return
+            except Exception as e:
+                logger.warning("⚠ Config change notifications unavailable, polling instead: %s", e)
+        self._watch_polling()
+
+    def _watch_notifications(self):
+        folder = os.path.dirname(os.path.abspath(self.config.config_file))
+        handle = win32file.FindFirstChangeNotification(
+            folder, False, win32con.FILE_NOTIFY_CHANGE_LAST_WRITE | win32con.FILE_NOTIFY_CHANGE_FILE_NAME)
+        try:
+            while not self._stop.is_set():
+                # Time out now and then to notice stop()
+                result = win32event.WaitForSingleObject(handle, int(self.poll_seconds * 1000))
+                if result == win32con.WAIT_OBJECT_0:
+                    self.check()
+                    win32file.FindNextChangeNotification(handle)
+        finally:
+            win32file.FindCloseChangeNotification(handle)
+
+    def _watch_polling(self):
+        while not self._stop.wait(self.poll_seconds):
+            self.check()
+
+    def check(self):
+        """Stage a reload if the file changed since the last check"""
+        stamp = self.file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+
+        # Let the writer finish, then read whatever the final state is
+        if self._stop.wait(self.settle_seconds):
+            return False
+        self._stamp = self.file_stamp()
+        logger.debug("Config file changed on disk")
+        return self.config.stage_reload()
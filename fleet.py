@@ -0,0 +1,328 @@
+# ============================================================
+# File: fleet.py
+# ============================================================
+"""
+Optional fleet mode: one coordinator collects status from launchers on many
+machines and hands out launch/close commands.
+
+Protocol (JSON over HTTP):
+    POST /v1/report   {"node": id, "updates": [status, ...]} -> {"commands": [...]}
+    POST /v1/command  {"node": id, "command": "launch"|"close", "profile": name}
+    GET  /v1/nodes    -> {"nodes": {id: {"status": {...}, "last_seen": iso}}}
+
+Launchers buffer status locally and flush one report per interval; commands
+ride back on the report response, so a node costs one request per flush.
+
+Run a coordinator with:
+    python fleet.py serve --host 0.0.0.0 --port 8770 --token secret
+
+It listens on 127.0.0.1 by default; listening on any other address
+requires a token, since commands launch and close games on the nodes.
+"""
+import argparse
+import hmac
+import ipaddress
+import json
+import queue
+import socket
+import threading
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from log_manager import get_logger, setup_logging, shutdown_logging
+
+logger = get_logger(__name__)
+
+DEFAULT_PORT = 8770
+FLEET_COMMANDS = ("launch", "close")
+TOKEN_HEADER = "X-Fleet-Token"
+
+
+def is_loopback(host):
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+class _FleetHTTPServer(ThreadingHTTPServer):
+    # The stdlib default backlog of 5 drops connections when many nodes flush together
+    request_queue_size = 128
+    daemon_threads = True
+
+
+class FleetCoordinator:
+    """In-memory node registry and command queues behind a threaded HTTP server"""
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, token=""):
+        if not token and not is_loopback(host):
+            raise ValueError(f"refusing to listen on {host} without a token (use --token)")
+        self.token = token
+        self.nodes = {}
+        self.commands = {}
+        self.reports_received = 0
+        self._lock = threading.Lock()
+        self._server = _FleetHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        coordinator = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug("fleet %s - %s", self.address_string(), fmt % args)
+
+            def _send(self, code, payload):
+                body = json.dumps(payload).encode("utf-8")
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def _authorised(self):
+                supplied = (self.headers.get(TOKEN_HEADER) or "").encode("utf-8")
+                if coordinator.token and not hmac.compare_digest(supplied, coordinator.token.encode("utf-8")):
+                    self._send(403, {"error": "forbidden"})
+                    return False
+                return True
+
+            def do_GET(self):
+                if not self._authorised():
+                    return
+                if self.path == "/v1/nodes":
+                    self._send(200, {"nodes": coordinator.get_nodes()})
+                else:
+                    self._send(404, {"error": "not found"})
+
+            def do_POST(self):
+                if not self._authorised():
+                    return
+                try:
+                    data = self._read_json()
+                except ValueError:
+                    self._send(400, {"error": "invalid json"})
+                    return
+                if not isinstance(data, dict):
+                    self._send(400, {"error": "expected a json object"})
+                    return
+
+                if self.path == "/v1/report":
+                    node = data.get("node")
+                    if not node:
+                        self._send(400, {"error": "missing node"})
+                        return
+                    try:
+                        commands = coordinator.handle_report(node, data.get("updates") or [])
+                    except ValueError as e:
+                        self._send(400, {"error": str(e)})
+                        return
+                    self._send(200, {"commands": commands})
+                elif self.path == "/v1/command":
+                    try:
+                        coordinator.queue_command(data.get("node"), data.get("command"), data.get("profile"))
+                        self._send(200, {"queued": True})
+                    except ValueError as e:
+                        self._send(400, {"error": str(e)})
+                else:
+                    self._send(404, {"error": "not found"})
+
+        return Handler
+
+    def handle_report(self, node, updates):
+        """Store the latest status per profile and return (and clear) queued commands"""
+        if not isinstance(node, str):
+            raise ValueError("node must be a string")
+        if not isinstance(updates, list) or not all(isinstance(update, dict) for update in updates):
+            raise ValueError("updates must be a list of objects")
+        with self._lock:
+            entry = self.nodes.setdefault(node, {"status": {}, "last_seen": None})
+            for update in updates:
+                entry["status"][update.get("profile", "default")] = update
+            entry["last_seen"] = datetime.now().isoformat()
+            self.reports_received += 1
+            return self.commands.pop(node, [])
+
+    def queue_command(self, node, command, profile=None):
+        if not node:
+            raise ValueError("missing node")
+        if command not in FLEET_COMMANDS:
+            raise ValueError(f"unknown command: {command}")
+        with self._lock:
+            self.commands.setdefault(node, []).append({"command": command, "profile": profile or "default"})
+        logger.info("Queued %s for %s/%s", command, node, profile or "default")
+
+    def get_nodes(self):
+        with self._lock:
+            return json.loads(json.dumps(self.nodes))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fleet-coordinator", daemon=True)
+        self._thread.start()
+        logger.info("✓ Fleet coordinator listening on %s", self.address)
+        return self
+
+    def serve_forever(self):
+        logger.info("✓ Fleet coordinator listening on %s", self.address)
+        self._server.serve_forever()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class FleetClient:
+    """
+    Launcher-side client. report() only buffers; a background thread sends
+    one batched report per flush interval and queues any returned commands
+    for the GUI thread to pick up with pop_commands().
+    """
+
+    def __init__(self, coordinator_url, node_id=None, flush_seconds=30, token="", timeout=5):
+        self.coordinator_url = coordinator_url.rstrip("/")
+        self.node_id = node_id or socket.gethostname()
+        self.flush_seconds = flush_seconds
+        self.token = token
+        self.timeout = timeout
+        self.last_error = None
+        self.last_flush = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._commands = queue.SimpleQueue()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            config.get("fleet_coordinator_url") or f"http://127.0.0.1:{DEFAULT_PORT}",
+            node_id=config.get("fleet_node_id") or None,
+            flush_seconds=config.get("fleet_flush_seconds", 30),
+            token=config.get("fleet_token", ""),
+        )
+
+    def report(self, status):
+        """Buffer a status update; later updates for the same profile replace earlier ones"""
+        with self._lock:
+            self._pending[status.get("profile", "default")] = status
+
+    def pop_commands(self):
+        commands = []
+        while True:
+            try:
+                commands.append(self._commands.get_nowait())
+            except queue.Empty:
+                return commands
+
+    def flush(self):
+        """Send buffered updates now; returns the commands received"""
+        with self._lock:
+            updates = list(self._pending.values())
+            self._pending.clear()
+
+        payload = json.dumps({"node": self.node_id, "updates": updates}).encode("utf-8")
+        request = urllib.request.Request(f"{self.coordinator_url}/v1/report", data=payload, method="POST",
+                                         headers={"Content-Type": "application/json"})
+        if self.token:
+            request.add_header(TOKEN_HEADER, self.token)
+
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                commands = json.loads(response.read() or b"{}").get("commands", [])
+            self.last_error = None
+            self.last_flush = datetime.now()
+        except Exception as e:
+            # Keep the updates for the next attempt unless newer ones replaced them
+            with self._lock:
+                for update in updates:
+                    self._pending.setdefault(update.get("profile", "default"), update)
+            if str(e) != self.last_error:
+                logger.warning("⚠ Fleet report failed: %s", e)
+            self.last_error = str(e)
+            return []
+
+        for command in commands:
+            self._commands.put(command)
+        return commands
+
+    def _run(self):
+        while not self._stop.wait(self.flush_seconds):
+            self.flush()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="fleet-client", daemon=True)
+        self._thread.start()
+        logger.info("✓ Fleet client started: node '%s' -> %s", self.node_id, self.coordinator_url)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=self.timeout + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Wuthering Waves launcher fleet coordinator")
+    sub = parser.add_subparsers(dest="action", required=True)
+
+    serve = sub.add_parser("serve", help="Run a coordinator")
+    serve.add_argument("--host", default="127.0.0.1",
+                       help="Address to listen on (default: 127.0.0.1; other addresses need --token)")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve.add_argument("--token", default="", help="Shared token required from clients")
+
+    send = sub.add_parser("send", help="Queue a command for a node")
+    send.add_argument("node")
+    send.add_argument("command", choices=FLEET_COMMANDS)
+    send.add_argument("--profile", default="default")
+    send.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}")
+    send.add_argument("--token", default="")
+
+    args = parser.parse_args()
+    setup_logging("INFO", log_file=None)
+
+    if args.action == "serve":
+        try:
+            coordinator = FleetCoordinator(args.host, args.port, token=args.token)
+            coordinator.serve_forever()
+        except ValueError as e:
+            logger.error("✗ %s", e)
+            return 2
+        except KeyboardInterrupt:
+            pass
+        finally:
+            shutdown_logging()
+        return 0
+
+    payload = json.dumps({"node": args.node, "command": args.command, "profile": args.profile}).encode("utf-8")
+    request = urllib.request.Request(f"{args.url.rstrip('/')}/v1/command", data=payload, method="POST",
+                                     headers={"Content-Type": "application/json"})
+    if args.token:
+        request.add_header(TOKEN_HEADER, args.token)
+    try:
+        with urllib.request.urlopen(request, timeout=5) as response:
+            print(response.read().decode("utf-8"))
+    except urllib.error.HTTPError as e:
+        print(f"✗ {e.code} {e.reason}: {e.read().decode('utf-8', 'replace')}")
+        return 1
+    except urllib.error.URLError as e:
+        print(f"✗ Coordinator not reachable: {e.reason}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
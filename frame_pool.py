@@ -0,0 +1,60 @@
+# ============================================================
+# File: frame_pool.py
+# ============================================================
+import numpy as np
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+
+class FrameBufferPool:
+    """
+    Named, reusable numpy buffers for per-check image work.
+
+    OpenCV calls write into these through their dst= argument, so repeated
+    checks at the same window size allocate nothing new. Buffers are named
+    by role ("gray", "binary", ...) rather than by ROI, so every ROI's
+    intermediates share them. Each name owns a flat byte buffer that only
+    grows to the largest request seen; smaller ones (another ROI, a smaller
+    window) are served as views into it.
+    """
+
+    def __init__(self):
+        self._buffers = {}
+        self.allocations = 0
+        self.reuses = 0
+
+    def get(self, name, shape, dtype=np.uint8):
+        shape = tuple(shape)
+        dtype = np.dtype(dtype)
+        size = int(np.prod(shape)) * dtype.itemsize
+        buffer = self._buffers.get(name)
+        if buffer is not None and buffer.nbytes >= size:
+            self.reuses += 1
+        else:
+            buffer = np.empty(size, dtype=np.uint8)
+            self._buffers[name] = buffer
+            self.allocations += 1
+            logger.debug("Frame buffer '%s' allocated: %s", name, shape)
+        return buffer[:size].view(dtype).reshape(shape)
+
+    def clear(self):
+        self._buffers.clear()
+
+    @property
+    def nbytes(self):
+        return sum(buffer.nbytes for buffer in self._buffers.values())
+
+    def info(self):
+        return {
+            "buffers": len(self._buffers),
+            "bytes": self.nbytes,
+            "allocations": self.allocations,
+            "reuses": self.reuses
+        }
+
+
+def pooled_buffer(pool, name, shape, dtype=np.uint8):
+    """Buffer from `pool`, or None (let OpenCV allocate) when pooling is off"""
+    return pool.get(name, shape, dtype) if pool is not None else None
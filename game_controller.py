@@ -2,177 +2,462 @@
 # File: game_controller.py
 # ============================================================
 import os
+import time
 import psutil
 import subprocess
 from datetime import datetime
 
 # Import our modules
+from log_manager import get_logger
+from metrics import metrics
+from idle_policy import IdlePolicy
+from login_pipeline import LoginPipeline
+from login_poller import frame_difference, PHASE_CLICK, PHASE_VERIFY
+from window_state import WindowStateProbe
+from notice_classifier import (NoticeClassifier, NOTICE_UPDATE_COMPLETE, NOTICE_NETWORK_ERROR,
+                               NOTICE_PATCHING)
+
+logger = get_logger(__name__)
+
 try:
-    from config import debug_print
     from screen_detector import ScreenDetector, WIN32_AVAILABLE
 except ImportError as e:
-    debug_print(f"✗ Import error: {e}")
+    logger.error("✗ Import error: %s", e)
     WIN32_AVAILABLE = False
 
-
-    # Fallback debug print
-    def debug_print(msg, data=None):
-        print(msg)
-        if data:
-            print(data)
-
 # Import win32 modules if available
 if WIN32_AVAILABLE:
     try:
         import win32gui
         import win32con
         import win32api
+        import win32process
     except ImportError:
         WIN32_AVAILABLE = False
-        debug_print("✗ win32 modules not available")
+        logger.warning("✗ win32 modules not available")
+
+
+def path_under(path, folder):
+    """True if path is folder or inside it, by whole path components (D:\\WW does not contain D:\\WW2)"""
+    try:
+        return os.path.commonpath([path, folder]) == folder
+    except ValueError:
+        return False  # different drives
 
 
 class GameController:
     """Handles game launching and window interaction"""
 
-    def __init__(self, config):
+    def __init__(self, config, match_install_dir=False):
         self.config = config
-        self.screen_detector = ScreenDetector()
-        debug_print("GameController initialized")
+        # Set when several game instances may run at once: only processes
+        # started from this install folder count as "our" game
+        self.match_install_dir = match_install_dir
+        self.screen_detector = ScreenDetector(capture_backend=config.get("capture_backend") or "screen",
+                                              thumbnail_width=config.get("screenshot_thumbnail_width", 320),
+                                              memory_budget_mb=config.get("frame_memory_budget_mb", 32),
+                                              use_buffer_pool=config.get("frame_buffer_pool_enabled", False))
+        self.login_pipeline = LoginPipeline(self.screen_detector, window_probe=self.create_window_probe())
+        # Why the last login check was skipped ("minimized", "covered", ...), else None
+        self.last_skip_reason = None
+        # Thumbnail of the last login-check frame, for the poller's static-screen back-off
+        self.last_frame_signature = None
+        # Game process found by the last find_game_process()
+        self.game_process = None
+        self.notice_classifier = NoticeClassifier()
+        # (hwnd, frame signature, monotonic time, text) of the last OCR'd Notice dialog
+        self._notice_ocr = (None, None, 0.0, "")
+        # Text of the Notice dialog seen by the last check_for_patcher (patch progress)
+        self.last_notice_text = None
+        # Post-login low-resource mode for the game process (None when disabled)
+        self.idle_policy = IdlePolicy.from_config(config) if config.get("idle_mode_enabled") else None
+        logger.debug("GameController initialized")
+
+    def create_window_probe(self):
+        """Window-state probe for the login checks, or None when disabled"""
+        if not self.config.get("window_state_check_enabled", True):
+            return None
+        return WindowStateProbe.from_config(self.config)
+
+    def apply_config_changes(self, changed):
+        """Rebuild the helpers whose settings changed in a config reload"""
+        if changed & {"window_state_check_enabled", "window_min_visible_fraction"}:
+            self.login_pipeline.window_probe = self.create_window_probe()
+
+        if any(key.startswith("idle_") for key in changed):
+            # Leave a game already in idle mode as it is until the policy lets go of it
+            if self.idle_policy is None or not self.idle_policy.active:
+                self.idle_policy = IdlePolicy.from_config(self.config) if self.config.get("idle_mode_enabled") else None
+
+    def get_install_dir(self):
+        """Install folder used to tell game instances apart, or None"""
+        install_dir = self.config.get("install_dir")
+        if not install_dir and self.match_install_dir and self.config.get("game_path"):
+            install_dir = os.path.dirname(self.config.get("game_path"))
+        return install_dir or None
+
+    def iter_game_processes(self):
+        """
+        Yield psutil.Process objects of running game instances.
+        In multi-profile setups (see get_install_dir) only processes whose
+        executable lives under the profile's install folder match.
+        """
+        process_name = self.config.get("game_process_name", "Client-Win64-Shipping.exe").lower()
+        install_dir = self.get_install_dir()
+        if install_dir:
+            install_dir = os.path.normcase(os.path.abspath(install_dir))
+
+        attrs = ['name', 'exe'] if install_dir else ['name']
+        for proc in psutil.process_iter(attrs):
+            try:
+                name = proc.info['name']
+                if not name or process_name not in name.lower():
+                    continue
+                if install_dir:
+                    exe = proc.info.get('exe')
+                    if not exe or not path_under(os.path.normcase(os.path.abspath(exe)), install_dir):
+                        continue
+                yield proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+
+    def find_game_process(self):
+        """Return the psutil.Process of the running game, or None (also kept as self.game_process)"""
+        try:
+            with metrics.span("process_scan"):
+                self.game_process = next(self.iter_game_processes(), None)
+        except Exception as e:
+            logger.error("✗ Error checking if game is running: %s", e)
+            self.game_process = None
+        return self.game_process
 
     def is_game_running(self):
         """Check if the game process is currently running"""
-        process_name = self.config.get("game_process_name", "Client-Win64-Shipping.exe")
+        return self.find_game_process() is not None
 
+    def owns_window(self, hwnd, install_dir):
+        """True if hwnd belongs to a process started from install_dir"""
         try:
-            for proc in psutil.process_iter(['name']):
-                try:
-                    if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                        return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
+            pid = win32process.GetWindowThreadProcessId(hwnd)[1]
+            exe = psutil.Process(pid).exe()
         except Exception as e:
-            debug_print(f"✗ Error checking if game is running: {e}")
+            logger.debug("Owner of window %s unknown: %s", hwnd, e)
+            return False
+        return path_under(os.path.normcase(os.path.abspath(exe)), install_dir)
 
-        return False
+    def find_window_handle(self, pid):
+        window_info = self.screen_detector.find_game_window(pid)
+        return window_info["hwnd"] if window_info else None
+
+    def update_idle_mode(self, wanted):
+        """
+        Idle policy tick: wanted while logged in and playtime is still needed.
+        While idle mode is on, the known PID is checked instead of scanning processes.
+        """
+        policy = self.idle_policy
+        if policy is None or (not wanted and not policy.active):
+            return
+
+        if policy.active:
+            try:
+                proc = psutil.Process(policy.pid)
+                if not proc.is_running():
+                    proc = None
+            except psutil.NoSuchProcess:
+                proc = None
+        else:
+            proc = self.find_game_process()
+        policy.update(proc, wanted, self.find_window_handle)
+
+    def close_game(self):
+        """Terminate running game instances; returns the PIDs that were signalled"""
+        pids = []
+        for proc in self.iter_game_processes():
+            try:
+                proc.terminate()
+                pids.append(proc.pid)
+                logger.info("Terminated game process (PID: %d)", proc.pid)
+            except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                pass
+        return pids
 
     def launch_game(self, game_path):
         """Launch the game executable"""
         if not game_path or not os.path.exists(game_path):
-            debug_print(f"✗ Game path invalid: {game_path}")
+            logger.error("✗ Game path invalid: %s", game_path)
             return False
 
         try:
-            debug_print(f"Launching game: {game_path}")
+            logger.info("Launching game: %s", game_path)
             subprocess.Popen([game_path])
-            debug_print("✓ Game launch command sent")
+            logger.info("✓ Game launch command sent")
             return True
         except Exception as e:
-            debug_print(f"✗ Error launching game: {e}")
+            logger.error("✗ Error launching game: %s", e)
             return False
 
-    def click_login_screen(self):
+    def click_login_screen(self, poller, since_start):
         """
-        Detect and click login screen using visual detection
-        3-step process:
+        Run one step of the login sequence; `poller` (LoginPoller) keeps the
+        state between steps and says when the next one is due. since_start
+        (seconds since launch) is recorded on the poller when the screen is found:
         1. Check for "Login Status: 0"
         2. Check for "Tap to land in Solaris-3" text
-        3. Wait 5 seconds, focus window, move mouse, and click
+        3. click_delay (5 s) later, focus window, move mouse, and click
+        4. On later steps, re-capture the "Tap to land" area until it changes;
+           an unconfirmed click is retried a bounded number of times
 
-        Returns: "clicked", "waiting_login_status", "waiting_tap_text", "not_found", or "error"
+        No step waits in place, so the caller's timer keeps the GUI responsive.
+        Checks are skipped while the window is minimized, cloaked or (without
+        background capture) covered or off-screen; the reason is kept in
+        last_skip_reason.
+
+        Returns: "ready" (click scheduled), "click_sent", "verifying", "clicked", "click_unconfirmed",
+        "waiting_login_status", "waiting_tap_text", "window_unavailable", "not_found", or "error"
         """
+        self.last_frame_signature = None
+        self.last_skip_reason = None
         try:
-            # Find game window
-            window_info = self.screen_detector.find_game_window()
-            if not window_info:
-                debug_print("✗ Game window not found")
+            if poller.phase == PHASE_CLICK:
+                return self.send_login_click(poller)
+            if poller.phase == PHASE_VERIFY:
+                return self.verify_click(poller)
+            return self.detect_login_screen(poller, since_start)
+
+        except Exception as e:
+            logger.exception("✗ Error in click_login_screen: %s", e)
+            poller.reset_click()
+            return "error"
+
+    def detect_login_screen(self, poller, since_start):
+        """Steps 1-2; once both indicators are up, arm the click on the poller"""
+        # With several instances running, only look at this profile's game process
+        pid = None
+        if self.get_install_dir():
+            proc = self.find_game_process()
+            if proc is None:
                 return "not_found"
+            pid = proc.pid
+
+        # window -> capture -> decode once -> login status -> tap text -> click position
+        result, context = self.login_pipeline.run(pid)
+        try:
+            if context.screenshot is not None:
+                self.last_frame_signature = self.screen_detector.frame_signature(context.screenshot)
+            if result == "window_unavailable":
+                self.last_skip_reason = context.skip_reason
+            if result is not None:
+                return result
+
+            # What the login text area looks like before the click, for verification
+            reference = (self.screen_detector.roi_signature(context.frame, "tap_to_land"),
+                         self.screen_detector.roi_density(context.frame, "tap_to_land"))
+            poller.arm_click((context.window_info, context.click_position, reference), since_start)
+        finally:
+            # Only the signatures are needed from here on
+            self.login_pipeline.release(context)
+
+        logger.info("✓ All indicators found! Clicking in %g seconds...", poller.click_delay)
+        return "ready"
+
+    def send_login_click(self, poller):
+        """Step 3: click the armed position; verification starts on the next step"""
+        window_info, (click_x, click_y), _ = poller.click_target
+        with metrics.span("click_sequence"):
+            result = self.send_click(window_info, click_x, click_y)
+        if result != "clicked":
+            poller.reset_click()
+            return result
+        if not poller.click_sent():
+            poller.reset_click()
+            return "clicked"
+        return "click_sent"
+
+    def verify_click(self, poller):
+        """
+        Step 4: one re-capture of the "Tap to land" area. The click is confirmed
+        once its thumbnail differs from the pre-click one, or its bright-text
+        density has dropped below half. Cheap checks only, no OCR.
+        Records click-to-confirm latency.
+        Returns: "clicked", "verifying" (re-check scheduled), "click_sent" (clicking again)
+        or "click_unconfirmed" (retries used up, detection resumes)
+        """
+        window_info, _, (reference_signature, reference_density) = poller.click_target
+        threshold = self.config.get("click_verify_threshold", 2.5)
+
+        screenshot = self.screen_detector.capture_window(window_info)
+        if screenshot is not None:
+            difference = frame_difference(self.screen_detector.roi_signature(screenshot, "tap_to_land"),
+                                          reference_signature)
+            density = self.screen_detector.roi_density(screenshot, "tap_to_land")
+            self.screen_detector.release_frame(screenshot, keep_thumbnail=False)
+            text_gone = bool(reference_density) and density is not None and density < reference_density / 2
+            if text_gone or (difference is not None and difference >= threshold):
+                elapsed = poller.verify_elapsed()
+                metrics.observe("click_to_confirm", elapsed)
+                logger.info("✓ Login click confirmed after %.2fs", elapsed)
+                poller.reset_click()
+                return "clicked"
+
+        if poller.verify_pending():
+            return "verifying"
+        logger.warning("⚠ Login click not confirmed (attempt %d/%d)",
+                       poller.click_attempt, 1 + poller.click_retries)
+        if poller.retry_click():
+            return self.send_login_click(poller)
+        return "click_unconfirmed"
+
+    def to_client_point(self, window_info, x, y):
+        """Convert a frame position to client coordinates (what mouse messages expect)"""
+        if window_info.get("client_area"):
+            return x, y
+        rect = window_info["rect"]
+        return win32gui.ScreenToClient(window_info["hwnd"], (rect[0] + x, rect[1] + y))
+
+    def focus_window(self, hwnd):
+        """Bring the game to the foreground, unless it already is"""
+        if win32gui.GetForegroundWindow() == hwnd:
+            logger.debug("Game window already in foreground")
+            return
+        try:
+            logger.debug("Focusing game window...")
+            if win32gui.IsIconic(hwnd):
+                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            win32gui.SetForegroundWindow(hwnd)
+            time.sleep(0.5)
+            logger.debug("✓ Window focused")
+        except Exception as e:
+            logger.warning("⚠ Could not bring window to foreground: %s", e)
 
-            # Capture screenshot
-            screenshot = self.screen_detector.capture_window(window_info)
-            if not screenshot:
-                debug_print("✗ Failed to capture screenshot")
-                return "error"
-
-            # Save debug screenshot
-            saved_path = self.screen_detector.save_debug_screenshot(screenshot)
-
-            # Step 1: Check for "Login Status: 0"
-            login_status_ready, login_text = self.screen_detector.detect_login_ready(screenshot)
-
-            if not login_status_ready:
-                return "waiting_login_status"
-
-            # Step 2: Check for "Tap to land in Solaris-3" text
-            tap_text_ready, tap_text = self.screen_detector.detect_tap_to_land_text(screenshot)
-
-            if not tap_text_ready:
-                return "waiting_tap_text"
-
-            # Both indicators found! Now get click position
-            click_x, click_y = self.screen_detector.get_click_position(screenshot)
-
-            if click_x is None or click_y is None:
-                debug_print("✗ Could not calculate click position")
-                return "error"
-
-            debug_print("✓ All indicators found! Starting click sequence...")
-
-            # Step 3: Wait 5 seconds before clicking
-            import time
-            debug_print("⏳ Waiting 5 seconds before clicking...")
-            time.sleep(5)
-
-            if WIN32_AVAILABLE:
-                hwnd = window_info["hwnd"]
-
-                # Bring window to foreground and focus it
-                try:
-                    debug_print("Focusing game window...")
-                    win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                    win32gui.SetForegroundWindow(hwnd)
-                    time.sleep(0.5)
-                    debug_print("✓ Window focused")
-                except Exception as e:
-                    debug_print(f"⚠ Could not bring window to foreground: {e}")
-
-                # Move mouse to the position
-                try:
-                    rect = window_info["rect"]
-                    abs_x = rect[0] + click_x
-                    abs_y = rect[1] + click_y
-
-                    debug_print(f"Moving mouse to ({abs_x}, {abs_y})...")
-                    win32api.SetCursorPos((abs_x, abs_y))
-                    time.sleep(0.3)
-                    debug_print("✓ Mouse positioned")
-                except Exception as e:
-                    debug_print(f"⚠ Could not move mouse: {e}")
-
-                # Send click to the window
-                try:
-                    debug_print(f"Sending click at relative position ({click_x}, {click_y})...")
-                    lParam = win32api.MAKELONG(click_x, click_y)
-
-                    win32gui.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, lParam)
-                    time.sleep(0.1)
-                    win32gui.PostMessage(hwnd, win32con.WM_LBUTTONUP, 0, lParam)
-
-                    debug_print("✓ Click sent successfully!")
-                    return "clicked"
-                except Exception as e:
-                    debug_print(f"✗ Error sending click: {e}")
-                    return "error"
-            else:
-                debug_print("✗ Cannot click - win32 not available")
-                return "error"
+    def send_click(self, window_info, click_x, click_y):
+        """
+        Post a left click at (click_x, click_y) in the captured frame.
+        click_mode "foreground" (default) focuses the window and moves the
+        mouse there first; "background" only posts window messages, so the
+        user's focus and cursor are left alone.
+        Returns: "clicked" or "error"
+        """
+        if not WIN32_AVAILABLE:
+            logger.error("✗ Cannot click - win32 not available")
+            return "error"
+
+        hwnd = window_info["hwnd"]
+        background = self.config.get("click_mode", "foreground") == "background"
+
+        try:
+            client_x, client_y = self.to_client_point(window_info, click_x, click_y)
+        except Exception as e:
+            logger.error("✗ Could not map click position: %s", e)
+            return "error"
+
+        if not background:
+            self.focus_window(hwnd)
+
+            # Move mouse to the position
+            try:
+                abs_x, abs_y = win32gui.ClientToScreen(hwnd, (client_x, client_y))
+                logger.debug("Moving mouse to (%d, %d)...", abs_x, abs_y)
+                win32api.SetCursorPos((abs_x, abs_y))
+                time.sleep(0.3)
+                logger.debug("✓ Mouse positioned")
+            except Exception as e:
+                logger.warning("⚠ Could not move mouse: %s", e)
 
+        # Send click to the window
+        try:
+            logger.debug("Sending %s click at client position (%d, %d)...",
+                         "background" if background else "foreground", client_x, client_y)
+            lParam = win32api.MAKELONG(client_x, client_y)
+
+            if background:
+                # Some games track the pointer from move messages rather than the click itself
+                win32gui.PostMessage(hwnd, win32con.WM_MOUSEMOVE, 0, lParam)
+            win32gui.PostMessage(hwnd, win32con.WM_LBUTTONDOWN, win32con.MK_LBUTTON, lParam)
+            time.sleep(0.1)
+            win32gui.PostMessage(hwnd, win32con.WM_LBUTTONUP, 0, lParam)
+
+            logger.info("✓ Click sent successfully!")
+            return "clicked"
         except Exception as e:
-            debug_print(f"✗ Error in click_login_screen: {e}")
-            import traceback
-            debug_print(traceback.format_exc())
+            logger.error("✗ Error sending click: %s", e)
             return "error"
 
+    def get_notice_text(self, hwnd):
+        """Text of a Notice dialog from its child controls, or by OCR when they hold none"""
+        def collect_text(hwnd_child, texts):
+            text = win32gui.GetWindowText(hwnd_child)
+            if text and len(text.strip()) > 0:
+                texts.append(text.strip())
+            return True
+
+        texts = []
+        try:
+            win32gui.EnumChildWindows(hwnd, collect_text, texts)
+        except Exception as e:
+            logger.warning("Could not get window text: %s", e)
+
+        if texts:
+            return " ".join(texts)
+        return self.read_notice_by_ocr(hwnd)
+
+    def read_notice_by_ocr(self, hwnd):
+        """
+        OCR a Notice dialog whose text is drawn rather than held in controls.
+        The result is reused while the dialog looks the same, and for at least
+        notice_ocr_interval_seconds, so an open dialog is not OCR'd every tick.
+        """
+        now = time.monotonic()
+        cached_hwnd, cached_signature, cached_at, cached_text = self._notice_ocr
+        interval = self.config.get("notice_ocr_interval_seconds", 10)
+        if cached_hwnd == hwnd and now - cached_at < interval:
+            return cached_text
+
+        try:
+            rect = win32gui.GetWindowRect(hwnd)
+        except Exception as e:
+            logger.debug("Notice window rect unavailable: %s", e)
+            return ""
+        window_info = {"hwnd": hwnd, "rect": rect, "width": rect[2] - rect[0], "height": rect[3] - rect[1]}
+        screenshot = self.screen_detector.capture_window(window_info)
+        if screenshot is None:
+            return ""
+
+        signature = self.screen_detector.frame_signature(screenshot)
+        if cached_hwnd == hwnd and signature is not None and signature == cached_signature:
+            text = cached_text
+        else:
+            text = self.screen_detector.read_text(screenshot, "notice") or ""
+            logger.debug("Notice text via OCR: %r", text[:100])
+        self.screen_detector.release_frame(screenshot, keep_thumbnail=False)
+
+        self._notice_ocr = (hwnd, signature, now, text)
+        return text
+
+    def find_notice_exit_button(self, hwnd):
+        """First child button whose caption contains "exit", or None"""
+        def find_exit_button(hwnd_child, buttons):
+            text = win32gui.GetWindowText(hwnd_child)
+            class_name = win32gui.GetClassName(hwnd_child)
+            if text and "exit" in text.lower() and "button" in class_name.lower():
+                buttons.append(hwnd_child)
+                logger.debug("Found button: '%s' (%s)", text, class_name)
+            return True
+
+        buttons = []
+        win32gui.EnumChildWindows(hwnd, find_exit_button, buttons)
+        return buttons[0] if buttons else None
+
+    def dismiss_notice(self, hwnd, button):
+        """Click the Exit button after a short pause, or close the dialog if it has none"""
+        time.sleep(2)
+        if button:
+            win32gui.PostMessage(button, win32con.WM_LBUTTONDOWN, 0, 0)
+            win32gui.PostMessage(button, win32con.WM_LBUTTONUP, 0, 0)
+            logger.info("✓ Exit button clicked")
+        else:
+            logger.warning("⚠ Exit button not found, trying to close window")
+            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+
     def check_for_patcher(self):
         """
         Check for Notice/Patcher window and handle it intelligently
@@ -182,6 +467,7 @@ class GameController:
         - "patching" - Still patching/updating
         - None - No notice window found
         """
+        self.last_notice_text = None
         if not WIN32_AVAILABLE:
             return None
 
@@ -196,106 +482,46 @@ class GameController:
             windows = []
             win32gui.EnumWindows(enum_windows_callback, windows)
 
+            # With several profiles, only this profile's game's notices are ours to dismiss
+            install_dir = self.get_install_dir()
+            if install_dir:
+                install_dir = os.path.normcase(os.path.abspath(install_dir))
+
             for hwnd, title in windows:
                 # Look for Notice window
-                if "Notice" in title or "notice" in title.lower():
-                    debug_print(f"Found Notice window: '{title}'")
-
-                    # Try to get all text from the window
-                    window_text = ""
-
-                    def collect_text(hwnd_child, texts):
-                        text = win32gui.GetWindowText(hwnd_child)
-                        if text and len(text.strip()) > 0:
-                            texts.append(text.strip())
-                        return True
-
-                    texts = []
-                    try:
-                        win32gui.EnumChildWindows(hwnd, collect_text, texts)
-                        window_text = " ".join(texts).lower()
-                        debug_print(f"Notice window text: '{window_text[:100]}'")
-                    except Exception as e:
-                        debug_print(f"Could not get window text: {e}")
-
-                    # Analyze the text to determine the type of notice
-                    notice_type = None
-
-                    if "update complete" in window_text or "patch" in window_text and "complete" in window_text:
-                        notice_type = "update_complete"
-                        debug_print("✓ Detected: Update/Patch Complete")
-                    elif "patching complete" in window_text or "restart the game" in window_text:
-                        notice_type = "update_complete"
-                        debug_print("✓ Detected: Patching Complete - Restart Required")
-                    elif "network" in window_text and ("error" in window_text or "fail" in window_text):
-                        notice_type = "network_error"
-                        debug_print("⚠ Detected: Network Error")
-                    elif "update" in window_text or "patch" in window_text or "download" in window_text:
-                        notice_type = "patching"
-                        debug_print("⏳ Detected: Updating/Patching in progress")
-                    else:
-                        notice_type = "unknown"
-                        debug_print(f"⚠ Unknown notice type")
-
-                    # Look for Exit button
-                    def find_exit_button(hwnd_child, buttons):
-                        text = win32gui.GetWindowText(hwnd_child)
-                        class_name = win32gui.GetClassName(hwnd_child)
-                        if text and "exit" in text.lower() and "button" in class_name.lower():
-                            buttons.append((hwnd_child, text))
-                            debug_print(f"Found button: '{text}' ({class_name})")
-                        return True
-
-                    buttons = []
-                    win32gui.EnumChildWindows(hwnd, find_exit_button, buttons)
-
-                    # Handle based on notice type
-                    if notice_type == "update_complete":
-                        debug_print("Update complete - will click Exit after 2 seconds")
-                        import time
-                        time.sleep(2)
-
-                        if buttons:
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONDOWN, 0, 0)
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONUP, 0, 0)
-                            debug_print("✓ Exit button clicked")
-                            return "update_complete"
-                        else:
-                            debug_print("⚠ Exit button not found, trying to close window")
-                            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-                            return "update_complete"
-
-                    elif notice_type == "network_error":
-                        debug_print("Network error - will click Exit after 2 seconds")
-                        import time
-                        time.sleep(2)
-
-                        if buttons:
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONDOWN, 0, 0)
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONUP, 0, 0)
-                            debug_print("✓ Exit button clicked")
-                            return "network_error"
-                        else:
-                            win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
-                            return "network_error"
-
-                    elif notice_type == "patching":
-                        debug_print("Patching in progress - waiting...")
-                        return "patching"
-
-                    else:
-                        # Unknown type, but there's a notice window
-                        debug_print("Unknown notice type - treating as update complete")
-                        if buttons:
-                            import time
-                            time.sleep(2)
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONDOWN, 0, 0)
-                            win32gui.PostMessage(buttons[0][0], win32con.WM_LBUTTONUP, 0, 0)
-                            return "update_complete"
+                if "notice" not in title.lower():
+                    continue
+                if install_dir and not self.owns_window(hwnd, install_dir):
+                    continue
+
+                logger.debug("Found Notice window: '%s'", title)
+                self.last_notice_text = self.get_notice_text(hwnd)
+                notice_type = self.notice_classifier.classify(self.last_notice_text)
+
+                if notice_type == NOTICE_UPDATE_COMPLETE:
+                    logger.info("✓ Detected: Update/Patch Complete - will click Exit after 2 seconds")
+                    self.dismiss_notice(hwnd, self.find_notice_exit_button(hwnd))
+                    return "update_complete"
+
+                elif notice_type == NOTICE_NETWORK_ERROR:
+                    logger.warning("⚠ Detected: Network Error - will click Exit after 2 seconds")
+                    self.dismiss_notice(hwnd, self.find_notice_exit_button(hwnd))
+                    return "network_error"
+
+                elif notice_type == NOTICE_PATCHING:
+                    logger.debug("⏳ Detected: Updating/Patching in progress - waiting...")
+                    return "patching"
+
+                else:
+                    # Unknown type, but there's a notice window
+                    button = self.find_notice_exit_button(hwnd)
+                    if button:
+                        logger.info("Unknown notice type - treating as update complete")
+                        self.dismiss_notice(hwnd, button)
+                        return "update_complete"
+                    logger.warning("⚠ Unknown notice type")
 
         except Exception as e:
-            debug_print(f"✗ Error checking patcher: {e}")
-            import traceback
-            debug_print(traceback.format_exc())
+            logger.exception("✗ Error checking patcher: %s", e)
 
-        return None
\ No newline at end of file
+        return None
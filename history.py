@@ -0,0 +1,249 @@
+# ============================================================
+# File: history.py
+# ============================================================
+"""
+Per-period run history in SQLite (WAL mode).
+
+Tracking.reset used to discard the finished period; now each period is
+written here as one row per (period, profile). Writes are queued and
+committed in batches by a background thread, never on the GUI thread.
+
+View it with:
+    python history.py                    # last 30 periods, all profiles
+    python history.py --profile alt --days 90
+"""
+import argparse
+import json
+import queue
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+
+from log_manager import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+DEFAULT_HISTORY_DB = "ww_launcher_history.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    period TEXT NOT NULL,
+    profile TEXT NOT NULL,
+    launch_time TEXT,
+    start_method TEXT,
+    login_click_time TEXT,
+    time_to_login_seconds REAL,
+    login_ready_seconds REAL,
+    ocr_attempts INTEGER NOT NULL DEFAULT 0,
+    patch_events INTEGER NOT NULL DEFAULT 0,
+    patch_seconds INTEGER NOT NULL DEFAULT 0,
+    resource_summary TEXT,
+    final_playtime_seconds INTEGER NOT NULL DEFAULT 0,
+    requirement_met INTEGER NOT NULL DEFAULT 0,
+    recorded_at TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_runs_period_profile ON runs (period, profile);
+"""
+
+COLUMNS = (
+    "period", "profile", "launch_time", "start_method", "login_click_time", "time_to_login_seconds",
+    "login_ready_seconds", "ocr_attempts", "patch_events", "patch_seconds", "resource_summary", "final_playtime_seconds",
+    "requirement_met", "recorded_at",
+)
+
+# Re-recording a period (e.g. on exit, then again at reset) updates its row
+UPSERT_SQL = (
+    f"INSERT INTO runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' for _ in COLUMNS)}) "
+    f"ON CONFLICT(period, profile) DO UPDATE SET "
+    + ", ".join(f"{c} = excluded.{c}" for c in COLUMNS if c not in ("period", "profile"))
+)
+
+
+def _connect(db_path):
+    connection = sqlite3.connect(db_path, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def row_from_tracking(profile, tracking):
+    """Build a history row from a Tracking data dict"""
+    launch_time = tracking.get("launch_time")
+    login_click_time = tracking.get("login_click_time")
+
+    time_to_login = None
+    if launch_time and login_click_time:
+        try:
+            time_to_login = (datetime.fromisoformat(login_click_time) -
+                             datetime.fromisoformat(launch_time)).total_seconds()
+        except ValueError:
+            pass
+
+    return (
+        tracking.get("current_reset_period"),
+        profile,
+        launch_time,
+        tracking.get("start_method"),
+        login_click_time,
+        time_to_login,
+        tracking.get("login_ready_seconds"),
+        tracking.get("ocr_attempts") or 0,
+        tracking.get("patch_events") or 0,
+        tracking.get("patch_seconds") or 0,
+        json.dumps(tracking["resource_summary"]) if tracking.get("resource_summary") else None,
+        tracking.get("total_playtime_seconds") or 0,
+        1 if tracking.get("requirement_met") else 0,
+        datetime.now().isoformat(),
+    )
+
+
+class HistoryStore:
+    """SQLite history with a batching background writer"""
+
+    def __init__(self, db_path=DEFAULT_HISTORY_DB, batch_size=50, batch_wait_seconds=2.0):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.batch_wait_seconds = batch_wait_seconds
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._writer, name="history-writer", daemon=True)
+        self._thread.start()
+        return self
+
+    def record_period(self, profile, tracking):
+        """Queue one period's tracking data (copied, so later edits don't leak in)"""
+        if not tracking.get("current_reset_period"):
+            return
+        self._queue.put(row_from_tracking(profile, dict(tracking)))
+
+    def _writer(self):
+        try:
+            connection = _connect(self.db_path)
+        except sqlite3.Error as e:
+            logger.error("✗ Could not open history database %s: %s", self.db_path, e)
+            return
+
+        stopping = False
+        while not stopping:
+            row = self._queue.get()
+            if row is None:
+                break
+
+            # Collect whatever else arrives shortly after into the same transaction
+            rows = [row]
+            while len(rows) < self.batch_size:
+                try:
+                    row = self._queue.get(timeout=self.batch_wait_seconds)
+                except queue.Empty:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                rows.append(row)
+
+            try:
+                with metrics.span("history.insert"):
+                    with connection:
+                        connection.executemany(UPSERT_SQL, rows)
+                logger.debug("✓ History: %d row(s) written", len(rows))
+            except sqlite3.Error as e:
+                logger.error("✗ Error writing history: %s", e)
+
+        connection.close()
+
+    def close(self, timeout=5):
+        """Flush queued rows and stop the writer"""
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+
+
+def query_history(db_path=DEFAULT_HISTORY_DB, profile=None, days=30):
+    """Rows (as dicts) for the last `days` periods, newest first"""
+    connection = _connect(db_path)
+    connection.row_factory = sqlite3.Row
+    try:
+        sql = "SELECT * FROM runs WHERE period >= ?"
+        params = [(datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")]
+        if profile:
+            sql += " AND profile = ?"
+            params.append(profile)
+        sql += " ORDER BY period DESC, profile"
+        return [dict(row) for row in connection.execute(sql, params)]
+    finally:
+        connection.close()
+
+
+def recent_login_ready_times(db_path=DEFAULT_HISTORY_DB, profile="default", limit=20):
+    """Seconds from start to a ready login screen for the last `limit` periods, oldest first"""
+    connection = _connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT login_ready_seconds FROM runs WHERE profile = ? AND login_ready_seconds IS NOT NULL "
+            "ORDER BY period DESC LIMIT ?", (profile, limit)
+        ).fetchall()
+    finally:
+        connection.close()
+    return [row[0] for row in reversed(rows)]
+
+
+def recent_patch_stats(db_path=DEFAULT_HISTORY_DB, profile="default", limit=30):
+    """(patch_events, patch_seconds) for the last `limit` periods, oldest first"""
+    connection = _connect(db_path)
+    try:
+        rows = connection.execute(
+            "SELECT patch_events, patch_seconds FROM runs WHERE profile = ? ORDER BY period DESC LIMIT ?",
+            (profile, limit)
+        ).fetchall()
+    finally:
+        connection.close()
+    return [tuple(row) for row in reversed(rows)]
+
+
+def _fmt_seconds(value):
+    if value is None:
+        return "-"
+    value = int(value)
+    return f"{value // 60}m{value % 60:02d}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show launcher run history")
+    parser.add_argument("--db", default=DEFAULT_HISTORY_DB)
+    parser.add_argument("--profile", help="Only this profile")
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    rows = query_history(args.db, args.profile, args.days)
+    if not rows:
+        print("No history recorded yet")
+        return 0
+
+    print(f"{'period':<12}{'profile':<12}{'launch':<10}{'to login':>10}{'ocr':>6}{'patch':>7}{'playtime':>10}"
+          f"{'cpu avg':>9}{'rss max':>9}  met")
+    for row in rows:
+        launch = row["launch_time"][11:19] if row["launch_time"] else "-"
+        resources = json.loads(row["resource_summary"]) if row.get("resource_summary") else {}
+        cpu = resources.get("cpu_mean_percent")
+        rss = resources.get("rss_max_mb")
+        print(f"{row['period']:<12}{row['profile'][:11]:<12}{launch:<10}"
+              f"{_fmt_seconds(row['time_to_login_seconds']):>10}{row['ocr_attempts']:>6}"
+              f"{row['patch_events']:>7}{_fmt_seconds(row['final_playtime_seconds']):>10}"
+              f"{f'{cpu:.0f}%' if cpu is not None else '-':>9}{f'{rss:.0f}MB' if rss is not None else '-':>9}"
+              f"  {'✓' if row['requirement_met'] else '✗'}")
+
+    logins = [r["time_to_login_seconds"] for r in rows if r["time_to_login_seconds"] is not None]
+    met = sum(1 for r in rows if r["requirement_met"])
+    print(f"\n{len(rows)} period(s), requirement met {met}/{len(rows)}"
+          + (f", avg time to login {_fmt_seconds(sum(logins) / len(logins))}" if logins else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+# ============================================================
+# File: idle_policy.py
+# ============================================================
+"""
+Low-resource idle mode for the game after the login click.
+
+Once logged in, the game only has to stay alive until the playtime
+requirement is met. The idle policy lowers its priority, pins it to a
+couple of cores, minimises its window and (Windows 11) opts it into
+EcoQoS power throttling. Everything is put back when the requirement is
+met, or as soon as the user brings the game window back - in that case
+the policy leaves that game process alone for the rest of its life.
+
+Priority and affinity go through psutil, so the same code runs against
+any process on Linux (see benchmarks/check_idle_policy.py).
+"""
+import sys
+
+import psutil
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import win32gui
+    import win32con
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+if sys.platform == "win32":
+    IDLE_PRIORITY = psutil.IDLE_PRIORITY_CLASS
+    BELOW_NORMAL_PRIORITY = psutil.BELOW_NORMAL_PRIORITY_CLASS
+else:
+    IDLE_PRIORITY = 19
+    BELOW_NORMAL_PRIORITY = 10
+
+PRIORITIES = {"below_normal": BELOW_NORMAL_PRIORITY, "idle": IDLE_PRIORITY}
+
+# SetProcessInformation(ProcessPowerThrottling) - EcoQoS on Windows 11
+PROCESS_SET_INFORMATION = 0x0200
+PROCESS_POWER_THROTTLING = 4
+PROCESS_POWER_THROTTLING_EXECUTION_SPEED = 0x1
+
+
+def set_power_throttling(pid, enabled):
+    """Best effort EcoQoS on/off for a process; False where unsupported"""
+    if sys.platform != "win32":
+        return False
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_POWER_THROTTLING_STATE(ctypes.Structure):
+            _fields_ = [("Version", wintypes.ULONG), ("ControlMask", wintypes.ULONG),
+                        ("StateMask", wintypes.ULONG)]
+
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_SET_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            # ControlMask 0 hands the decision back to the system
+            state = PROCESS_POWER_THROTTLING_STATE(
+                1, PROCESS_POWER_THROTTLING_EXECUTION_SPEED if enabled else 0,
+                PROCESS_POWER_THROTTLING_EXECUTION_SPEED if enabled else 0)
+            return bool(kernel32.SetProcessInformation(handle, PROCESS_POWER_THROTTLING,
+                                                       ctypes.byref(state), ctypes.sizeof(state)))
+        finally:
+            kernel32.CloseHandle(handle)
+    except Exception as e:
+        logger.debug("Power throttling not available: %s", e)
+        return False
+
+
+class IdlePolicy:
+    """Applies and restores idle settings for one game process at a time"""
+
+    def __init__(self, priority="below_normal", cores=2, minimize=True, power_throttling=False,
+                 restore_on_focus=True):
+        self.priority_name = priority if priority in PRIORITIES else "below_normal"
+        self.priority = PRIORITIES[self.priority_name]
+        self.cores = cores
+        self.minimize = minimize
+        self.power_throttling = power_throttling
+        self.restore_on_focus = restore_on_focus
+
+        self.pid = None
+        self.hwnd = None
+        self.minimized = False
+        self._left_foreground = False
+        self._saved = {}
+        self._declined_pid = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            priority=config.get("idle_priority", "below_normal"),
+            cores=config.get("idle_cpu_cores", 2),
+            minimize=config.get("idle_minimize", True),
+            power_throttling=config.get("idle_power_throttling", False),
+            restore_on_focus=config.get("idle_restore_on_focus", True),
+        )
+
+    @property
+    def active(self):
+        return self.pid is not None
+
+    def idle_cores(self, available):
+        """The last `cores` CPUs (core 0 usually carries the most interrupts)"""
+        if not self.cores or self.cores >= len(available):
+            return None
+        return sorted(available)[-self.cores:]
+
+    def apply(self, proc, hwnd=None):
+        """Put `proc` into idle mode, remembering what to restore; False if it could not be touched"""
+        if self.active or proc.pid == self._declined_pid:
+            return False
+
+        saved = {}
+        try:
+            saved["nice"] = proc.nice()
+            proc.nice(self.priority)
+            if hasattr(proc, "cpu_affinity"):
+                saved["affinity"] = proc.cpu_affinity()
+                cores = self.idle_cores(saved["affinity"])
+                if cores:
+                    proc.cpu_affinity(cores)
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            logger.warning("⚠ Could not apply idle mode to PID %d: %s", proc.pid, e)
+            self._saved = saved
+            self.pid = proc.pid
+            self.restore(proc)
+            # Don't retry every tick for a process we may not touch
+            self._declined_pid = proc.pid
+            return False
+
+        if self.power_throttling and set_power_throttling(proc.pid, True):
+            saved["power_throttling"] = True
+
+        self.minimized = False
+        if self.minimize and hwnd and WIN32_AVAILABLE:
+            try:
+                win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+                self.minimized = True
+            except Exception as e:
+                logger.debug("Could not minimise game window: %s", e)
+
+        self.pid = proc.pid
+        self.hwnd = hwnd
+        self._left_foreground = False
+        self._saved = saved
+        logger.info("✓ Idle mode on for PID %d (priority %s, cores %s)", proc.pid, self.priority_name,
+                    proc.cpu_affinity() if hasattr(proc, "cpu_affinity") else "-")
+        return True
+
+    def restore(self, proc=None, reason=None):
+        """Undo apply(); a process that has exited needs nothing restored"""
+        if not self.active:
+            return
+        try:
+            proc = proc if proc is not None and proc.pid == self.pid else psutil.Process(self.pid)
+        except psutil.NoSuchProcess:
+            proc = None
+        # Each setting on its own, so one that can't be restored doesn't block the others
+        for name, restore in (("affinity", lambda value: proc.cpu_affinity(value)),
+                              ("nice", lambda value: proc.nice(value))):
+            if proc is None or name not in self._saved:
+                continue
+            try:
+                restore(self._saved[name])
+            except psutil.NoSuchProcess:
+                proc = None
+            except psutil.AccessDenied as e:
+                # e.g. Linux: raising priority back needs privileges
+                logger.warning("⚠ Could not restore %s of PID %d: %s", name, self.pid, e)
+        if self._saved.get("power_throttling"):
+            set_power_throttling(self.pid, False)
+
+        if reason:
+            logger.info("Idle mode off for PID %d (%s)", self.pid, reason)
+        self.pid = None
+        self.hwnd = None
+        self._saved = {}
+
+    def user_returned(self):
+        """
+        True once the user restores the game window we minimised, or switches
+        back to it after having left it (the login click may have focused it)
+        """
+        if not self.restore_on_focus or not self.hwnd or not WIN32_AVAILABLE:
+            return False
+        try:
+            if not win32gui.IsWindow(self.hwnd):
+                return False
+            if self.minimized and not win32gui.IsIconic(self.hwnd):
+                return True
+            if win32gui.GetForegroundWindow() != self.hwnd:
+                self._left_foreground = True
+                return False
+            return self._left_foreground
+        except Exception:
+            return False
+
+    def update(self, proc, wanted, hwnd_lookup=None):
+        """
+        One tick: idle mode on while `wanted` (logged in, requirement open), off otherwise.
+        hwnd_lookup(pid) finds the game window; only called when idle mode is applied.
+        """
+        if self.active and (proc is None or proc.pid != self.pid):
+            self.restore(reason="game exited")
+
+        if proc is None:
+            return
+
+        if self.active:
+            if not wanted:
+                self.restore(proc, "no longer needed")
+            elif self.user_returned():
+                self._declined_pid = proc.pid
+                self.restore(proc, "game window in use")
+        elif wanted:
+            self.apply(proc, hwnd_lookup(proc.pid) if hwnd_lookup else None)
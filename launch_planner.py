@@ -0,0 +1,197 @@
+# ============================================================
+# File: launch_planner.py
+# ============================================================
+"""
+Deadline-aware auto-launch planning.
+
+The configured auto_launch_time only works when the game starts straight
+away. The planner works back from the next reset:
+
+    latest safe launch = next reset - (patch allowance + login + remaining playtime + margin)
+
+and launches at whichever comes first, the configured time or the latest
+safe one. The patch allowance is the typical recorded patch duration, but
+only counts when recent history says an update is likely. While a patch is
+running, its progress is read from the Notice window text to estimate the
+time left.
+"""
+import re
+from datetime import datetime, timedelta
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+_PERCENT = re.compile(r"(\d{1,3}(?:\.\d+)?)\s*%")
+_SIZES = re.compile(r"(\d+(?:\.\d+)?)\s*([kmg]i?b)\s*/\s*(\d+(?:\.\d+)?)\s*([kmg]i?b)", re.IGNORECASE)
+_UNITS = {"k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+def _to_bytes(value, unit):
+    return float(value) * _UNITS[unit[0].lower()]
+
+
+def parse_patch_progress(text):
+    """
+    Progress fraction (0.0-1.0) from Notice text like "Downloading 45%" or
+    "1.2 GB / 3.5 GB", or None if the text holds no progress.
+    """
+    if not text:
+        return None
+
+    sizes = _SIZES.search(text)
+    if sizes:
+        done = _to_bytes(sizes.group(1), sizes.group(2))
+        total = _to_bytes(sizes.group(3), sizes.group(4))
+        if total > 0 and done <= total:
+            return done / total
+
+    percents = [float(p) for p in _PERCENT.findall(text) if float(p) <= 100]
+    if percents:
+        # Overall progress is usually the last percentage shown
+        return percents[-1] / 100.0
+    return None
+
+
+def login_estimate_seconds(login_model, fallback_seconds):
+    """Typical seconds from launch to a clicked login (fallback until the model has samples)"""
+    if login_model is not None and login_model.enabled and login_model.trained:
+        return login_model.expected_ready()
+    return fallback_seconds
+
+
+class PatchTracker:
+    """
+    Follows one patch from the first "patching" status to its completion,
+    keeping state in the profile's Tracking so it survives restarts.
+    """
+
+    def __init__(self, tracking):
+        self.tracking = tracking
+        self._samples = []  # (datetime, progress) of the running patch
+
+    def observe(self, patcher_status, notice_text=None, now=None):
+        """Feed one tick's patcher status; returns the patch duration when a patch just completed"""
+        now = now or datetime.now()
+
+        if patcher_status == "patching":
+            if not self.tracking["patch_started_at"]:
+                logger.info("Patch started")
+                self.tracking["patch_started_at"] = now.isoformat()
+                self._samples = []
+                self.tracking.force_save()
+
+            progress = parse_patch_progress(notice_text)
+            if progress is not None:
+                self.tracking["patch_progress"] = round(progress, 4)
+                self._samples.append((now, progress))
+                del self._samples[:-30]
+
+        elif self.tracking["patch_started_at"]:
+            # Any other status ends the patch; only a completed one is timed
+            started = datetime.fromisoformat(self.tracking["patch_started_at"])
+            duration = max(0, int((now - started).total_seconds()))
+            self.tracking["patch_started_at"] = None
+            self.tracking["patch_progress"] = None
+            self._samples = []
+            if patcher_status == "update_complete":
+                logger.info("Patch finished in %dm %ds", duration // 60, duration % 60)
+                self.tracking["patch_seconds"] = (self.tracking["patch_seconds"] or 0) + duration
+                self.tracking.force_save()
+                return duration
+            logger.info("Patch ended without completing (%s)", patcher_status or "notice closed")
+            self.tracking.force_save()
+        return None
+
+    def estimate_remaining_seconds(self, now=None):
+        """Linear estimate from the progress samples of the running patch, or None"""
+        if len(self._samples) < 2:
+            return None
+        (first_at, first), (last_at, last) = self._samples[0], self._samples[-1]
+        elapsed = (last_at - first_at).total_seconds()
+        if last <= first or elapsed <= 0:
+            return None
+        rate = (last - first) / elapsed
+        since_last = ((now or datetime.now()) - last_at).total_seconds()
+        return max(0.0, (1.0 - last) / rate - since_last)
+
+    def status_text(self):
+        """e.g. "45% (~6m left)" while a patch with known progress runs, else None"""
+        progress = self.tracking["patch_progress"]
+        if progress is None or not self.tracking["patch_started_at"]:
+            return None
+        text = f"{progress * 100:.0f}%"
+        remaining = self.estimate_remaining_seconds()
+        if remaining is not None:
+            text += f" (~{int(remaining // 60) + 1}m left)"
+        return text
+
+
+class LaunchPlanner:
+    """Latest safe launch time for one profile, learned from its patch history"""
+
+    def __init__(self, safety_margin_seconds=600, patch_probability_threshold=0.2,
+                 default_patch_seconds=1200, enabled=True):
+        self.safety_margin_seconds = safety_margin_seconds
+        self.patch_probability_threshold = patch_probability_threshold
+        self.default_patch_seconds = default_patch_seconds
+        self.enabled = enabled
+        self.patch_probability = 0.0
+        self.patch_durations = []
+        self._last_reason = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            safety_margin_seconds=(config.get("launch_safety_margin_minutes") or 0) * 60,
+            patch_probability_threshold=config.get("patch_probability_threshold", 0.2),
+            default_patch_seconds=(config.get("default_patch_minutes") or 20) * 60,
+            enabled=config.get("early_launch_enabled", True),
+        )
+
+    def seed(self, periods):
+        """periods: [(patch_events, patch_seconds), ...] for recent reset periods"""
+        periods = list(periods)
+        if not periods:
+            return
+        patched = [(events, seconds) for events, seconds in periods if events]
+        self.patch_probability = len(patched) / len(periods)
+        self.patch_durations = [seconds for _, seconds in patched if seconds]
+        logger.info("Launch planner: updates in %d of %d recent periods%s", len(patched), len(periods),
+                    f", typical patch {self.typical_patch_seconds() // 60}m" if self.patch_durations else "")
+
+    def record_patch(self, duration_seconds):
+        if duration_seconds:
+            self.patch_durations = (self.patch_durations + [duration_seconds])[-30:]
+
+    def typical_patch_seconds(self):
+        """75th percentile of recorded patch durations (or the default without history)"""
+        if not self.patch_durations:
+            return self.default_patch_seconds
+        durations = sorted(self.patch_durations)
+        return int(durations[min(len(durations) - 1, int(len(durations) * 0.75))])
+
+    def update_likely(self):
+        return self.patch_probability >= self.patch_probability_threshold
+
+    def latest_safe_launch(self, next_reset, remaining_seconds, login_seconds):
+        needed = remaining_seconds + login_seconds + self.safety_margin_seconds
+        if self.update_likely():
+            needed += self.typical_patch_seconds()
+        return next_reset - timedelta(seconds=needed)
+
+    def plan(self, configured_launch, next_reset, remaining_seconds, login_seconds):
+        """Auto-launch time: the configured one, or earlier when that would be too late"""
+        if not self.enabled:
+            return configured_launch
+
+        latest = self.latest_safe_launch(next_reset, remaining_seconds, login_seconds)
+        if latest >= configured_launch:
+            return configured_launch
+
+        reason = latest.strftime("%H:%M")
+        if reason != self._last_reason:
+            logger.info("Auto-launch moved earlier to %s (%s)", reason,
+                        "update likely" if self.update_likely() else "not enough time before reset")
+            self._last_reason = reason
+        return latest
@@ -0,0 +1,180 @@
+# ============================================================
+# File: launch_scheduler.py
+# ============================================================
+import shutil
+import subprocess
+import threading
+import time
+from datetime import datetime
+
+import psutil
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+
+class HeadroomProbe:
+    """
+    Samples CPU, RAM and (when nvidia-smi is available) GPU load.
+    psutil has no GPU API, so GPU utilisation comes from nvidia-smi and is
+    treated as unknown on other hardware. nvidia-smi can take seconds to
+    answer, so it runs on a worker thread and sample() returns the last
+    reading (unknown until the first one arrives).
+    """
+
+    GPU_SAMPLE_SECONDS = 30
+
+    def __init__(self):
+        self._nvidia_smi = shutil.which("nvidia-smi")
+        self._gpu_percent = None
+        self._gpu_sampled_at = None
+        self._gpu_thread = None
+        # First cpu_percent(None) call only primes the counter
+        psutil.cpu_percent(interval=None)
+
+    def _sample_gpu(self):
+        """Last GPU reading; starts a new one in the background when it is stale"""
+        if not self._nvidia_smi:
+            return None
+
+        stale = (self._gpu_sampled_at is None
+                 or time.monotonic() - self._gpu_sampled_at >= self.GPU_SAMPLE_SECONDS)
+        if stale and (self._gpu_thread is None or not self._gpu_thread.is_alive()):
+            self._gpu_sampled_at = time.monotonic()
+            self._gpu_thread = threading.Thread(target=self._read_gpu, name="gpu-sample", daemon=True)
+            self._gpu_thread.start()
+        return self._gpu_percent
+
+    def _read_gpu(self):
+        try:
+            result = subprocess.run(
+                [self._nvidia_smi, "--query-gpu=utilization.gpu", "--format=csv,noheader,nounits"],
+                capture_output=True, text=True, timeout=5,
+                creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0)
+            )
+            values = [float(v) for v in result.stdout.split() if v.strip()]
+            self._gpu_percent = max(values) if values else None
+        except Exception as e:
+            logger.debug("GPU sample failed: %s", e)
+            self._gpu_percent = None
+
+    def sample(self):
+        memory = psutil.virtual_memory()
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "free_ram_mb": memory.available // (1024 * 1024),
+            "gpu_percent": self._sample_gpu()
+        }
+
+
+class LaunchRequest:
+    """A pending game launch for one profile"""
+
+    def __init__(self, key, launch, deadline, remaining_seconds):
+        self.key = key
+        self.launch = launch
+        self.deadline = deadline
+        self.remaining_seconds = remaining_seconds
+        self.requested_at = datetime.now()
+
+    def latest_start(self):
+        """Last moment a launch can start and still meet its requirement"""
+        return self.deadline.timestamp() - self.remaining_seconds
+
+    def sort_key(self):
+        # Least slack first; among equals the longest job first keeps total wall time down
+        return (self.latest_start(), -self.remaining_seconds)
+
+
+class LaunchScheduler:
+    """
+    Staggers game launches and caps concurrent instances based on machine headroom.
+    Requests close to their deadline bypass the headroom check (but not the cap)
+    so a busy machine never costs an account its daily requirement. Headroom
+    only matters when instances share the machine: a lone request with no
+    game running and no other profiles configured launches straight away.
+    """
+
+    def __init__(self, max_concurrent=2, stagger_seconds=60, min_free_ram_mb=4096,
+                 max_cpu_percent=80, max_gpu_percent=90, urgent_margin_seconds=600, probe=None):
+        self.max_concurrent = max(1, max_concurrent)
+        self.stagger_seconds = stagger_seconds
+        self.min_free_ram_mb = min_free_ram_mb
+        self.max_cpu_percent = max_cpu_percent
+        self.max_gpu_percent = max_gpu_percent
+        self.urgent_margin_seconds = urgent_margin_seconds
+        self.probe = probe or HeadroomProbe()
+        self.pending = {}
+        self.last_launch_at = None
+        self.last_block_reason = None
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_concurrent=config.get("max_concurrent_instances", 2),
+            stagger_seconds=config.get("launch_stagger_seconds", 60),
+            min_free_ram_mb=config.get("min_free_ram_mb", 4096),
+            max_cpu_percent=config.get("max_cpu_percent", 80),
+            max_gpu_percent=config.get("max_gpu_percent", 90),
+        )
+
+    def request(self, key, launch, deadline, remaining_seconds):
+        """Queue a launch (no-op if the profile is already queued)"""
+        if key not in self.pending:
+            logger.info("Launch queued: %s (deadline %s)", key, deadline.strftime("%H:%M"))
+            self.pending[key] = LaunchRequest(key, launch, deadline, remaining_seconds)
+
+    def cancel(self, key):
+        self.pending.pop(key, None)
+
+    def is_pending(self, key):
+        return key in self.pending
+
+    def _headroom_block_reason(self):
+        sample = self.probe.sample()
+        if sample["cpu_percent"] > self.max_cpu_percent:
+            return f"CPU {sample['cpu_percent']:.0f}% > {self.max_cpu_percent}%"
+        if sample["free_ram_mb"] < self.min_free_ram_mb:
+            return f"free RAM {sample['free_ram_mb']} MB < {self.min_free_ram_mb} MB"
+        gpu = sample["gpu_percent"]
+        if gpu is not None and gpu > self.max_gpu_percent:
+            return f"GPU {gpu:.0f}% > {self.max_gpu_percent}%"
+        return None
+
+    def tick(self, running_count, shared=True):
+        """
+        Launch at most one queued request if allowed.
+        shared: other profiles are configured on this machine.
+        Returns the key that was launched, or None.
+        """
+        if not self.pending:
+            return None
+
+        if running_count >= self.max_concurrent:
+            self.last_block_reason = f"{running_count}/{self.max_concurrent} instances running"
+            return None
+
+        now = time.monotonic()
+        if self.last_launch_at is not None and now - self.last_launch_at < self.stagger_seconds:
+            self.last_block_reason = "staggering launches"
+            return None
+
+        request = min(self.pending.values(), key=LaunchRequest.sort_key)
+        urgent = request.latest_start() - datetime.now().timestamp() <= self.urgent_margin_seconds
+        contended = shared or running_count > 0 or len(self.pending) > 1
+
+        if contended and not urgent:
+            reason = self._headroom_block_reason()
+            if reason:
+                if reason != self.last_block_reason:
+                    logger.info("Launch of %s deferred: %s", request.key, reason)
+                self.last_block_reason = reason
+                return None
+
+        del self.pending[request.key]
+        self.last_launch_at = now
+        self.last_block_reason = None
+        logger.info("Launching %s%s", request.key, " (urgent)" if urgent else "")
+        request.launch()
+        return request.key
@@ -0,0 +1,112 @@
+# ============================================================
+# File: log_manager.py
+# ============================================================
+import logging
+import logging.handlers
+import queue
+import sys
+
+# All application loggers live under this name so one handler covers them
+ROOT_LOGGER_NAME = "wwlauncher"
+
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+DEFAULT_LOG_LEVEL = "INFO"
+DEFAULT_LOG_FILE = "ww_launcher.log"
+
+LOG_FORMAT = "[%(asctime)s.%(msecs)03d] %(levelname)-7s %(name)s: %(message)s"
+CONSOLE_DATE_FORMAT = "%H:%M:%S"
+FILE_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_listener = None
+_queue_handler = None
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue handler that hands the raw record to the listener thread.
+    The stock QueueHandler formats the message on the calling thread;
+    we leave that to the background listener so the tick loop only pays
+    for a queue put when the level is enabled.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def parse_level(level):
+    """Convert a level name (or number) to a logging level, defaulting to INFO"""
+    if isinstance(level, int):
+        return level
+    if isinstance(level, str) and level.upper() in LOG_LEVELS:
+        return getattr(logging, level.upper())
+    return getattr(logging, DEFAULT_LOG_LEVEL)
+
+
+def get_logger(name):
+    """Return a logger under the application root logger"""
+    if name.startswith(ROOT_LOGGER_NAME):
+        return logging.getLogger(name)
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}")
+
+
+def setup_logging(level=DEFAULT_LOG_LEVEL, log_file=DEFAULT_LOG_FILE,
+                  max_bytes=1024 * 1024, backup_count=3):
+    """
+    Configure logging: callers write into a queue, a background listener
+    drains it into the console and a rotating log file.
+    Safe to call again - the previous listener is stopped first.
+    """
+    global _listener, _queue_handler
+
+    shutdown_logging()
+
+    handlers = []
+
+    # Windowed (frozen) builds have no console attached
+    if sys.stdout is not None:
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT, CONSOLE_DATE_FORMAT))
+        handlers.append(console_handler)
+
+    if log_file:
+        try:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT, FILE_DATE_FORMAT))
+            handlers.append(file_handler)
+        except OSError as e:
+            print(f"⚠ Could not open log file {log_file}: {e}")
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = _DeferredQueueHandler(log_queue)
+
+    root_logger = logging.getLogger(ROOT_LOGGER_NAME)
+    root_logger.handlers = [_queue_handler]
+    root_logger.propagate = False
+    root_logger.setLevel(parse_level(level))
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    return root_logger
+
+
+def set_log_level(level):
+    """Change the application log level at runtime"""
+    logging.getLogger(ROOT_LOGGER_NAME).setLevel(parse_level(level))
+
+
+def shutdown_logging():
+    """Flush queued records and stop the background listener"""
+    global _listener, _queue_handler
+
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+    if _queue_handler is not None:
+        logging.getLogger(ROOT_LOGGER_NAME).removeHandler(_queue_handler)
+        _queue_handler = None
@@ -0,0 +1,103 @@
+# ============================================================
+# File: login_model.py
+# ============================================================
+"""
+Learned time-to-login schedule.
+
+Each successful login records how long the game took from start to a
+ready login screen. Once a few launches are known, the first OCR check is
+scheduled just before a low percentile of those times instead of at
+login_wait_min_seconds, and the interval between checks stays at
+screenshot_check_interval close to the typical ready time and backs off
+exponentially away from it.
+"""
+import math
+from collections import deque
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = (len(sorted_values) - 1) * percent / 100.0
+    low = math.floor(index)
+    high = math.ceil(index)
+    if low == high:
+        return sorted_values[low]
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (index - low)
+
+
+class LoginTimeModel:
+    """Rolling window of observed time-to-ready values for one profile"""
+
+    def __init__(self, min_wait=15, base_interval=2, window=20, min_samples=3,
+                 first_check_percentile=10, lead_seconds=3, max_interval=10, enabled=True):
+        # Disabled (or untrained) the schedule is the fixed min_wait / base_interval one
+        self.enabled = enabled
+        self.min_wait = min_wait
+        self.base_interval = base_interval
+        self.min_samples = min_samples
+        self.first_check_percentile = first_check_percentile
+        self.lead_seconds = lead_seconds
+        self.max_interval = max(max_interval, base_interval)
+        self.samples = deque(maxlen=window)
+        self._sorted = []
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            min_wait=config.get("login_wait_min_seconds") or 15,
+            base_interval=config.get("screenshot_check_interval") or 2,
+            window=config.get("login_model_window") or 20,
+            first_check_percentile=config.get("login_model_percentile", 10),
+            lead_seconds=config.get("login_model_lead_seconds", 3),
+            max_interval=config.get("login_check_max_interval") or 10,
+            enabled=config.get("login_model_enabled", True),
+        )
+
+    def seed(self, values):
+        """Load past time-to-ready values (oldest first), e.g. from the run history"""
+        for value in values:
+            self.observe(value, quiet=True)
+        if self.trained:
+            logger.info("Login model seeded with %d launch(es), expected ready ~%.0fs",
+                        len(self.samples), self.expected_ready())
+
+    def observe(self, seconds, quiet=False):
+        if not self.enabled or seconds is None or seconds <= 0:
+            return
+        self.samples.append(float(seconds))
+        self._sorted = sorted(self.samples)
+        if not quiet:
+            logger.debug("Login ready after %.1fs (%d sample(s))", seconds, len(self.samples))
+
+    @property
+    def trained(self):
+        return len(self.samples) >= self.min_samples
+
+    def expected_ready(self):
+        """Median time-to-ready, or None until trained"""
+        return _percentile(self._sorted, 50) if self.trained else None
+
+    def spread(self):
+        """Interquartile range, floored so a very consistent machine still gets some slack"""
+        if not self.trained:
+            return None
+        return max(_percentile(self._sorted, 75) - _percentile(self._sorted, 25), 2 * self.base_interval)
+
+    def first_check_seconds(self):
+        """Seconds after start at which the first OCR check should run"""
+        if not self.trained:
+            return self.min_wait
+        early = _percentile(self._sorted, self.first_check_percentile) - self.lead_seconds
+        return max(1.0, early)
+
+    def check_interval(self, since_start):
+        """Base interval near the expected ready time, doubling per spread away from it"""
+        if not self.trained:
+            return self.base_interval
+        distance = abs(since_start - self.expected_ready()) / self.spread()
+        return min(self.max_interval, self.base_interval * (2 ** max(0.0, distance - 1.0)))
@@ -0,0 +1,136 @@
+# ============================================================
+# File: login_pipeline.py
+# ============================================================
+"""
+Staged login-screen detection:
+
+    find window -> window state -> capture -> debug save -> decode -> login status -> tap to land
+    -> click position
+
+The screenshot is decoded to a numpy array once; the OCR stages work on
+views of that array. Each stage runs only when the previous one passed,
+and is timed both in the metrics registry ("stage.<name>") and on the
+returned FrameContext. With a window-state probe, a check whose window is
+minimized, cloaked, covered or off-screen is skipped ("window_unavailable",
+reason in FrameContext.skip_reason) or captured with the background backend.
+The caller hands the context to release() once it is done with the frame.
+"""
+import time
+
+from log_manager import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+
+class FrameContext:
+    """State handed from stage to stage for one check"""
+
+    __slots__ = ("pid", "window_info", "capture_backend", "skip_reason", "screenshot", "frame",
+                 "login_text", "tap_text", "click_position", "timings")
+
+    def __init__(self, pid=None):
+        self.pid = pid
+        self.window_info = None
+        self.capture_backend = None
+        self.skip_reason = None
+        self.screenshot = None
+        self.frame = None
+        self.login_text = ""
+        self.tap_text = ""
+        self.click_position = None
+        self.timings = {}
+
+
+class LoginPipeline:
+    """
+    Runs the detection stages for one login check. A stage returns None to
+    continue or a result code ("not_found", "waiting_login_status", ...) to
+    stop; run() returns (result, context) where result is None when every
+    stage passed and the click position is known.
+    """
+
+    def __init__(self, screen_detector, save_debug_screenshot=True, window_probe=None):
+        self.screen_detector = screen_detector
+        # WindowStateProbe, or None to capture whatever the window's state
+        self.window_probe = window_probe
+        self.stages = [
+            ("find_window", self._find_window),
+            ("window_state", self._window_state),
+            ("capture", self._capture),
+            ("decode", self._decode),
+            ("login_status", self._login_status),
+            ("tap_to_land", self._tap_to_land),
+            ("click_position", self._click_position),
+        ]
+        if save_debug_screenshot:
+            self.stages.insert(3, ("debug_save", self._debug_save))
+
+    def run(self, pid=None):
+        context = FrameContext(pid)
+        for name, stage in self.stages:
+            start = time.perf_counter()
+            with metrics.span(f"stage.{name}"):
+                result = stage(context)
+            context.timings[name] = time.perf_counter() - start
+            if result is not None:
+                logger.debug("Login pipeline stopped at %s: %s", name, result)
+                return result, context
+        return None, context
+
+    def release(self, context, keep_thumbnail=True):
+        """Free the check's full-resolution frame (the detector may keep a thumbnail)"""
+        screenshot = context.screenshot
+        context.screenshot = context.frame = None
+        self.screen_detector.release_frame(screenshot, keep_thumbnail)
+
+    def _find_window(self, context):
+        context.window_info = self.screen_detector.find_game_window(
+            context.pid, include_minimized=self.window_probe is not None)
+        if not context.window_info:
+            logger.debug("✗ Game window not found")
+            return "not_found"
+        return None
+
+    def _window_state(self, context):
+        if self.window_probe is None:
+            return None
+        detector = self.screen_detector
+        context.capture_backend, context.skip_reason = self.window_probe.check(
+            context.window_info["hwnd"], detector.capture_backend, detector.background_capture_available)
+        return "window_unavailable" if context.capture_backend is None else None
+
+    def _capture(self, context):
+        context.screenshot = self.screen_detector.capture_window(
+            context.window_info, backend=context.capture_backend, screen_fallback=context.skip_reason is None)
+        if not context.screenshot:
+            if context.skip_reason is not None:
+                # Background capture failed on a covered/off-screen window: skip, don't grab the desktop
+                return "window_unavailable"
+            logger.warning("✗ Failed to capture screenshot")
+            return "error"
+        return None
+
+    def _debug_save(self, context):
+        self.screen_detector.save_debug_screenshot(context.screenshot)
+        return None
+
+    def _decode(self, context):
+        context.frame = self.screen_detector.decode_frame(context.screenshot)
+        return None if context.frame is not None else "error"
+
+    def _login_status(self, context):
+        ready, context.login_text = self.screen_detector.detect_login_ready(context.frame)
+        return None if ready else "waiting_login_status"
+
+    def _tap_to_land(self, context):
+        ready, context.tap_text = self.screen_detector.detect_tap_to_land_text(context.frame)
+        return None if ready else "waiting_tap_text"
+
+    def _click_position(self, context):
+        click_x, click_y = self.screen_detector.get_click_position(context.frame)
+        if click_x is None or click_y is None:
+            logger.error("✗ Could not calculate click position")
+            return "error"
+        context.click_position = (click_x, click_y)
+        return None
@@ -0,0 +1,220 @@
+# ============================================================
+# File: login_poller.py
+# ============================================================
+"""
+Adaptive schedule for the login-detection checks of one launch.
+
+On top of the LoginTimeModel interval:
+- once "Login Status: 0" is seen but "Tap to land" is not, checks run in a
+  short fast burst (login_burst_interval_ms) so the click follows quickly;
+- while consecutive frames are unchanged (a static loading screen) the
+  interval backs off, up to login_check_max_interval;
+- login_wait_max_seconds is no longer a hard stop: after it checks continue
+  at the slowest interval until login_check_budget checks have been spent
+  or login_wait_hard_limit_seconds has passed;
+- a check skipped because the window can't be captured (minimized,
+  covered, ...) waits one interval but doesn't use up the budget.
+
+Once the login screen is ready the poller also runs the click: it waits
+click_delay_seconds, then after each click re-checks at growing
+intervals whether the "Tap to land" area changed, and clicks again (up
+to click_retry_count times) if it didn't. Every step is a short call from
+the timer, so nothing sleeps on the GUI thread.
+"""
+import time
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+
+def frame_difference(a, b):
+    """Mean absolute difference (0-255) of two equal-size frame signatures"""
+    if not a or not b or len(a) != len(b):
+        return None
+    return sum(abs(x - y) for x, y in zip(a, b)) / len(a)
+
+
+# Phases of one launch's login sequence
+PHASE_DETECT = "detect"   # looking for the login screen
+PHASE_CLICK = "click"     # login screen found, click when due
+PHASE_VERIFY = "verify"   # click sent, re-checking that it took
+
+# Results of the click and re-check steps (detection results feed the schedule)
+CLICK_STEP_RESULTS = ("click_sent", "verifying", "clicked", "click_unconfirmed")
+
+
+class LoginPoller:
+    """Decides when the next login check, click or click re-check is due for the current launch"""
+
+    def __init__(self, model, burst_interval=0.2, burst_seconds=5, static_backoff=1.5,
+                 static_threshold=2.0, soft_limit_seconds=90, attempt_budget=120, hard_limit_seconds=300,
+                 click_delay=5.0, verify_enabled=True, verify_timeout=5.0, click_retries=2):
+        self.model = model
+        self.burst_interval = burst_interval
+        self.burst_seconds = burst_seconds
+        self.static_backoff = static_backoff
+        self.static_threshold = static_threshold
+        self.soft_limit_seconds = soft_limit_seconds
+        self.attempt_budget = attempt_budget
+        self.hard_limit_seconds = max(hard_limit_seconds, soft_limit_seconds)
+        self.click_delay = click_delay
+        self.verify_enabled = verify_enabled
+        self.verify_timeout = verify_timeout
+        self.click_retries = max(0, click_retries)
+        self.launch_key = None
+        self._reset()
+
+    @classmethod
+    def from_config(cls, config, model):
+        return cls(
+            model,
+            burst_interval=(config.get("login_burst_interval_ms") or 200) / 1000.0,
+            burst_seconds=config.get("login_burst_seconds", 5),
+            soft_limit_seconds=config.get("login_wait_max_seconds") or 90,
+            attempt_budget=config.get("login_check_budget") or 120,
+            hard_limit_seconds=config.get("login_wait_hard_limit_seconds") or 300,
+            verify_enabled=config.get("click_verify_enabled", True),
+            verify_timeout=config.get("click_verify_timeout_seconds", 5),
+            click_retries=config.get("click_retry_count", 2),
+        )
+
+    def _reset(self):
+        self.attempts = 0
+        self.last_check_at = None
+        self.burst_until = 0.0
+        self.static_count = 0
+        self.last_signature = None
+        self.gave_up = False
+        self.ready_seconds = None
+        self.reset_click()
+
+    def reset_click(self):
+        """Back to looking for the login screen"""
+        self.phase = PHASE_DETECT
+        self.phase_due = 0.0
+        self.click_target = None
+        self.click_attempt = 0
+        self.verify_started = None
+        self.verify_deadline = None
+        self.verify_delay = 0.25
+
+    def start(self, launch_key):
+        """Begin a new schedule whenever the launch (e.g. its start time) changes"""
+        if launch_key != self.launch_key:
+            self.launch_key = launch_key
+            self._reset()
+
+    @property
+    def bursting(self):
+        return time.monotonic() < self.burst_until
+
+    def exhausted(self, since_start):
+        if self.attempts >= self.attempt_budget or since_start > self.hard_limit_seconds:
+            if not self.gave_up:
+                logger.warning("⚠ Login not detected after %d check(s) / %.0fs - giving up",
+                               self.attempts, since_start)
+                self.gave_up = True
+            return True
+        return False
+
+    def interval(self, since_start):
+        if self.bursting:
+            return self.burst_interval
+        if since_start > self.soft_limit_seconds:
+            return self.model.max_interval
+        base = self.model.check_interval(since_start)
+        return min(self.model.max_interval, base * (self.static_backoff ** self.static_count))
+
+    def next_delay(self, since_start):
+        """Seconds until the next check is due (0 = now), or None once the budget is spent"""
+        if self.phase != PHASE_DETECT:
+            return max(0.0, self.phase_due - time.monotonic())
+        if self.exhausted(since_start):
+            return None
+        if self.last_check_at is None:
+            return max(0.0, self.model.first_check_seconds() - since_start)
+        elapsed = time.monotonic() - self.last_check_at
+        return max(0.0, self.interval(since_start) - elapsed)
+
+    @property
+    def clicking(self):
+        """True between finding the login screen and the click being confirmed or given up"""
+        return self.phase != PHASE_DETECT
+
+    def due(self, since_start):
+        delay = self.next_delay(since_start)
+        return delay is not None and delay <= 0.0
+
+    def record(self, result, signature=None):
+        """Feed back one check result and the captured frame's signature"""
+        if result in CLICK_STEP_RESULTS:
+            # Click and re-check steps run on their own schedule, not the detection budget
+            return
+        self.last_check_at = time.monotonic()
+        if result == "window_unavailable":
+            # Deferred, not attempted: no budget spent, no frame to compare
+            return
+        self.attempts += 1
+
+        if result == "waiting_tap_text":
+            # First indicator is up: the screen is about to become clickable
+            if not self.bursting:
+                logger.debug("Login status seen - fast checks for %ss", self.burst_seconds)
+            self.burst_until = self.last_check_at + self.burst_seconds
+            self.static_count = 0
+        else:
+            difference = frame_difference(signature, self.last_signature)
+            if difference is not None and difference < self.static_threshold:
+                self.static_count += 1
+            else:
+                self.static_count = 0
+
+        self.last_signature = signature
+
+    def arm_click(self, target, since_start):
+        """
+        Login screen ready: click `target` (window, position, pre-click reference)
+        after click_delay. since_start is kept as the launch's time to login,
+        which excludes the click delay and verification.
+        """
+        self.reset_click()
+        self.ready_seconds = since_start
+        self.phase = PHASE_CLICK
+        self.phase_due = time.monotonic() + self.click_delay
+        self.click_target = target
+
+    def click_sent(self):
+        """A click went out; True if it should be verified (re-checks start shortly)"""
+        self.click_attempt += 1
+        reference_signature, _ = self.click_target[2]
+        if not self.verify_enabled or reference_signature is None:
+            return False
+        now = time.monotonic()
+        self.phase = PHASE_VERIFY
+        self.verify_started = now
+        self.verify_deadline = now + self.verify_timeout
+        self.verify_delay = 0.25
+        self.phase_due = now + self.verify_delay
+        return True
+
+    def verify_elapsed(self):
+        return time.monotonic() - self.verify_started
+
+    def verify_pending(self):
+        """After a re-check that didn't confirm: schedule the next one, False once the timeout has passed"""
+        now = time.monotonic()
+        if now >= self.verify_deadline:
+            return False
+        self.verify_delay *= 2
+        self.phase_due = min(now + self.verify_delay, self.verify_deadline)
+        return True
+
+    def retry_click(self):
+        """After an unconfirmed click: True if another click is allowed (due now), else back to detection"""
+        if self.click_attempt <= self.click_retries:
+            self.phase = PHASE_CLICK
+            self.phase_due = time.monotonic()
+            return True
+        self.reset_click()
+        return False
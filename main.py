@@ -1,6 +1,8 @@
 import sys
 import os
-import psutil
+import json
+import time
+import argparse
 from datetime import datetime, timedelta
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                                QHBoxLayout, QLabel, QPushButton, QLineEdit,
@@ -10,19 +12,85 @@ from PySide6.QtCore import QTimer, QTime, Qt
 from PySide6.QtGui import QFont, QIcon, QPixmap, QAction
 
 # Import our modules
-from config import Config, Tracking, debug_print, DEBUG
+from config import Config, Tracking, get_reset_start, get_next_reset
+from config_watcher import ConfigWatcher
 from game_controller import GameController
+from fleet import FleetClient
+from history import HistoryStore, recent_login_ready_times, recent_patch_stats
+from launch_planner import LaunchPlanner, PatchTracker, login_estimate_seconds
+from prewarm import Prewarmer
+from resource_sampler import ResourceSampler
+from window_state import REASON_TEXT
+from login_model import LoginTimeModel
+from login_poller import LoginPoller
+from status_view import StatusViewModel, build_status_view
+from status_api import StatusSnapshot, StatusServer, DEFAULT_STATUS_PORT
+from single_instance import InstanceLock, CommandServer, send_command
+from launch_scheduler import LaunchScheduler
+from profiles import load_profiles, track_playtime, ProfileRunner, DEFAULT_PROFILE_NAME
+from log_manager import get_logger, setup_logging, shutdown_logging, set_log_level, DEFAULT_LOG_FILE
+from metrics import metrics
+
+logger = get_logger(__name__)
 
 
 class WutheringWavesLauncher(QMainWindow):
-    def __init__(self):
+    BASE_HEIGHT = 610
+    DIAGNOSTICS_HEIGHT = 220
+
+    def __init__(self, config=None):
         super().__init__()
-        debug_print("=== Initializing Wuthering Waves Launcher ===")
+        logger.info("=== Initializing Wuthering Waves Launcher ===")
 
         # Initialize config and tracking
-        self.config = Config()
-        self.tracking = Tracking()
-        self.game_controller = GameController(self.config.data)
+        self.config = config if config is not None else Config()
+
+        # Finished periods go to the SQLite history (written on a background thread)
+        self.history = None
+        if self.config.get("history_enabled", True):
+            self.history = HistoryStore(self.config.get("history_db") or "ww_launcher_history.db").start()
+
+        self.tracking = Tracking(on_period_end=self.record_history(DEFAULT_PROFILE_NAME))
+        self.login_model = self.create_login_model(DEFAULT_PROFILE_NAME)
+        self.login_poller = LoginPoller.from_config(self.config, self.login_model)
+        self.launch_planner = self.create_launch_planner(DEFAULT_PROFILE_NAME)
+        self.patch_tracker = PatchTracker(self.tracking)
+        # Page-cache prewarm of the game files ahead of auto-launch (one run per reset period)
+        self.prewarmer = None
+        self.prewarm_period = None
+        self.resource_sampler = ResourceSampler.from_config(self.config)
+        # Reads the live config snapshot, so reloaded settings apply without a restart
+        self.game_controller = GameController(self.config)
+
+        # Extra account profiles share one launch scheduler with the default profile
+        self.launch_scheduler = LaunchScheduler.from_config(self.config)
+        self.profile_runners = [ProfileRunner(profile, self.config, self.launch_scheduler,
+                                              on_period_end=self.record_history(profile.name),
+                                              login_model=self.create_login_model(profile.name),
+                                              launch_planner=self.create_launch_planner(profile.name))
+                                for profile in load_profiles(self.config)]
+        self.game_controller.match_install_dir = bool(self.profile_runners)
+        if self.profile_runners:
+            logger.info("Loaded %d extra profile(s): %s", len(self.profile_runners),
+                        ", ".join(runner.key for runner in self.profile_runners))
+
+        # Optional fleet coordinator client (status reports + remote commands)
+        self.fleet_client = None
+        if self.config.get("fleet_enabled", False):
+            self.fleet_client = FleetClient.from_config(self.config).start()
+
+        # Local status endpoint: serves a snapshot published once per tick
+        self.game_running = False
+        self.last_patcher_status = None
+        self.status_view = StatusViewModel()
+        self.status_snapshot = StatusSnapshot()
+        self.status_server = None
+        if self.config.get("status_api_enabled", False):
+            try:
+                port = self.config.get("status_api_port", DEFAULT_STATUS_PORT)
+                self.status_server = StatusServer(self.status_snapshot, port).start()
+            except OSError as e:
+                logger.error("✗ Could not start status API: %s", e)
 
         # Check and reset period if needed
         self.check_and_reset_period()
@@ -34,6 +102,13 @@ class WutheringWavesLauncher(QMainWindow):
         self.log_tesseract_status()
 
         self.create_tray_icon()
+
+        # Edits to the config file are validated and applied between ticks
+        self.config.listeners.append(self.on_config_changed)
+        self.config_watcher = None
+        if self.config.get("config_watch_enabled", True):
+            self.config_watcher = ConfigWatcher(self.config).start()
+
         self.start_timer()
 
     def log_tesseract_status(self):
@@ -63,7 +138,7 @@ class WutheringWavesLauncher(QMainWindow):
         current_period = self.get_current_reset_period_id()
 
         if self.tracking["current_reset_period"] != current_period:
-            debug_print(f"New reset period: {current_period}")
+            logger.info("New reset period: %s", current_period)
             self.tracking.reset(current_period)
 
     def get_current_reset_period_id(self):
@@ -73,79 +148,21 @@ class WutheringWavesLauncher(QMainWindow):
 
     def get_current_reset_start(self):
         """Get the start time of current reset period"""
-        now = datetime.now()
-        reset_hour, reset_minute = map(int, self.config["reset_time"].split(':'))
-        today_reset = now.replace(hour=reset_hour, minute=reset_minute, second=0, microsecond=0)
-
-        if now >= today_reset:
-            return today_reset
-        else:
-            return today_reset - timedelta(days=1)
+        return get_reset_start(self.config["reset_time"])
 
     def get_next_reset_time(self):
         """Get the next reset time"""
-        now = datetime.now()
-        reset_hour, reset_minute = map(int, self.config["reset_time"].split(':'))
-        next_reset = now.replace(hour=reset_hour, minute=reset_minute, second=0, microsecond=0)
-
-        if now >= next_reset:
-            next_reset += timedelta(days=1)
-
-        return next_reset
+        return get_next_reset(self.config["reset_time"])
 
     def update_playtime(self):
         """Update playtime if game is running"""
-        if self.game_controller.is_game_running():
-            if not self.tracking["game_started"]:
-                debug_print("Game process detected - marking as started")
-                self.tracking["game_started"] = True
-                self.tracking["start_time"] = datetime.now().isoformat()
-                if not self.tracking["start_method"]:
-                    self.tracking["start_method"] = "external"
-
-                self.tracking["game_closed_early"] = False
-                self.tracking["early_close_time"] = None
-                self.tracking.force_save()
-
-            if self.tracking["start_time"]:
-                start_dt = datetime.fromisoformat(self.tracking["start_time"])
-                elapsed = (datetime.now() - start_dt).total_seconds()
-                self.tracking["total_playtime_seconds"] = int(elapsed)
-
-                required_seconds = self.config["required_playtime_minutes"] * 60
-                if self.tracking["total_playtime_seconds"] >= required_seconds:
-                    if not self.tracking["requirement_met"]:
-                        debug_print("✓ Daily requirement MET!")
-                        self.tracking["requirement_met"] = True
-                        self.tracking.force_save()
-
-                self.tracking["last_process_check"] = datetime.now().isoformat()
-                self.tracking.save()
-        else:
-            if self.tracking["game_started"] and self.tracking["start_time"]:
-                debug_print("Game process stopped")
-
-                start_dt = datetime.fromisoformat(self.tracking["start_time"])
-                final_playtime = int((datetime.now() - start_dt).total_seconds())
-                self.tracking["total_playtime_seconds"] = final_playtime
-                debug_print(f"Final playtime recorded: {final_playtime}s ({final_playtime // 60}m)")
-
-                self.tracking["start_time"] = None
-
-                required_seconds = self.config["required_playtime_minutes"] * 60
-                if not self.tracking["requirement_met"] and self.tracking["total_playtime_seconds"] < required_seconds:
-                    if not self.tracking["game_closed_early"]:
-                        debug_print("⚠ Game closed early without meeting requirement")
-                        self.tracking["game_closed_early"] = True
-                        self.tracking["early_close_time"] = datetime.now().isoformat()
-
-                self.tracking["last_process_check"] = datetime.now().isoformat()
-                self.tracking.force_save()
+        self.game_running = self.game_controller.is_game_running()
+        track_playtime(self.tracking, self.game_running, (self.config["required_playtime_minutes"] or 30) * 60)
 
     def init_ui(self):
         """Initialize the user interface"""
         self.setWindowTitle("Wuthering Waves Daily Launcher v2.0")
-        self.setFixedSize(650, 580)  # Fixed size - not resizable
+        self.setFixedSize(650, self.BASE_HEIGHT)  # Fixed size - not resizable
         self.setWindowIcon(self.create_app_icon())
 
         central_widget = QWidget()
@@ -182,6 +199,12 @@ class WutheringWavesLauncher(QMainWindow):
         self.game_status_label.setAlignment(Qt.AlignCenter)
         status_layout.addWidget(self.game_status_label)
 
+        # One line summarising extra account profiles (hidden when there are none)
+        self.profiles_label = QLabel()
+        self.profiles_label.setAlignment(Qt.AlignCenter)
+        self.profiles_label.setVisible(bool(self.profile_runners))
+        status_layout.addWidget(self.profiles_label)
+
         status_group.setLayout(status_layout)
         layout.addWidget(status_group)
 
@@ -285,6 +308,30 @@ class WutheringWavesLauncher(QMainWindow):
         controls_group.setLayout(controls_layout)
         layout.addWidget(controls_group)
 
+        # Diagnostics (collapsed by default)
+        self.diagnostics_group = QGroupBox("Diagnostics")
+        self.diagnostics_group.setCheckable(True)
+        self.diagnostics_group.setChecked(False)
+        diagnostics_layout = QVBoxLayout()
+
+        self.diagnostics_label = QLabel()
+        self.diagnostics_label.setStyleSheet("font-family: monospace; font-size: 9px;")
+        self.diagnostics_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        diagnostics_layout.addWidget(self.diagnostics_label)
+
+        dump_metrics_btn = QPushButton("Dump Metrics (JSON)")
+        dump_metrics_btn.clicked.connect(self.dump_metrics)
+        diagnostics_layout.addWidget(dump_metrics_btn)
+
+        self.diagnostics_content = QWidget()
+        self.diagnostics_content.setLayout(diagnostics_layout)
+        self.diagnostics_content.setVisible(False)
+        diagnostics_group_layout = QVBoxLayout()
+        diagnostics_group_layout.addWidget(self.diagnostics_content)
+        self.diagnostics_group.setLayout(diagnostics_group_layout)
+        self.diagnostics_group.toggled.connect(self.on_diagnostics_toggled)
+        layout.addWidget(self.diagnostics_group)
+
         # Status Message (replaces debug console)
         self.status_message_label = QLabel()
         self.status_message_label.setStyleSheet(
@@ -309,7 +356,7 @@ class WutheringWavesLauncher(QMainWindow):
             shortcut_path = os.path.join(startup_folder, 'WutheringWavesLauncher.lnk')
             return os.path.exists(shortcut_path)
         except Exception as e:
-            debug_print(f"Error checking startup: {e}")
+            logger.warning("Error checking startup: %s", e)
             return False
 
     def on_startup_changed(self, state):
@@ -362,6 +409,48 @@ class WutheringWavesLauncher(QMainWindow):
 
         self.update_status_display()
 
+    def on_diagnostics_toggled(self, expanded):
+        """Expand/collapse the diagnostics panel"""
+        self.diagnostics_content.setVisible(expanded)
+        extra = self.DIAGNOSTICS_HEIGHT if expanded else 0
+        self.setFixedSize(650, self.BASE_HEIGHT + extra)
+        self.update_diagnostics_display()
+
+    def update_diagnostics_display(self):
+        """Refresh diagnostics panel and tray summary from the metrics registry"""
+        if hasattr(self, 'diagnostics_group') and self.diagnostics_group.isChecked() and self.isVisible():
+            text = metrics.format_table()
+            resources = self.resource_sampler.status_text()
+            if resources:
+                text += "\n" + resources
+            if self.prewarmer is not None:
+                text += "\n" + self.prewarmer.status_text()
+            text += "\n" + self.game_controller.screen_detector.memory_status_text()
+            window_probe = self.game_controller.login_pipeline.window_probe
+            skipped = window_probe.status_text() if window_probe is not None else None
+            if skipped:
+                text += "\n" + skipped
+            self.diagnostics_label.setText(text)
+
+        if hasattr(self, 'tray_tick_action') and self.tray_menu.isVisible():
+            tick = metrics.summary("tick")
+            if tick and tick["p50_ms"] is not None:
+                self.tray_tick_action.setText(
+                    f"Tick: p50 {tick['p50_ms']:.0f}ms / p95 {tick['p95_ms']:.0f}ms / max {tick['max_ms']:.0f}ms"
+                )
+
+    def dump_metrics(self):
+        """Write the current metrics snapshot to JSON"""
+        try:
+            path = os.path.abspath(metrics.dump_json())
+            logger.info("Metrics dumped to %s", path)
+            self.update_status_message(f"✓ Metrics saved: {path}")
+            if hasattr(self, 'tray_icon') and not self.isVisible():
+                self.tray_icon.showMessage("Metrics Saved", path, QSystemTrayIcon.Information, 2000)
+        except Exception as e:
+            logger.error("✗ Error dumping metrics: %s", e)
+            self.update_status_message(f"✗ Error dumping metrics: {e}")
+
     def create_app_icon(self):
         """Create app icon from icon.ico file or fallback to generated icon"""
         # Try to load icon.ico from file
@@ -371,7 +460,7 @@ class WutheringWavesLauncher(QMainWindow):
                 if not icon.isNull():
                     return icon
             except Exception as e:
-                debug_print(f"Could not load icon.ico: {e}")
+                logger.warning("Could not load icon.ico: %s", e)
 
         # Fallback: Create a simple app icon
         pixmap = QPixmap(64, 64)
@@ -428,12 +517,24 @@ class WutheringWavesLauncher(QMainWindow):
         self.tray_playtime_action.setEnabled(False)
         tray_menu.addAction(self.tray_playtime_action)
 
+        diagnostics_menu = tray_menu.addMenu("Diagnostics")
+
+        self.tray_tick_action = QAction("Tick: no samples yet", self)
+        self.tray_tick_action.setEnabled(False)
+        diagnostics_menu.addAction(self.tray_tick_action)
+
+        dump_metrics_action = QAction("Dump Metrics (JSON)", self)
+        dump_metrics_action.triggered.connect(self.dump_metrics)
+        diagnostics_menu.addAction(dump_metrics_action)
+
         tray_menu.addSeparator()
 
         exit_action = QAction("Exit Application", self)
         exit_action.triggered.connect(self.exit_application)
         tray_menu.addAction(exit_action)
 
+        self.tray_menu = tray_menu
+        self.tray_menu.aboutToShow.connect(self.on_tray_menu_about_to_show)
         self.tray_icon.setContextMenu(tray_menu)
         self.tray_icon.activated.connect(self.tray_icon_activated)
         self.tray_icon.show()
@@ -495,10 +596,7 @@ class WutheringWavesLauncher(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            # Save any pending changes
-            if self.tracking.pending_save:
-                self.tracking.force_save()
-            self.tray_icon.hide()
+            self.shutdown()
             event.accept()
             QApplication.quit()
         else:
@@ -514,43 +612,193 @@ class WutheringWavesLauncher(QMainWindow):
         )
 
         if reply == QMessageBox.Yes:
-            debug_print("=== Application exiting ===")
-            if self.tracking.pending_save:
-                self.tracking.force_save()
-            self.tray_icon.hide()
+            logger.info("=== Application exiting ===")
+            self.shutdown()
             QApplication.quit()
 
+    def record_history(self, profile_name):
+        """Tracking.on_period_end callback that records the period for one profile"""
+        if self.history is None:
+            return None
+        return lambda data: self.history.record_period(profile_name, data)
+
+    def create_login_model(self, profile_name):
+        """Time-to-login model for one profile, seeded from its run history"""
+        model = LoginTimeModel.from_config(self.config)
+        if model.enabled and self.history is not None:
+            try:
+                model.seed(recent_login_ready_times(self.history.db_path, profile_name, model.samples.maxlen))
+            except Exception as e:
+                logger.warning("⚠ Could not read login times from history: %s", e)
+        return model
+
+    def create_launch_planner(self, profile_name):
+        """Early-launch planner for one profile, seeded with its recent patch history"""
+        planner = LaunchPlanner.from_config(self.config)
+        if planner.enabled and self.history is not None:
+            try:
+                planner.seed(recent_patch_stats(self.history.db_path, profile_name))
+            except Exception as e:
+                logger.warning("⚠ Could not read patch history: %s", e)
+        return planner
+
+    def planned_launch_time(self, now, next_reset):
+        """Configured auto-launch time, moved earlier if it would not leave enough time before reset"""
+        hour, minute = map(int, self.config["auto_launch_time"].split(':'))
+        configured = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        required_seconds = (self.config["required_playtime_minutes"] or 30) * 60
+        remaining = max(0, required_seconds - self.tracking["total_playtime_seconds"])
+        login_seconds = login_estimate_seconds(self.login_model, self.config["login_wait_max_seconds"])
+        return self.launch_planner.plan(configured, next_reset, remaining, login_seconds)
+
+    def sample_resources(self):
+        """Sample the running game's CPU/memory/IO; the period summary goes into tracking"""
+        proc = self.game_controller.game_process if self.game_running else None
+        summary = self.resource_sampler.tick(proc, self.tracking["current_reset_period"])
+        if summary:
+            self.tracking["resource_summary"] = summary
+
+    # Settings read once at startup; a reload logs that they need a restart
+    RESTART_KEYS = ("profiles", "capture_backend", "log_file", "history_enabled", "history_db",
+                    "fleet_enabled", "fleet_coordinator_url", "fleet_node_id", "fleet_flush_seconds", "fleet_token",
+                    "status_api_enabled", "status_api_port", "config_watch_enabled",
+                    "resource_sampler_enabled", "resource_sample_seconds", "resource_history_samples",
+                    "resource_downsample_factor", "screenshot_thumbnail_width", "frame_memory_budget_mb",
+                    "frame_buffer_pool_enabled")
+
+    def on_config_changed(self, changed):
+        """Rebuild the helpers whose settings changed (Config listener, GUI thread)"""
+        if "log_level" in changed:
+            set_log_level(self.config["log_level"])
+
+        self.refresh_settings_inputs(changed)
+
+        login_changed = "screenshot_check_interval" in changed or any(
+            key.startswith(("login_", "click_")) for key in changed)
+        planner_changed = bool(changed & {"early_launch_enabled", "launch_safety_margin_minutes",
+                                          "patch_probability_threshold", "default_patch_minutes"})
+
+        if login_changed:
+            self.login_model = self.create_login_model(DEFAULT_PROFILE_NAME)
+            self.login_poller = LoginPoller.from_config(self.config, self.login_model)
+        if planner_changed:
+            self.launch_planner = self.create_launch_planner(DEFAULT_PROFILE_NAME)
+        self.game_controller.apply_config_changes(changed)
+
+        # Extra profiles read through to the new snapshot for everything they don't set themselves
+        for runner in self.profile_runners:
+            runner.profile.rebase(self.config)
+            if login_changed:
+                runner.login_model = self.create_login_model(runner.key)
+                runner.login_poller = LoginPoller.from_config(runner.profile, runner.login_model)
+            if planner_changed:
+                runner.launch_planner = self.create_launch_planner(runner.key)
+            runner.game_controller.apply_config_changes(changed)
+
+        scheduler = self.launch_scheduler
+        scheduler.max_concurrent = max(1, self.config.get("max_concurrent_instances", 2))
+        scheduler.stagger_seconds = self.config.get("launch_stagger_seconds", 60)
+        scheduler.min_free_ram_mb = self.config.get("min_free_ram_mb", 4096)
+        scheduler.max_cpu_percent = self.config.get("max_cpu_percent", 80)
+        scheduler.max_gpu_percent = self.config.get("max_gpu_percent", 90)
+
+        restart = sorted(key for key in changed if key in self.RESTART_KEYS)
+        if restart:
+            logger.warning("⚠ Restart the launcher to apply: %s", ", ".join(restart))
+
+    def refresh_settings_inputs(self, changed):
+        """Show changed settings in their widgets (without re-triggering saves)"""
+        if "system_enabled" in changed:
+            self.system_enabled_checkbox.blockSignals(True)
+            self.system_enabled_checkbox.setChecked(self.config.get("system_enabled", True))
+            self.system_enabled_checkbox.blockSignals(False)
+        if "game_path" in changed:
+            self.path_input.setText(self.config["game_path"] or "")
+        if "game_process_name" in changed:
+            self.process_input.setText(self.config["game_process_name"] or "Client-Win64-Shipping.exe")
+        if "required_playtime_minutes" in changed:
+            self.playtime_input.setText(str(self.config["required_playtime_minutes"] or 30))
+        if "screenshot_check_interval" in changed:
+            self.screenshot_input.setText(str(self.config["screenshot_check_interval"] or 2))
+        if "auto_launch_time" in changed:
+            hour, minute = map(int, self.config["auto_launch_time"].split(':'))
+            self.time_edit.setTime(QTime(hour, minute))
+        if "reset_time" in changed:
+            reset_hour, reset_minute = map(int, self.config["reset_time"].split(':'))
+            self.reset_time_edit.setTime(QTime(reset_hour, reset_minute))
+
+    def maybe_start_prewarm(self, now, launch_at):
+        """Start reading the game files into the OS cache prewarm_minutes_before the launch"""
+        if not self.config.get("prewarm_enabled", False) or self.game_running:
+            return
+        period = self.tracking["current_reset_period"]
+        if self.prewarm_period == period:
+            return
+        lead = timedelta(minutes=self.config.get("prewarm_minutes_before") or 15)
+        if not launch_at - lead <= now < launch_at:
+            return
+
+        self.prewarm_period = period
+        self.prewarmer = Prewarmer.from_config(self.config).start()
+        self.update_status_message("Prewarming game files before launch...")
+
+    def stop_prewarm(self):
+        if self.prewarmer is not None and self.prewarmer.running:
+            self.prewarmer.cancel()
+
+    def shutdown(self):
+        """Save pending state and stop background services before quitting"""
+        self.stop_prewarm()
+        if self.config_watcher:
+            self.config_watcher.stop()
+        # Don't leave the game throttled after the launcher exits
+        self.game_controller.update_idle_mode(False)
+        for runner in self.profile_runners:
+            runner.game_controller.update_idle_mode(False)
+        if self.tracking.pending_save:
+            self.tracking.force_save()
+        for runner in self.profile_runners:
+            if runner.tracking.pending_save:
+                runner.tracking.force_save()
+        if self.history:
+            # Record the period in progress too; it is updated again when it ends
+            self.history.record_period(DEFAULT_PROFILE_NAME, self.tracking.data)
+            for runner in self.profile_runners:
+                self.history.record_period(runner.key, runner.tracking.data)
+            self.history.close()
+        if self.fleet_client:
+            self.report_fleet_status()
+            self.fleet_client.flush()
+            self.fleet_client.stop()
+        if self.status_server:
+            self.status_server.stop()
+        self.tray_icon.hide()
+
     def update_tray_tooltip(self):
-        """Update tray tooltip"""
+        """Update the tray tooltip, and the tray menu texts if the menu is open"""
         if not hasattr(self, 'tray_icon'):
             return
 
-        system_enabled = self.config.get("system_enabled", True)
-
-        if not system_enabled:
-            status = "⏸ DISABLED"
-        elif self.tracking["requirement_met"]:
-            status = "✓ Complete"
-        elif self.game_controller.is_game_running():
-            status = "⏱ Playing"
-        elif self.tracking["game_started"]:
-            status = "⏸ Closed"
-        else:
-            status = "⚠ Pending"
+        changes = self.status_view.take_changes("tooltip")
+        if "tooltip" in changes:
+            self.tray_icon.setToolTip(changes["tooltip"])
 
-        minutes = self.tracking["total_playtime_seconds"] // 60
-        tooltip = f"WW Launcher - {status}\nPlaytime: {minutes}m"
-        self.tray_icon.setToolTip(tooltip)
+        if self.tray_menu.isVisible():
+            self.apply_tray_menu_status()
 
-        if hasattr(self, 'tray_status_action'):
-            self.tray_status_action.setText(f"Status: {status}")
-            self.tray_playtime_action.setText(f"Playtime: {minutes}m/{self.config['required_playtime_minutes']}m")
+    def apply_tray_menu_status(self):
+        """Push changed status fields to the tray menu actions"""
+        changes = self.status_view.take_changes("tray_menu")
+        if "tray_status_text" in changes:
+            self.tray_status_action.setText(changes["tray_status_text"])
+        if "tray_playtime_text" in changes:
+            self.tray_playtime_action.setText(changes["tray_playtime_text"])
+        if "tray_toggle_text" in changes:
+            self.tray_toggle_action.setText(changes["tray_toggle_text"])
 
-        if hasattr(self, 'tray_toggle_action'):
-            if system_enabled:
-                self.tray_toggle_action.setText("Disable System")
-            else:
-                self.tray_toggle_action.setText("Enable System")
+    def on_tray_menu_about_to_show(self):
+        self.apply_tray_menu_status()
+        self.update_diagnostics_display()
 
     def browse_game_path(self):
         """Browse for game executable"""
@@ -566,15 +814,16 @@ class WutheringWavesLauncher(QMainWindow):
 
     def save_settings(self):
         """Save settings"""
-        self.config["game_path"] = self.path_input.text()
-        self.config["game_process_name"] = self.process_input.text()
-        self.config["auto_launch_time"] = self.time_edit.time().toString("HH:mm")
-        self.config["reset_time"] = self.reset_time_edit.time().toString("HH:mm")
-
         try:
-            self.config["required_playtime_minutes"] = int(self.playtime_input.text())
-            self.config["screenshot_check_interval"] = int(self.screenshot_input.text())
-        except:
+            self.config.update({
+                "game_path": self.path_input.text(),
+                "game_process_name": self.process_input.text(),
+                "auto_launch_time": self.time_edit.time().toString("HH:mm"),
+                "reset_time": self.reset_time_edit.time().toString("HH:mm"),
+                "required_playtime_minutes": int(self.playtime_input.text()),
+                "screenshot_check_interval": int(self.screenshot_input.text()),
+            })
+        except ValueError:
             QMessageBox.warning(self, "Error", "Invalid numbers!")
             return
 
@@ -592,20 +841,12 @@ class WutheringWavesLauncher(QMainWindow):
 
     def close_game_manually(self):
         """Close the game process"""
-        process_name = self.config.get("game_process_name", "Client-Win64-Shipping.exe")
-
         try:
-            killed = False
-            for proc in psutil.process_iter(['name', 'pid']):
-                try:
-                    if proc.info['name'] and process_name.lower() in proc.info['name'].lower():
-                        proc.terminate()
-                        self.update_status_message(f"Terminated game process (PID: {proc.info['pid']})")
-                        killed = True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
-                    pass
-
-            if killed:
+            pids = self.game_controller.close_game()
+            for pid in pids:
+                self.update_status_message(f"Terminated game process (PID: {pid})")
+
+            if pids:
                 QMessageBox.information(self, "Success", "Game process terminated!")
             else:
                 QMessageBox.information(self, "Info", "Game is not running")
@@ -624,9 +865,11 @@ class WutheringWavesLauncher(QMainWindow):
             return False
 
         self.update_status_message(f"Launching game ({method})...")
+        self.stop_prewarm()
         if self.game_controller.launch_game(game_path):
             self.tracking["game_started"] = True
             self.tracking["start_time"] = datetime.now().isoformat()
+            self.tracking["launch_time"] = self.tracking["start_time"]
             self.tracking["start_method"] = method
             self.tracking["game_closed_early"] = False
             self.tracking["login_clicked"] = False
@@ -666,20 +909,48 @@ class WutheringWavesLauncher(QMainWindow):
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_timer)
         self.timer.start(1000)
+
+        # Fast login checks between ticks (see check_login)
+        self.login_timer = QTimer(self)
+        self.login_timer.setSingleShot(True)
+        self.login_timer.timeout.connect(self.check_login)
         self.update_status_message("Timer started - System ready")
 
     def update_timer(self):
-        """Main update loop"""
+        """Main update loop - times each tick and warns when it runs over budget"""
+        start = time.perf_counter()
+        try:
+            self.config.apply_pending()
+            self.run_tick()
+            self.publish_status_snapshot()
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.observe("tick", elapsed)
+
+            budget_ms = self.config.get("slow_tick_budget_ms", 500)
+            if budget_ms and elapsed * 1000.0 > budget_ms:
+                logger.warning("⚠ Slow tick: %.0f ms (budget %d ms)", elapsed * 1000.0, budget_ms)
+
+            self.update_diagnostics_display()
+
+    def run_tick(self):
+        """One pass of the automation state machine"""
         system_enabled = self.config.get("system_enabled", True)
 
         if not system_enabled:
+            self.last_patcher_status = None
             self.update_playtime()
+            self.game_controller.update_idle_mode(False)
             self.update_status_display()
             return
 
         self.check_and_reset_period()
 
         patcher_status = self.game_controller.check_for_patcher()
+        self.last_patcher_status = patcher_status
+        patch_seconds = self.patch_tracker.observe(patcher_status, self.game_controller.last_notice_text)
+        if patch_seconds:
+            self.launch_planner.record_patch(patch_seconds)
 
         if patcher_status == "update_complete":
             self.update_status_message("✓ Update/Patch complete - Exit clicked")
@@ -687,6 +958,7 @@ class WutheringWavesLauncher(QMainWindow):
             self.tracking["patcher_exit_time"] = datetime.now().isoformat()
             self.tracking["patcher_type"] = "update"
             self.tracking["waiting_after_patch"] = True
+            self.tracking["patch_events"] = (self.tracking["patch_events"] or 0) + 1
             self.tracking.force_save()
 
         elif patcher_status == "network_error":
@@ -728,155 +1000,350 @@ class WutheringWavesLauncher(QMainWindow):
                     if not self.game_controller.is_game_running():
                         self.launch_game("automatic_after_network_error")
 
-        if (self.tracking["game_started"] and
-                not self.tracking["login_clicked"] and
-                self.tracking["start_time"]):
-
-            start_dt = datetime.fromisoformat(self.tracking["start_time"])
-            time_since_start = (datetime.now() - start_dt).total_seconds()
-
-            min_wait = self.config["login_wait_min_seconds"] or 15
-            max_wait = self.config["login_wait_max_seconds"] or 90
-
-            if min_wait <= time_since_start <= max_wait:
-                last_check = self.tracking["last_screenshot_check"]
-                check_interval = self.config["screenshot_check_interval"] or 2
-
-                should_check = True
-                if last_check:
-                    last_check_dt = datetime.fromisoformat(last_check)
-                    should_check = (datetime.now() - last_check_dt).total_seconds() >= check_interval
-
-                if should_check:
-                    self.tracking["last_screenshot_check"] = datetime.now().isoformat()
-                    self.tracking.save()
-
-                    result = self.game_controller.click_login_screen()
-
-                    if result == "clicked":
-                        self.update_status_message("✓ Login clicked!")
-                        self.tracking["login_clicked"] = True
-                        self.tracking["login_click_time"] = datetime.now().isoformat()
-                        self.tracking.force_save()
-                    elif result == "waiting_login_status":
-                        self.update_status_message("⏳ Waiting for 'Login Status: 0'...")
-                    elif result == "waiting_tap_text":
-                        self.update_status_message("⏳ Waiting for 'Tap to land' text...")
-                    elif result == "not_found":
-                        self.update_status_message("⚠ Game window not found")
+        self.check_login()
 
         self.update_playtime()
+        self.sample_resources()
+        self.game_controller.update_idle_mode(self.game_running and self.tracking["login_clicked"]
+                                              and not self.tracking["requirement_met"])
 
         now = datetime.now()
         if not self.tracking["requirement_met"] and not self.tracking["auto_launch_attempted"]:
-            auto_launch_time_str = self.config["auto_launch_time"]
-            hour, minute = map(int, auto_launch_time_str.split(':'))
-            auto_launch_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-
-            if now >= auto_launch_time:
-                next_reset = self.get_next_reset_time()
-                if now < next_reset and not self.game_controller.is_game_running():
+            next_reset = self.get_next_reset_time()
+            launch_at = self.planned_launch_time(now, next_reset)
+            self.maybe_start_prewarm(now, launch_at)
+            if now >= launch_at:
+                if (now < next_reset and not self.game_controller.is_game_running()
+                        and not self.launch_scheduler.is_pending(DEFAULT_PROFILE_NAME)):
                     self.update_status_message("Auto-launch time reached!")
-                    self.launch_game("automatic")
+                    required_seconds = (self.config["required_playtime_minutes"] or 30) * 60
+                    remaining = max(0, required_seconds - self.tracking["total_playtime_seconds"])
+                    self.launch_scheduler.request(DEFAULT_PROFILE_NAME, lambda: self.launch_game("automatic"),
+                                                  next_reset, remaining)
+
+        self.run_profiles()
 
         self.update_status_display(patcher_status)
 
-    def update_status_display(self, patcher_status=None):
-        """Update UI status"""
-        system_enabled = self.config.get("system_enabled", True)
+    def check_login(self):
+        """
+        Run one login step (check, click or click re-check) when the adaptive
+        poller says it is due. Sub-second follow-ups (the fast burst, click
+        re-checks) are armed on a single-shot timer so they don't wait for the
+        next 1 s tick.
+        """
+        if not (self.tracking["game_started"] and
+                not self.tracking["login_clicked"] and
+                self.tracking["start_time"]):
+            return
+        if not self.config.get("system_enabled", True):
+            return
 
-        waiting_after_patch = False
-        wait_time_remaining = 0
-        wait_reason = ""
+        start_dt = datetime.fromisoformat(self.tracking["start_time"])
+        time_since_start = (datetime.now() - start_dt).total_seconds()
 
-        if self.tracking.get("waiting_after_patch") and self.tracking.get("patcher_exit_time"):
-            exit_time = datetime.fromisoformat(self.tracking["patcher_exit_time"])
-            time_since_exit = (datetime.now() - exit_time).total_seconds()
-            patcher_type = self.tracking.get("patcher_type", "update")
+        self.login_poller.start(self.tracking["start_time"])
+        if not self.login_poller.due(time_since_start):
+            return
 
-            if patcher_type == "update":
-                total_wait = 10
-                if time_since_exit < total_wait:
-                    waiting_after_patch = True
-                    wait_time_remaining = int(total_wait - time_since_exit)
-                    wait_reason = "update/patch"
-            elif patcher_type == "network":
-                total_wait = 600
-                if time_since_exit < total_wait:
-                    waiting_after_patch = True
-                    wait_time_remaining = int(total_wait - time_since_exit)
-                    wait_reason = "network error"
+        if not self.login_poller.clicking:
+            self.tracking["last_screenshot_check"] = datetime.now().isoformat()
+            self.tracking["ocr_attempts"] = (self.tracking["ocr_attempts"] or 0) + 1
+            self.tracking.save()
+
+        result = self.game_controller.click_login_screen(self.login_poller, time_since_start)
+        self.login_poller.record(result, self.game_controller.last_frame_signature)
+
+        if result == "clicked":
+            self.update_status_message("✓ Login clicked!")
+            self.tracking["login_clicked"] = True
+            self.tracking["login_click_time"] = datetime.now().isoformat()
+            # When the screen was found, not when the delayed, verified click landed
+            ready_seconds = self.login_poller.ready_seconds or time_since_start
+            self.tracking["login_ready_seconds"] = round(ready_seconds, 1)
+            self.login_model.observe(ready_seconds)
+            self.tracking.force_save()
+            return
+        elif result == "ready":
+            self.update_status_message(f"✓ Login screen ready - clicking in {self.login_poller.click_delay:g}s...")
+        elif result == "click_sent":
+            self.update_status_message("⏳ Login click sent - confirming...")
+        elif result == "waiting_login_status":
+            self.update_status_message("⏳ Waiting for 'Login Status: 0'...")
+        elif result == "waiting_tap_text":
+            self.update_status_message("⏳ Waiting for 'Tap to land' text...")
+        elif result == "not_found":
+            self.update_status_message("⚠ Game window not found")
+        elif result == "window_unavailable":
+            reason = REASON_TEXT.get(self.game_controller.last_skip_reason, "game window can't be captured")
+            self.update_status_message(f"⏳ Check skipped: {reason}")
+        elif result == "click_unconfirmed":
+            self.update_status_message("⚠ Login click not confirmed - will check again")
+
+        delay = self.login_poller.next_delay(time_since_start)
+        if delay is None:
+            self.update_status_message("⚠ Login screen not detected - click it manually")
+        elif delay < 1.0 and not self.login_timer.isActive():
+            self.login_timer.start(int(delay * 1000))
+
+    def run_profiles(self):
+        """Tick extra profiles, then let the scheduler start at most one queued launch"""
+        for runner in self.profile_runners:
+            try:
+                runner.tick()
+            except Exception as e:
+                logger.exception("✗ Error updating profile %s: %s", runner.key, e)
 
-        if not system_enabled:
-            self.status_label.setText("⏸ System DISABLED")
-            self.status_label.setStyleSheet("color: red;")
-        elif waiting_after_patch:
-            minutes = wait_time_remaining // 60
-            seconds = wait_time_remaining % 60
-            self.status_label.setText(f"⏳ Waiting to relaunch ({minutes}m {seconds}s)")
-            self.status_label.setStyleSheet("color: orange;")
-        elif self.tracking["requirement_met"]:
-            self.status_label.setText("✓ Daily requirement completed!")
-            self.status_label.setStyleSheet("color: green;")
-        elif self.game_controller.is_game_running():
-            self.status_label.setText("⏱ Playing now...")
-            self.status_label.setStyleSheet("color: blue;")
-        elif self.tracking["game_started"]:
-            self.status_label.setText("⏸ Game closed (played today)")
-            self.status_label.setStyleSheet("color: gray;")
-        else:
-            self.status_label.setText("⚠ Not started today")
-            self.status_label.setStyleSheet("color: orange;")
+        running = sum(1 for runner in self.profile_runners if runner.running)
+        if self.game_controller.is_game_running():
+            running += 1
+
+        launched = self.launch_scheduler.tick(running, shared=bool(self.profile_runners))
+        if launched and launched != DEFAULT_PROFILE_NAME:
+            self.update_status_message(f"Launching profile '{launched}'...")
+
+        if self.fleet_client:
+            self.report_fleet_status()
+            self.handle_fleet_commands()
+
+    def get_status_summary(self):
+        """Short state name shared by the tray tooltip and the status API"""
+        if not self.config.get("system_enabled", True):
+            return "disabled"
+        if self.tracking["requirement_met"]:
+            return "complete"
+        if self.game_running:
+            return "playing"
+        if self.tracking["game_started"]:
+            return "closed"
+        return "pending"
+
+    def publish_status_snapshot(self):
+        """Build this tick's status once; status API requests only read the published copy"""
+        next_reset = self.get_next_reset_time()
+        self.status_snapshot.publish({
+            "timestamp": datetime.now().isoformat(),
+            "state": self.get_status_summary(),
+            "system_enabled": bool(self.config.get("system_enabled", True)),
+            "game_running": self.game_running,
+            "patcher_status": self.last_patcher_status,
+            "period": self.tracking["current_reset_period"],
+            "playtime_seconds": self.tracking["total_playtime_seconds"],
+            "required_playtime_seconds": (self.config["required_playtime_minutes"] or 30) * 60,
+            "requirement_met": bool(self.tracking["requirement_met"]),
+            "start_method": self.tracking["start_method"],
+            "login_clicked": bool(self.tracking["login_clicked"]),
+            "next_reset": next_reset.isoformat(),
+            "seconds_until_reset": max(0, int((next_reset - datetime.now()).total_seconds())),
+            "launch_queue": sorted(self.launch_scheduler.pending),
+            "profiles": [{
+                "name": runner.key,
+                "game_running": runner.running,
+                "playtime_seconds": runner.tracking["total_playtime_seconds"],
+                "requirement_met": bool(runner.tracking["requirement_met"]),
+            } for runner in self.profile_runners],
+            "metrics": metrics.snapshot(),
+        })
+
+    def report_fleet_status(self):
+        """Buffer this tick's status for the fleet coordinator (sent in batches by the client thread)"""
+        self.fleet_client.report({
+            "profile": DEFAULT_PROFILE_NAME,
+            "game_running": self.game_running,
+            "playtime_seconds": self.tracking["total_playtime_seconds"],
+            "requirement_met": bool(self.tracking["requirement_met"]),
+            "login_clicked": bool(self.tracking["login_clicked"]),
+            "system_enabled": bool(self.config.get("system_enabled", True)),
+            "period": self.tracking["current_reset_period"],
+        })
+        for runner in self.profile_runners:
+            self.fleet_client.report({
+                "profile": runner.key,
+                "game_running": runner.running,
+                "playtime_seconds": runner.tracking["total_playtime_seconds"],
+                "requirement_met": bool(runner.tracking["requirement_met"]),
+                "login_clicked": bool(runner.tracking["login_clicked"]),
+                "period": runner.tracking["current_reset_period"],
+            })
+
+    def handle_fleet_commands(self):
+        """Apply launch/close commands received from the coordinator"""
+        for command in self.fleet_client.pop_commands():
+            action = command.get("command")
+            profile = command.get("profile") or DEFAULT_PROFILE_NAME
+            logger.info("Fleet command: %s %s", action, profile)
+
+            if profile == DEFAULT_PROFILE_NAME:
+                controller = self.game_controller
+                launch = lambda: self.launch_game("remote")
+                reset_time = self.config["reset_time"]
+            else:
+                runner = next((r for r in self.profile_runners if r.key == profile), None)
+                if runner is None:
+                    logger.warning("⚠ Fleet command for unknown profile: %s", profile)
+                    continue
+                controller = runner.game_controller
+                launch = runner.launch
+                reset_time = runner.profile["reset_time"]
+
+            if action == "launch":
+                if not controller.is_game_running():
+                    self.launch_scheduler.request(profile, launch, get_next_reset(reset_time), 0)
+            elif action == "close":
+                self.launch_scheduler.cancel(profile)
+                controller.close_game()
+            self.update_status_message(f"Fleet command: {action} ({profile})")
+
+    def handle_instance_command(self, command):
+        """Command forwarded by a second launch of the app (see single_instance.py)"""
+        if command == "show":
+            self.show_window()
+            return {"ok": True, "message": "Launcher window shown"}
+
+        if command == "launch_now":
+            if self.game_controller.is_game_running():
+                return {"ok": False, "message": "Game is already running"}
+            game_path = self.config["game_path"]
+            if not game_path or not os.path.exists(game_path):
+                return {"ok": False, "message": f"Game not found: {game_path}"}
+            self.launch_scheduler.cancel(DEFAULT_PROFILE_NAME)
+            launched = self.launch_game("command_line")
+            return {"ok": launched, "message": "Game launched" if launched else "Launch failed"}
+
+        if command == "reset":
+            self.update_status_message("Resetting daily status (command line)...")
+            self.tracking.reset(self.get_current_reset_period_id())
+            self.update_status_display()
+            return {"ok": True, "message": "Today's progress reset"}
 
-        minutes = self.tracking["total_playtime_seconds"] // 60
-        seconds = self.tracking["total_playtime_seconds"] % 60
-        required = self.config["required_playtime_minutes"] or 30
+        if command == "status":
+            body, age = self.status_snapshot.get()
+            return {"ok": True, "status": json.loads(body), "age_seconds": age}
 
-        playtime_text = f"Playtime: {minutes}m {seconds}s / {required}m"
-        if self.tracking["start_method"]:
-            playtime_text += f" ({self.tracking['start_method']})"
-        self.playtime_label.setText(playtime_text)
+        return {"ok": False, "message": f"Unknown command: {command}"}
 
-        if not system_enabled:
-            self.game_status_label.setText("⏸ Automation disabled")
-            self.game_status_label.setStyleSheet("color: red;")
-        elif waiting_after_patch:
-            self.game_status_label.setText(f"⏳ Will relaunch after {wait_reason} ({wait_time_remaining}s)")
-            self.game_status_label.setStyleSheet("color: orange;")
-        elif patcher_status == "patching":
-            self.game_status_label.setText("⏳ Game is updating/patching...")
-            self.game_status_label.setStyleSheet("color: orange;")
-        elif self.game_controller.is_game_running():
-            self.game_status_label.setText("🎮 Game running")
-            self.game_status_label.setStyleSheet("color: green;")
+    def get_patch_wait(self):
+        """(reason, seconds remaining) while waiting to relaunch after a patcher exit, else None"""
+        if not (self.tracking.get("waiting_after_patch") and self.tracking.get("patcher_exit_time")):
+            return None
+
+        exit_time = datetime.fromisoformat(self.tracking["patcher_exit_time"])
+        time_since_exit = (datetime.now() - exit_time).total_seconds()
+        patcher_type = self.tracking.get("patcher_type", "update")
+
+        if patcher_type == "update":
+            total_wait, reason = 10, "update/patch"
+        elif patcher_type == "network":
+            total_wait, reason = 600, "network error"
         else:
-            self.game_status_label.setText("Game not running")
-            self.game_status_label.setStyleSheet("color: gray;")
+            return None
 
-        next_reset = self.get_next_reset_time()
-        time_until = next_reset - datetime.now()
-        self.timer_label.setText(f"Next reset: {self.format_timedelta(time_until)}")
+        if time_since_exit < total_wait:
+            return reason, int(total_wait - time_since_exit)
+        return None
 
+    def update_status_display(self, patcher_status=None):
+        """Recompute the status view and push what changed to the visible widgets"""
+        queued_reason = None
+        if self.launch_scheduler.is_pending(DEFAULT_PROFILE_NAME):
+            queued_reason = self.launch_scheduler.last_block_reason or "waiting for a launch slot"
+
+        self.status_view.update(build_status_view(
+            self.tracking, self.config, datetime.now(),
+            game_running=self.game_running,
+            next_reset=self.get_next_reset_time(),
+            patcher_status=patcher_status,
+            patch_progress=self.patch_tracker.status_text(),
+            patch_wait=self.get_patch_wait(),
+            launch_queued_reason=queued_reason,
+            profile_texts=[runner.status_text() for runner in self.profile_runners],
+        ))
+
+        # Hidden widgets catch up in showEvent / the tray menu's aboutToShow
+        if self.isVisible():
+            self.apply_window_status()
         self.update_tray_tooltip()
 
-    def format_timedelta(self, td):
-        """Format timedelta"""
-        total_seconds = int(td.total_seconds())
-        if total_seconds < 0:
-            return "00:00:00"
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    def apply_window_status(self):
+        """Push changed status fields to the main window labels"""
+        changes = self.status_view.take_changes("window")
+        if "status_text" in changes:
+            self.status_label.setText(changes["status_text"])
+        if "status_color" in changes:
+            self.status_label.setStyleSheet(f"color: {changes['status_color']};")
+        if "playtime_text" in changes:
+            self.playtime_label.setText(changes["playtime_text"])
+        if "game_status_text" in changes:
+            self.game_status_label.setText(changes["game_status_text"])
+        if "game_status_color" in changes:
+            self.game_status_label.setStyleSheet(f"color: {changes['game_status_color']};")
+        if "timer_text" in changes:
+            self.timer_label.setText(changes["timer_text"])
+        if "profiles_text" in changes:
+            self.profiles_label.setText(changes["profiles_text"] or "")
+            self.profiles_label.setVisible(bool(changes["profiles_text"]))
+
+    def showEvent(self, event):
+        """Apply status changes that accumulated while the window was hidden"""
+        super().showEvent(event)
+        if hasattr(self, 'status_view'):
+            self.apply_window_status()
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Wuthering Waves auto-login launcher")
+    commands = parser.add_mutually_exclusive_group()
+    commands.add_argument("--show", dest="command", action="store_const", const="show",
+                          help="Show the launcher window (default)")
+    commands.add_argument("--launch-now", dest="command", action="store_const", const="launch_now",
+                          help="Launch the game now")
+    commands.add_argument("--reset", dest="command", action="store_const", const="reset",
+                          help="Reset today's progress")
+    commands.add_argument("--status", dest="command", action="store_const", const="status",
+                          help="Print the running launcher's status as JSON")
+    # Qt options (e.g. -platform) are left for QApplication
+    args, _ = parser.parse_known_args(argv[1:])
+    return args
+
+
+def forward_to_running_instance(command):
+    """Second launch: hand the command to the running launcher; returns the exit code"""
+    reply = send_command(command)
+    if reply is None:
+        print("✗ Another launcher is running but did not answer")
+        return 1
+    if command == "status":
+        print(json.dumps(reply.get("status"), indent=2))
+    else:
+        print(("✓ " if reply.get("ok") else "✗ ") + reply.get("message", ""))
+    return 0 if reply.get("ok") else 1
 
 
 def main():
+    args = parse_args(sys.argv)
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(False)
 
+    # One launcher per install: later starts forward their command and exit
+    instance_lock = InstanceLock()
+    if not instance_lock.acquire():
+        sys.exit(forward_to_running_instance(args.command or "show"))
+    if args.command == "status":
+        print("No launcher is running")
+        instance_lock.release()
+        sys.exit(1)
+
+    # Log with the defaults while the config loads, so its migration and validation messages are kept
+    setup_logging()
+    config = Config()
+    if config.get("log_file") != DEFAULT_LOG_FILE:
+        setup_logging(config.get("log_level"), config.get("log_file"))
+    else:
+        set_log_level(config.get("log_level"))
+
     print("=== Wuthering Waves Launcher v2.0 ===")
     print("Visual Detection with OCR Enabled")
-    print(f"Debug Mode: {DEBUG}")
+    print(f"Log Level: {config.get('log_level')}")
     print("\nRequired dependencies:")
     print("  pip install PySide6 psutil opencv-python pillow numpy pywin32 pytesseract")
     print("\nFor OCR to work, also install Tesseract-OCR:")
@@ -885,10 +1352,18 @@ def main():
     print("  pip install pywin32")
     print()
 
-    window = WutheringWavesLauncher()
+    window = WutheringWavesLauncher(config)
     window.show()
-
-    sys.exit(app.exec())
+    command_server = CommandServer(window.handle_instance_command).start()
+    if args.command in ("launch_now", "reset"):
+        logger.info("Command line: %s", args.command)
+        window.handle_instance_command(args.command)
+
+    exit_code = app.exec()
+    command_server.stop()
+    instance_lock.release()
+    shutdown_logging()
+    sys.exit(exit_code)
 
 
 if __name__ == "__main__":
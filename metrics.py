@@ -0,0 +1,122 @@
+# ============================================================
+# File: metrics.py
+# ============================================================
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RollingHistogram:
+    """Keeps the most recent samples of one timing span (in seconds)"""
+
+    def __init__(self, window=256):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.last = None
+
+    def add(self, value):
+        self.samples.append(value)
+        self.count += 1
+        self.last = value
+
+    def percentile(self, pct):
+        """Nearest-rank percentile over the rolling window"""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+        return ordered[index]
+
+    def summary(self):
+        """Summary in milliseconds"""
+        if not self.samples:
+            return {"count": self.count, "last_ms": None, "p50_ms": None, "p95_ms": None, "max_ms": None}
+
+        def ms(value):
+            return round(value * 1000.0, 2)
+
+        return {
+            "count": self.count,
+            "last_ms": ms(self.last),
+            "p50_ms": ms(self.percentile(50)),
+            "p95_ms": ms(self.percentile(95)),
+            "max_ms": ms(max(self.samples)),
+        }
+
+
+class MetricsRegistry:
+    """Named rolling histograms for hot-path timing spans"""
+
+    def __init__(self, window=256):
+        self.window = window
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        """Record one duration (seconds) for a span"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = RollingHistogram(self.window)
+            histogram.add(seconds)
+
+    @contextmanager
+    def span(self, name):
+        """Time the enclosed block and record it under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def summary(self, name):
+        """Summary of a single span, or None if never recorded"""
+        with self._lock:
+            histogram = self._histograms.get(name)
+            return histogram.summary() if histogram else None
+
+    def snapshot(self):
+        """Summaries of all spans keyed by name"""
+        with self._lock:
+            return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def to_json(self, indent=2):
+        return json.dumps({
+            "generated_at": datetime.now().isoformat(),
+            "window": self.window,
+            "spans": self.snapshot()
+        }, indent=indent)
+
+    def dump_json(self, path="ww_launcher_metrics.json"):
+        """Write the current snapshot to a JSON file and return its path"""
+        with open(path, 'w', encoding="utf-8") as f:
+            f.write(self.to_json())
+        return path
+
+    def format_table(self):
+        """Plain-text table for the diagnostics panel"""
+        snapshot = self.snapshot()
+        if not snapshot:
+            return "No samples yet"
+
+        def fmt(value):
+            return "-" if value is None else f"{value:.1f}"
+
+        lines = [f"{'span':<22}{'n':>6}{'p50':>9}{'p95':>9}{'max':>9}"]
+        for name, stats in snapshot.items():
+            lines.append(
+                f"{name:<22}{stats['count']:>6}{fmt(stats['p50_ms']):>9}"
+                f"{fmt(stats['p95_ms']):>9}{fmt(stats['max_ms']):>9}"
+            )
+        return "\n".join(lines)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+# Process-wide registry shared by all modules
+metrics = MetricsRegistry()
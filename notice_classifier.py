@@ -0,0 +1,91 @@
+# ============================================================
+# File: notice_classifier.py
+# ============================================================
+"""
+Table-driven classifier for the launcher's Notice/patcher dialog text.
+
+Rules are (notice type, regex) pairs in priority order. All rule patterns
+are compiled into one alternation with a named group per rule, so the text
+is scanned once and the highest-priority rule that matched anywhere wins.
+Results are cached per normalised text, so a dialog that has not changed
+since the last tick is not re-parsed.
+"""
+import re
+from collections import OrderedDict
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+NOTICE_UPDATE_COMPLETE = "update_complete"
+NOTICE_NETWORK_ERROR = "network_error"
+NOTICE_PATCHING = "patching"
+NOTICE_UNKNOWN = "unknown"
+
+# "complete" must be a whole word ("incomplete" is not) and not negated ("not complete")
+_COMPLETE = r"(?<!not )\bcomplete(?:d)?\b"
+_FAILED = r"\b(?:error|fail(?:ed|ure|s)?|timed? ?out|disconnected)\b"
+
+NOTICE_RULES = (
+    (NOTICE_UPDATE_COMPLETE, rf"\b(?:update|patch(?:ing)?|download)\b[\w ]{{0,20}}?{_COMPLETE}"),
+    (NOTICE_UPDATE_COMPLETE, r"\brestart the game\b"),
+    (NOTICE_NETWORK_ERROR, rf"\bnetwork\b[\w ]{{0,30}}?{_FAILED}"),
+    (NOTICE_NETWORK_ERROR, rf"{_FAILED}[\w ]{{0,30}}?\bnetwork\b"),
+    (NOTICE_NETWORK_ERROR, r"\b(?:connection|server)\b[\w ]{0,20}?\b(?:error|failed|lost)\b"),
+    (NOTICE_PATCHING, r"\b(?:updat(?:e|es|ing)|patch(?:es|ing)?|download(?:s|ing)?|verifying)\b"),
+)
+
+_WHITESPACE = re.compile(r"[^\w%.]+")
+
+
+def normalize_notice_text(text):
+    """Lower-case, punctuation folded to single spaces"""
+    return _WHITESPACE.sub(" ", text.lower()).strip()
+
+
+class NoticeClassifier:
+    """Classifies notice text with one precompiled multi-pattern regex and an LRU cache"""
+
+    def __init__(self, rules=NOTICE_RULES, max_cache_entries=64):
+        self.rules = tuple(rules)
+        self._pattern = re.compile("|".join(f"(?P<r{index}>{pattern})"
+                                            for index, (_, pattern) in enumerate(self.rules)))
+        self.max_cache_entries = max_cache_entries
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _match(self, normalized):
+        best = None
+        for match in self._pattern.finditer(normalized):
+            index = int(match.lastgroup[1:])
+            if best is None or index < best:
+                best = index
+                if best == 0:
+                    break
+        return self.rules[best][0] if best is not None else NOTICE_UNKNOWN
+
+    def classify(self, text):
+        """Notice type for a dialog's text (NOTICE_UNKNOWN if no rule matches)"""
+        normalized = normalize_notice_text(text or "")
+        cached = self._cache.get(normalized)
+        if cached is not None:
+            self._cache.move_to_end(normalized)
+            self.cache_hits += 1
+            return cached
+
+        self.cache_misses += 1
+        notice_type = self._match(normalized)
+        logger.debug("Notice classified as %s: %r", notice_type, normalized[:100])
+
+        self._cache[normalized] = notice_type
+        if len(self._cache) > self.max_cache_entries:
+            self._cache.popitem(last=False)
+        return notice_type
+
+    def cache_info(self):
+        return {
+            "entries": len(self._cache),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses
+        }
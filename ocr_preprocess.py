@@ -0,0 +1,140 @@
+# ============================================================
+# File: ocr_preprocess.py
+# ============================================================
+from collections import OrderedDict
+
+import cv2
+
+from frame_pool import pooled_buffer
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+# Regions of interest as fractions of the window: (left, top, right, bottom)
+# text_height is the expected cap height of the text as a fraction of window height
+ROI_DEFINITIONS = {
+    "login_status": {"box": (0.75, 0.90, 1.00, 1.00), "text_height": 0.018},
+    "tap_to_land": {"box": (0.25, 0.65, 0.75, 1.00), "text_height": 0.028},
+}
+
+# Tesseract is most accurate with text roughly 20-40 px tall
+TARGET_TEXT_HEIGHT = 32
+
+# Never upscale a crop by more than this - it only adds pixels, not detail
+MAX_UPSCALE = 3.0
+
+
+class RoiPlan:
+    """Precomputed crop rectangle and resize/threshold parameters for one ROI at one window size"""
+
+    __slots__ = ("rect", "scale", "output_size", "interpolation", "block_size", "threshold_c")
+
+    def __init__(self, rect, scale, output_size, interpolation, block_size, threshold_c):
+        self.rect = rect
+        self.scale = scale
+        self.output_size = output_size
+        self.interpolation = interpolation
+        self.block_size = block_size
+        self.threshold_c = threshold_c
+
+    def __repr__(self):
+        return f"RoiPlan(rect={self.rect}, scale={self.scale:.3f}, output_size={self.output_size})"
+
+
+class RoiPreprocessor:
+    """
+    Grayscale -> resize to a fixed text height -> adaptive threshold.
+    Crop rectangles and resize/threshold parameters are cached per window
+    size, so repeated checks at the same resolution only do the pixel work.
+    """
+
+    def __init__(self, target_text_height=TARGET_TEXT_HEIGHT, roi_definitions=None, max_cache_entries=8):
+        self.target_text_height = target_text_height
+        self.roi_definitions = roi_definitions or ROI_DEFINITIONS
+        self.max_cache_entries = max_cache_entries
+        self._plans = OrderedDict()  # (width, height) -> {roi_name: RoiPlan}
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def _build_plans(self, width, height):
+        plans = {}
+        for name, definition in self.roi_definitions.items():
+            left, top, right, bottom = definition["box"]
+            rect = (int(width * left), int(height * top), int(width * right), int(height * bottom))
+
+            text_px = max(1.0, height * definition["text_height"])
+            scale = min(MAX_UPSCALE, self.target_text_height / text_px)
+            output_size = (max(1, int(round((rect[2] - rect[0]) * scale))),
+                           max(1, int(round((rect[3] - rect[1]) * scale))))
+            interpolation = cv2.INTER_AREA if scale < 1.0 else cv2.INTER_CUBIC
+
+            # After resizing the text height is fixed, so the neighbourhood can be too.
+            # Block ~1.5x text height (odd); negative C keeps only clearly-brighter strokes.
+            block_size = int(self.target_text_height * 1.5) | 1
+            plans[name] = RoiPlan(rect, scale, output_size, interpolation, block_size, -10)
+
+        logger.debug("Built ROI plans for %dx%d: %s", width, height, plans)
+        return plans
+
+    def plans_for(self, width, height):
+        """Cached ROI plans for a window size"""
+        key = (width, height)
+        plans = self._plans.get(key)
+        if plans is not None:
+            self._plans.move_to_end(key)
+            self.cache_hits += 1
+            return plans
+
+        self.cache_misses += 1
+        plans = self._build_plans(width, height)
+        self._plans[key] = plans
+        if len(self._plans) > self.max_cache_entries:
+            self._plans.popitem(last=False)
+        return plans
+
+    def plan(self, roi_name, width, height):
+        return self.plans_for(width, height)[roi_name]
+
+    def roi_rect(self, roi_name, width, height):
+        """(left, top, right, bottom) pixel rectangle of a ROI"""
+        return self.plan(roi_name, width, height).rect
+
+    def crop(self, img_np, roi_name):
+        """View (no copy) of the ROI in an image array"""
+        height, width = img_np.shape[:2]
+        left, top, right, bottom = self.roi_rect(roi_name, width, height)
+        return img_np[top:bottom, left:right]
+
+    def preprocess(self, img_np, roi_name, buffers=None):
+        """
+        Return the ROI as a binarised image (dark text on white) resized so
+        the text is target_text_height pixels tall.
+        img_np is the full RGB (or already grayscale) window frame.
+        With a FrameBufferPool every intermediate (and the result) is written
+        into reused buffers; the result is only valid until the next call.
+        """
+        height, width = img_np.shape[:2]
+        plan = self.plan(roi_name, width, height)
+        left, top, right, bottom = plan.rect
+        roi = img_np[top:bottom, left:right]
+
+        gray = roi
+        if roi.ndim == 3:
+            gray = cv2.cvtColor(roi, cv2.COLOR_RGB2GRAY,
+                                dst=pooled_buffer(buffers, "gray", roi.shape[:2]))
+        if plan.scale != 1.0:
+            out_width, out_height = plan.output_size
+            gray = cv2.resize(gray, plan.output_size, interpolation=plan.interpolation,
+                              dst=pooled_buffer(buffers, "resized", (out_height, out_width)))
+
+        # Game text is light on a darker background; invert so Tesseract sees dark-on-light
+        return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                     cv2.THRESH_BINARY_INV, plan.block_size, plan.threshold_c,
+                                     dst=pooled_buffer(buffers, "binary", gray.shape))
+
+    def cache_info(self):
+        return {
+            "entries": len(self._plans),
+            "hits": self.cache_hits,
+            "misses": self.cache_misses
+        }
@@ -0,0 +1,76 @@
+# ============================================================
+# File: ocr_profiles.py
+# ============================================================
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+# Tesseract engine modes / page segmentation modes used below
+OEM_LSTM_ONLY = 1
+PSM_SINGLE_BLOCK = 6
+PSM_SINGLE_LINE = 7
+
+
+def whitelist_from(*phrases):
+    """Unique non-space characters of the given phrases, in first-seen order"""
+    seen = []
+    for phrase in phrases:
+        for char in phrase:
+            if not char.isspace() and char not in seen:
+                seen.append(char)
+    return "".join(seen)
+
+
+class OcrProfile:
+    """Tesseract settings for one region of interest"""
+
+    def __init__(self, name, psm=PSM_SINGLE_LINE, oem=OEM_LSTM_ONLY, whitelist=None,
+                 disable_dictionary=True, lang="eng"):
+        self.name = name
+        self.psm = psm
+        self.oem = oem
+        self.whitelist = whitelist
+        self.disable_dictionary = disable_dictionary
+        self.lang = lang
+        self.config = self._build_config()
+
+    def _build_config(self):
+        parts = []
+        if self.oem is not None:
+            parts.append(f"--oem {self.oem}")
+        parts.append(f"--psm {self.psm}")
+        if self.whitelist:
+            # pytesseract splits the config with shlex, so the whitelist must not contain spaces
+            parts.append(f"-c tessedit_char_whitelist={self.whitelist}")
+        if self.disable_dictionary:
+            parts.append("-c load_system_dawg=0 -c load_freq_dawg=0")
+        return " ".join(parts)
+
+    def __repr__(self):
+        return f"OcrProfile({self.name!r}, config={self.config!r})"
+
+
+# The generic settings used before per-ROI profiles existed
+GENERIC_PROFILE = OcrProfile("generic", psm=PSM_SINGLE_BLOCK, oem=None, disable_dictionary=False)
+
+# Detector name -> profile
+OCR_PROFILES = {
+    # Digits stay in the whitelist so "Login Status: 1" is not misread as 0
+    "login_status": OcrProfile("login_status", whitelist=whitelist_from("Login Status:", "0123456789")),
+    "tap_to_land": OcrProfile("tap_to_land", whitelist=whitelist_from("Tap to land in Solaris-3")),
+    # Notice dialogs without readable child controls: free text, keep the dictionary
+    "notice": OcrProfile("notice", psm=PSM_SINGLE_BLOCK, disable_dictionary=False),
+}
+
+
+def get_ocr_profile(detector_name):
+    """Profile registered for a detector, or the generic profile"""
+    return OCR_PROFILES.get(detector_name, GENERIC_PROFILE)
+
+
+def register_ocr_profile(detector_name, profile):
+    """Register (or replace) the profile for a detector; returns the previous one"""
+    previous = OCR_PROFILES.get(detector_name)
+    OCR_PROFILES[detector_name] = profile
+    logger.debug("OCR profile for %s: %s", detector_name, profile.config)
+    return previous
@@ -0,0 +1,215 @@
+# ============================================================
+# File: prewarm.py
+# ============================================================
+"""
+Page-cache prewarming of the game files before a scheduled launch.
+
+Cold starts spend most of their time reading the client's large pak
+files. Reading them once, a few minutes before auto-launch, leaves them in
+the OS file cache so the launch itself reads from memory.
+
+Files are read sequentially in large blocks into one reused buffer, on a
+background thread at idle I/O priority, with a bandwidth cap so the disk
+stays usable. Only as much as fits comfortably in free RAM is read;
+anything beyond that would just evict itself.
+"""
+import os
+import sys
+import threading
+import time
+
+import psutil
+
+from log_manager import get_logger
+from metrics import metrics
+
+logger = get_logger(__name__)
+
+DEFAULT_EXTENSIONS = (".pak", ".ucas", ".utoc", ".sig")
+
+# Windows: THREAD_MODE_BACKGROUND_BEGIN lowers CPU, I/O and memory priority of the calling thread
+THREAD_MODE_BACKGROUND_BEGIN = 0x00010000
+
+
+def lower_thread_priority():
+    """Best effort: background priority for the calling thread"""
+    try:
+        if sys.platform == "win32":
+            import ctypes
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_MODE_BACKGROUND_BEGIN)
+        elif hasattr(os, "setpriority"):
+            # On Linux the nice value is per thread
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
+    except Exception as e:
+        logger.debug("Could not lower prewarm thread priority: %s", e)
+
+
+def find_game_files(root, extensions=DEFAULT_EXTENSIONS, min_file_bytes=1024 * 1024):
+    """(path, size) of matching files under `root`, in path order (pak chunks are read in sequence)"""
+    extensions = tuple(extension.lower() for extension in extensions or ())
+    files = []
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if extensions and not name.lower().endswith(extensions):
+                continue
+            path = os.path.join(directory, name)
+            try:
+                size = os.path.getsize(path)
+            except OSError:
+                continue
+            if size >= min_file_bytes:
+                files.append((path, size))
+    files.sort()
+    return files
+
+
+class Prewarmer:
+    """
+    Reads game files into the page cache on a background thread.
+    start() / cancel() / progress(); one instance per prewarm run.
+    """
+
+    def __init__(self, root, extensions=DEFAULT_EXTENSIONS, block_size=4 * 1024 * 1024,
+                 max_bytes_per_second=200 * 1024 * 1024, max_bytes=None, ram_fraction=0.5,
+                 min_file_bytes=1024 * 1024):
+        self.root = root
+        self.extensions = extensions
+        self.block_size = block_size
+        self.max_bytes_per_second = max_bytes_per_second
+        self.max_bytes = max_bytes
+        self.ram_fraction = ram_fraction
+        self.min_file_bytes = min_file_bytes
+
+        self.state = "idle"  # idle, running, done, cancelled, failed
+        self.bytes_total = 0
+        self.bytes_done = 0
+        self.files_total = 0
+        self.files_done = 0
+        self.started_at = None
+        self.finished_at = None
+        self._cancel = threading.Event()
+        self._thread = None
+
+    @classmethod
+    def from_config(cls, config):
+        root = config.get("prewarm_dir") or os.path.dirname(config.get("game_path") or "")
+        max_gb = config.get("prewarm_max_gb")
+        return cls(
+            root,
+            extensions=tuple(config.get("prewarm_extensions") or DEFAULT_EXTENSIONS),
+            max_bytes_per_second=(config.get("prewarm_max_mb_per_second") or 0) * 1024 * 1024,
+            max_bytes=int(max_gb * 1024 ** 3) if max_gb else None,
+        )
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self.state = "running"
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="prewarm", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self, wait=False):
+        self._cancel.set()
+        if wait and self._thread is not None:
+            self._thread.join()
+
+    def byte_budget(self):
+        """Bytes worth reading: the configured cap, limited to a share of free RAM"""
+        budget = int(psutil.virtual_memory().available * self.ram_fraction)
+        if self.max_bytes:
+            budget = min(budget, self.max_bytes)
+        return budget
+
+    def plan(self):
+        """Files to read, cut off at the byte budget"""
+        budget = self.byte_budget()
+        selected = []
+        total = 0
+        for path, size in find_game_files(self.root, self.extensions, self.min_file_bytes):
+            if total + size > budget:
+                break
+            selected.append((path, size))
+            total += size
+        return selected
+
+    def _run(self):
+        lower_thread_priority()
+        try:
+            if not self.root or not os.path.isdir(self.root):
+                raise OSError(f"game directory not found: {self.root!r}")
+
+            files = self.plan()
+            self.files_total = len(files)
+            self.bytes_total = sum(size for _, size in files)
+            logger.info("Prewarm: reading %d file(s), %.1f GB from %s",
+                        self.files_total, self.bytes_total / 1024 ** 3, self.root)
+
+            buffer = bytearray(self.block_size)
+            view = memoryview(buffer)
+            for path, _ in files:
+                if self._cancel.is_set():
+                    break
+                self._read_file(path, view)
+                self.files_done += 1
+
+        except Exception as e:
+            self.state = "failed"
+            logger.warning("⚠ Prewarm failed: %s", e)
+            return
+        finally:
+            self.finished_at = time.monotonic()
+
+        elapsed = self.finished_at - self.started_at
+        if self._cancel.is_set():
+            self.state = "cancelled"
+            logger.info("Prewarm cancelled after %.1f GB", self.bytes_done / 1024 ** 3)
+        else:
+            self.state = "done"
+            metrics.observe("prewarm", elapsed)
+            logger.info("✓ Prewarm done: %.1f GB in %.0fs", self.bytes_done / 1024 ** 3, elapsed)
+
+    def _read_file(self, path, view):
+        try:
+            with open(path, "rb", buffering=0) as f:
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                while not self._cancel.is_set():
+                    block_start = time.monotonic()
+                    read = f.readinto(view)
+                    if not read:
+                        break
+                    self.bytes_done += read
+                    self._throttle(read, time.monotonic() - block_start)
+        except OSError as e:
+            logger.debug("Prewarm skipped %s: %s", path, e)
+
+    def _throttle(self, read, elapsed):
+        """Sleep so this block averages out to the bandwidth cap"""
+        if not self.max_bytes_per_second:
+            return
+        wait = read / self.max_bytes_per_second - elapsed
+        if wait > 0:
+            self._cancel.wait(wait)
+
+    def progress(self):
+        elapsed = ((self.finished_at or time.monotonic()) - self.started_at) if self.started_at else 0.0
+        return {
+            "state": self.state,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "bytes_done": self.bytes_done,
+            "bytes_total": self.bytes_total,
+            "fraction": self.bytes_done / self.bytes_total if self.bytes_total else 0.0,
+            "elapsed_seconds": round(elapsed, 1),
+        }
+
+    def status_text(self):
+        info = self.progress()
+        return (f"Prewarm: {info['state']} {info['fraction'] * 100:.0f}% "
+                f"({info['bytes_done'] / 1024 ** 3:.1f}/{info['bytes_total'] / 1024 ** 3:.1f} GB, "
+                f"{info['files_done']}/{info['files_total']} files)")
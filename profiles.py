@@ -0,0 +1,315 @@
+# ============================================================
+# File: profiles.py
+# ============================================================
+import os
+import re
+from collections import ChainMap
+from collections.abc import Mapping
+from datetime import datetime
+
+from config import Tracking, get_reset_start, get_next_reset, parse_hhmm
+from game_controller import GameController
+from launch_planner import LaunchPlanner, PatchTracker, login_estimate_seconds
+from log_manager import get_logger
+from login_model import LoginTimeModel
+from login_poller import LoginPoller
+from resource_sampler import ResourceSampler
+
+logger = get_logger(__name__)
+
+DEFAULT_PROFILE_NAME = "default"
+
+# Per-profile settings; anything else (and anything a profile leaves out) comes from the top-level config
+PROFILE_KEYS = (
+    "game_path",
+    "game_process_name",
+    "install_dir",
+    "auto_launch_time",
+    "reset_time",
+    "required_playtime_minutes",
+    "tracking_file",
+    "enabled",
+    "capture_backend",
+    "click_mode",
+    "click_verify_enabled",
+    "click_verify_timeout_seconds",
+    "click_verify_threshold",
+    "click_retry_count",
+    "idle_mode_enabled",
+    "idle_priority",
+    "idle_cpu_cores",
+    "idle_minimize",
+    "idle_power_throttling",
+    "idle_restore_on_focus",
+)
+
+
+def track_playtime(tracking, running, required_seconds, label=""):
+    """
+    One tick of playtime bookkeeping, shared by the main window and extra
+    profiles: marks a game started outside the launcher, updates playtime and
+    the daily requirement while it runs, and records the final playtime (and
+    an early close) once it stops. label prefixes the log lines, e.g. "[alt] ".
+    """
+    now = datetime.now()
+    if running:
+        if not tracking["game_started"]:
+            logger.info("%sGame process detected - marking as started", label)
+            tracking["game_started"] = True
+            tracking["start_time"] = now.isoformat()
+            tracking["launch_time"] = tracking["start_time"]
+            if not tracking["start_method"]:
+                tracking["start_method"] = "external"
+
+            tracking["game_closed_early"] = False
+            tracking["early_close_time"] = None
+            tracking.force_save()
+
+        if tracking["start_time"]:
+            elapsed = (now - datetime.fromisoformat(tracking["start_time"])).total_seconds()
+            tracking["total_playtime_seconds"] = int(elapsed)
+
+            if tracking["total_playtime_seconds"] >= required_seconds:
+                if not tracking["requirement_met"]:
+                    logger.info("%s✓ Daily requirement MET!", label)
+                    tracking["requirement_met"] = True
+                    tracking.force_save()
+
+            tracking["last_process_check"] = now.isoformat()
+            tracking.save()
+
+    elif tracking["game_started"] and tracking["start_time"]:
+        logger.info("%sGame process stopped", label)
+
+        final_playtime = int((now - datetime.fromisoformat(tracking["start_time"])).total_seconds())
+        tracking["total_playtime_seconds"] = final_playtime
+        logger.info("%sFinal playtime recorded: %ds (%dm)", label, final_playtime, final_playtime // 60)
+
+        tracking["start_time"] = None
+
+        if not tracking["requirement_met"] and tracking["total_playtime_seconds"] < required_seconds:
+            if not tracking["game_closed_early"]:
+                logger.warning("%s⚠ Game closed early without meeting requirement", label)
+                tracking["game_closed_early"] = True
+                tracking["early_close_time"] = now.isoformat()
+
+        tracking["last_process_check"] = now.isoformat()
+        tracking.force_save()
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_") or "profile"
+
+
+# Seconds to wait after the patcher's Exit was clicked before relaunching, by patcher_type
+PATCH_RELAUNCH_WAIT = {"update": 10, "network": 600}
+
+
+class Profile:
+    """
+    One account / game install. The top-level config is the "default" profile;
+    extra accounts are listed under config["profiles"]. A profile's own
+    settings are layered over the current config snapshot; rebase() swaps
+    in a new snapshot after the config file is reloaded.
+    """
+
+    def __init__(self, name, overrides, config=None):
+        self.name = name
+        self.overrides = overrides
+        self.rebase(config)
+
+    def rebase(self, config):
+        """Layer the overrides over `config` (a Config, or a plain dict)"""
+        base = getattr(config, "data", config)
+        self.data = ChainMap(self.overrides, base if base is not None else {})
+
+    @classmethod
+    def from_entry(cls, entry, config):
+        name = entry.get("name") or "profile"
+        overrides = {key: entry[key] for key in PROFILE_KEYS if key in entry}
+        overrides["enabled"] = entry.get("enabled", True)
+        overrides["tracking_file"] = entry.get("tracking_file") or f"ww_launcher_tracking_{_slug(name)}.json"
+        game_path = overrides.get("game_path") or config.get("game_path")
+        if not overrides.get("install_dir") and game_path:
+            overrides["install_dir"] = os.path.dirname(game_path)
+        return cls(name, overrides, config)
+
+    def get(self, key, default=None):
+        value = self.data.get(key)
+        return default if value is None else value
+
+    def __getitem__(self, key):
+        return self.data.get(key)
+
+
+def load_profiles(config):
+    """Extra account profiles from config["profiles"] (the default profile is the main window's)"""
+    profiles = []
+    seen = {DEFAULT_PROFILE_NAME}
+    for entry in config.get("profiles") or []:
+        if not isinstance(entry, Mapping):
+            logger.warning("⚠ Ignoring invalid profile entry: %r", entry)
+            continue
+        profile = Profile.from_entry(entry, config)
+        if profile.name in seen:
+            logger.warning("⚠ Duplicate profile name ignored: %s", profile.name)
+            continue
+        seen.add(profile.name)
+        if profile.get("enabled", True):
+            profiles.append(profile)
+    return profiles
+
+
+class ProfileRunner:
+    """
+    Daily state machine for one extra profile: period reset, playtime,
+    login click and launch requests. Launches go through the shared
+    LaunchScheduler so several accounts never start all at once.
+    """
+
+    def __init__(self, profile, config, scheduler, on_period_end=None, login_model=None, launch_planner=None):
+        self.profile = profile
+        self.config = config
+        self.scheduler = scheduler
+        self.tracking = Tracking(profile["tracking_file"], on_period_end=on_period_end)
+        # Reads through the profile, so top-level settings and reloads apply here too
+        self.game_controller = GameController(profile)
+        self.patch_tracker = PatchTracker(self.tracking)
+        self.running = False
+        self.login_model = login_model or LoginTimeModel.from_config(config)
+        self.login_poller = LoginPoller.from_config(profile, self.login_model)
+        self.launch_planner = launch_planner or LaunchPlanner.from_config(config)
+        self.resource_sampler = ResourceSampler.from_config(config)
+
+    @property
+    def key(self):
+        return self.profile.name
+
+    def check_and_reset_period(self):
+        period = get_reset_start(self.profile["reset_time"]).strftime("%Y-%m-%d")
+        if self.tracking["current_reset_period"] != period:
+            logger.info("[%s] New reset period: %s", self.key, period)
+            self.scheduler.cancel(self.key)
+            self.tracking.reset(period)
+
+    def required_seconds(self):
+        return (self.profile.get("required_playtime_minutes") or 30) * 60
+
+    def remaining_seconds(self):
+        return max(0, self.required_seconds() - (self.tracking["total_playtime_seconds"] or 0))
+
+    def update_playtime(self):
+        self.running = self.game_controller.is_game_running()
+        track_playtime(self.tracking, self.running, self.required_seconds(), f"[{self.key}] ")
+
+    def check_login(self):
+        """Same login schedule as the main profile, from this profile's own login model"""
+        if not self.running or self.tracking["login_clicked"] or not self.tracking["start_time"]:
+            return
+
+        # Extra profiles are polled on the 1 s tick, so a fast burst or click re-check runs at most once a second
+        since_start = (datetime.now() - datetime.fromisoformat(self.tracking["start_time"])).total_seconds()
+        self.login_poller.start(self.tracking["start_time"])
+        if not self.login_poller.due(since_start):
+            return
+
+        if not self.login_poller.clicking:
+            self.tracking["last_screenshot_check"] = datetime.now().isoformat()
+            self.tracking["ocr_attempts"] = (self.tracking["ocr_attempts"] or 0) + 1
+            self.tracking.save()
+        result = self.game_controller.click_login_screen(self.login_poller, since_start)
+        self.login_poller.record(result, self.game_controller.last_frame_signature)
+        if result == "clicked":
+            logger.info("[%s] ✓ Login clicked!", self.key)
+            self.tracking["login_clicked"] = True
+            self.tracking["login_click_time"] = datetime.now().isoformat()
+            ready_seconds = self.login_poller.ready_seconds or since_start
+            self.tracking["login_ready_seconds"] = round(ready_seconds, 1)
+            self.login_model.observe(ready_seconds)
+            self.tracking.force_save()
+
+    def check_patcher(self):
+        """Dismiss this profile's patcher notices and relaunch after the same waits as the main profile"""
+        status = self.game_controller.check_for_patcher()
+        patch_seconds = self.patch_tracker.observe(status, self.game_controller.last_notice_text)
+        if patch_seconds:
+            self.launch_planner.record_patch(patch_seconds)
+
+        if status in ("update_complete", "network_error"):
+            logger.info("[%s] %s - Exit clicked", self.key,
+                        "Update/Patch complete" if status == "update_complete" else "Network error")
+            self.tracking["patcher_exit_clicked"] = True
+            self.tracking["patcher_exit_time"] = datetime.now().isoformat()
+            self.tracking["patcher_type"] = "update" if status == "update_complete" else "network"
+            self.tracking["waiting_after_patch"] = True
+            if status == "update_complete":
+                self.tracking["patch_events"] = (self.tracking["patch_events"] or 0) + 1
+            self.tracking.force_save()
+
+        if self.tracking["waiting_after_patch"] and self.tracking["patcher_exit_time"]:
+            patcher_type = self.tracking["patcher_type"] or "update"
+            since_exit = (datetime.now() - datetime.fromisoformat(self.tracking["patcher_exit_time"])).total_seconds()
+            if since_exit >= PATCH_RELAUNCH_WAIT.get(patcher_type, 10):
+                self.tracking["waiting_after_patch"] = False
+                self.tracking["patcher_exit_clicked"] = False
+                self.tracking.save()
+                if not self.game_controller.is_game_running():
+                    logger.info("[%s] Relaunching after %s", self.key,
+                                "update" if patcher_type == "update" else "network error")
+                    self.launch(f"automatic_after_{'patch' if patcher_type == 'update' else 'network_error'}")
+
+    def wants_launch(self, now=None):
+        """True once the planned launch time is reached and today's requirement is still open"""
+        now = now or datetime.now()
+        if self.running or self.tracking["requirement_met"] or self.tracking["auto_launch_attempted"]:
+            return False
+        hour, minute = parse_hhmm(self.profile["auto_launch_time"])
+        next_reset = get_next_reset(self.profile["reset_time"], now)
+        launch_at = self.launch_planner.plan(
+            now.replace(hour=hour, minute=minute, second=0, microsecond=0), next_reset, self.remaining_seconds(),
+            login_estimate_seconds(self.login_model, self.config.get("login_wait_max_seconds", 90))
+        )
+        return launch_at <= now < next_reset
+
+    def launch(self, method="automatic"):
+        game_path = self.profile["game_path"]
+        if self.game_controller.launch_game(game_path):
+            self.tracking["game_started"] = True
+            self.tracking["start_time"] = datetime.now().isoformat()
+            self.tracking["launch_time"] = self.tracking["start_time"]
+            self.tracking["start_method"] = method
+            self.tracking["login_clicked"] = False
+            self.tracking["game_closed_early"] = False
+        self.tracking["auto_launch_attempted"] = True
+        self.tracking.force_save()
+
+    def tick(self):
+        """One update pass; queues a launch with the scheduler when due"""
+        self.check_and_reset_period()
+        self.check_patcher()
+        self.update_playtime()
+        summary = self.resource_sampler.tick(self.game_controller.game_process if self.running else None,
+                                             self.tracking["current_reset_period"])
+        if summary:
+            self.tracking["resource_summary"] = summary
+        self.check_login()
+        self.game_controller.update_idle_mode(self.running and self.tracking["login_clicked"]
+                                              and not self.tracking["requirement_met"])
+
+        if self.wants_launch() and not self.scheduler.is_pending(self.key):
+            self.scheduler.request(self.key, self.launch,
+                                   get_next_reset(self.profile["reset_time"]),
+                                   self.remaining_seconds())
+
+    def status_text(self):
+        minutes = (self.tracking["total_playtime_seconds"] or 0) // 60
+        required = self.profile.get("required_playtime_minutes") or 30
+        if self.tracking["requirement_met"]:
+            state = "✓"
+        elif self.running:
+            state = "⏱"
+        elif self.scheduler.is_pending(self.key):
+            state = "⏳"
+        else:
+            state = "⚠"
+        return f"{self.key} {state} {minutes}m/{required}m"
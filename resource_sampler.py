@@ -0,0 +1,261 @@
+# ============================================================
+# File: resource_sampler.py
+# ============================================================
+"""
+Resource usage of the running game: CPU, memory, disk I/O and handles,
+sampled every few seconds from the tick, for capacity planning when
+several instances share one machine.
+
+Samples live in fixed-size ring buffers backed by `array('d')` (one per
+field), so memory use is constant however long the game runs. Every
+`downsample_factor` samples are folded into one point of a second, coarse
+ring that covers a few hours. Whole-period statistics are kept as running
+aggregates and end up in the tracking file and the run history.
+"""
+import math
+import time
+from array import array
+
+import psutil
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+# Field name -> how a downsampled point combines its samples
+FIELDS = {
+    "cpu_percent": "mean",
+    "rss_mb": "max",
+    "read_mb_s": "mean",
+    "write_mb_s": "mean",
+    "handles": "max",
+    "threads": "max",
+}
+
+_SPARK = "▁▂▃▄▅▆▇█"
+
+
+class RingSeries:
+    """Fixed-capacity time series: one array('d') per field plus timestamps"""
+
+    def __init__(self, capacity, fields=tuple(FIELDS)):
+        self.capacity = capacity
+        self.fields = tuple(fields)
+        self.times = array("d", [math.nan]) * capacity
+        self.columns = {field: array("d", [math.nan]) * capacity for field in self.fields}
+        self.index = 0
+        self.count = 0
+
+    def append(self, timestamp, values):
+        position = self.index
+        self.times[position] = timestamp
+        for field in self.fields:
+            value = values.get(field)
+            self.columns[field][position] = math.nan if value is None else value
+        self.index = (position + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def values(self, field, last=None):
+        """Values of one field, oldest first (the last `last` only, if given)"""
+        count = self.count if last is None else min(last, self.count)
+        start = (self.index - count) % self.capacity
+        column = self.columns[field]
+        if start + count <= self.capacity:
+            return column[start:start + count].tolist()
+        return (column[start:] + column[:(start + count) % self.capacity]).tolist()
+
+    def latest(self, field):
+        if not self.count:
+            return None
+        value = self.columns[field][(self.index - 1) % self.capacity]
+        return None if math.isnan(value) else value
+
+    @property
+    def nbytes(self):
+        return self.times.itemsize * self.capacity * (1 + len(self.fields))
+
+
+class PeriodStats:
+    """Running mean/max per field over one reset period"""
+
+    def __init__(self):
+        self.samples = 0
+        self.sums = dict.fromkeys(FIELDS, 0.0)
+        self.counts = dict.fromkeys(FIELDS, 0)
+        self.maxima = dict.fromkeys(FIELDS)
+        self.read_mb = 0.0
+        self.write_mb = 0.0
+
+    def add(self, values, read_mb=0.0, write_mb=0.0):
+        self.samples += 1
+        for field in FIELDS:
+            value = values.get(field)
+            if value is None:
+                continue
+            self.sums[field] += value
+            self.counts[field] += 1
+            if self.maxima[field] is None or value > self.maxima[field]:
+                self.maxima[field] = value
+        self.read_mb += read_mb
+        self.write_mb += write_mb
+
+    def summary(self):
+        def mean(field):
+            return round(self.sums[field] / self.counts[field], 1) if self.counts[field] else None
+
+        def peak(field):
+            return round(self.maxima[field], 1) if self.maxima[field] is not None else None
+
+        return {
+            "samples": self.samples,
+            "cpu_mean_percent": mean("cpu_percent"),
+            "cpu_max_percent": peak("cpu_percent"),
+            "rss_mean_mb": mean("rss_mb"),
+            "rss_max_mb": peak("rss_mb"),
+            "read_mb": round(self.read_mb, 1),
+            "write_mb": round(self.write_mb, 1),
+            "handles_max": peak("handles"),
+            "threads_max": peak("threads"),
+        }
+
+
+class ResourceSampler:
+    """Samples one game process from the tick into recent and downsampled rings"""
+
+    def __init__(self, interval_seconds=5, capacity=360, downsample_factor=12, coarse_capacity=288,
+                 enabled=True):
+        self.interval_seconds = interval_seconds
+        self.downsample_factor = max(1, downsample_factor)
+        self.enabled = enabled
+        self.recent = RingSeries(capacity)
+        self.coarse = RingSeries(coarse_capacity)
+        self.period = None
+        self.stats = PeriodStats()
+
+        self._proc = None
+        self._last_sample = None  # (monotonic time, read bytes, write bytes)
+        self._bucket = []
+        self._io_delta = (0.0, 0.0)  # MB read/written since the previous sample
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            interval_seconds=config.get("resource_sample_seconds", 5),
+            capacity=config.get("resource_history_samples", 360),
+            downsample_factor=config.get("resource_downsample_factor", 12),
+            enabled=config.get("resource_sampler_enabled", True),
+        )
+
+    def tick(self, proc, period):
+        """
+        Sample `proc` (the running game, or None) if the interval has passed.
+        Returns the period summary after a sample, else None.
+        """
+        if not self.enabled:
+            return None
+
+        if period != self.period:
+            self.period = period
+            self.stats = PeriodStats()
+
+        if proc is None:
+            self._proc = None
+            self._last_sample = None
+            return None
+
+        now = time.monotonic()
+        if self._proc is not None and self._proc.pid == proc.pid:
+            if self._last_sample and now - self._last_sample[0] < self.interval_seconds:
+                return None
+        else:
+            # Pin a Process object: cpu_percent() measures since the previous call on the same object
+            try:
+                self._proc = psutil.Process(proc.pid)
+            except psutil.NoSuchProcess:
+                self._proc = None
+                return None
+            self._last_sample = None
+
+        values = self.read(now)
+        if values is None:
+            return None
+        self.add(time.time(), values)
+        return self.stats.summary()
+
+    def read(self, now):
+        """One sample of the pinned process, or None if it has gone"""
+        proc = self._proc
+        try:
+            with proc.oneshot():
+                values = {
+                    "cpu_percent": proc.cpu_percent(),
+                    "rss_mb": proc.memory_info().rss / (1024 * 1024),
+                    "threads": proc.num_threads(),
+                    "handles": proc.num_handles() if hasattr(proc, "num_handles") else proc.num_fds(),
+                }
+                try:
+                    io = proc.io_counters()
+                except (psutil.AccessDenied, AttributeError):
+                    io = None
+        except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
+            logger.debug("Resource sample failed: %s", e)
+            self._proc = None
+            return None
+
+        previous = self._last_sample
+        self._io_delta = (0.0, 0.0)
+        if io is not None:
+            if previous and previous[1] is not None and now > previous[0]:
+                elapsed = now - previous[0]
+                self._io_delta = ((io.read_bytes - previous[1]) / (1024 * 1024),
+                                  (io.write_bytes - previous[2]) / (1024 * 1024))
+                values["read_mb_s"] = self._io_delta[0] / elapsed
+                values["write_mb_s"] = self._io_delta[1] / elapsed
+            self._last_sample = (now, io.read_bytes, io.write_bytes)
+        else:
+            self._last_sample = (now, None, None)
+
+        if previous is None:
+            # The first cpu_percent() of a pinned process is always 0.0
+            values["cpu_percent"] = None
+        return values
+
+    def add(self, timestamp, values):
+        self.recent.append(timestamp, values)
+        self.stats.add(values, *self._io_delta)
+
+        self._bucket.append((timestamp, values))
+        if len(self._bucket) >= self.downsample_factor:
+            self.coarse.append(self._bucket[-1][0], self.combine(self._bucket))
+            self._bucket = []
+
+    @staticmethod
+    def combine(samples):
+        combined = {}
+        for field, how in FIELDS.items():
+            points = [values[field] for _, values in samples if values.get(field) is not None]
+            if points:
+                combined[field] = sum(points) / len(points) if how == "mean" else max(points)
+        return combined
+
+    def sparkline(self, field="cpu_percent", width=24):
+        """Coarse history (then recent samples) of one field as block characters"""
+        points = self.coarse.values(field, width) if self.coarse.count >= 2 else self.recent.values(field, width)
+        points = [p for p in points if not math.isnan(p)]
+        if not points:
+            return ""
+        top = max(points) or 1.0
+        return "".join(_SPARK[min(len(_SPARK) - 1, int(p / top * (len(_SPARK) - 1)))] for p in points)
+
+    def status_text(self):
+        """Diagnostics line for the latest sample and the period so far"""
+        if not self.recent.count or self._proc is None:
+            return None
+        summary = self.stats.summary()
+        cpu = self.recent.latest("cpu_percent")
+        rss = self.recent.latest("rss_mb")
+        return (f"Game: CPU {cpu or 0:.0f}% (avg {summary['cpu_mean_percent'] or 0:.0f}, "
+                f"max {summary['cpu_max_percent'] or 0:.0f}) {self.sparkline()}\n"
+                f"      RSS {rss or 0:.0f} MB (max {summary['rss_max_mb'] or 0:.0f}), "
+                f"IO {summary['read_mb']:.0f}/{summary['write_mb']:.0f} MB r/w, "
+                f"handles {self.recent.latest('handles') or 0:.0f}")
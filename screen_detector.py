@@ -3,6 +3,7 @@
 # ============================================================
 import sys
 import os
+import ctypes
 from pathlib import Path
 
 import numpy as np
@@ -74,14 +75,13 @@ except Exception as e:
     import traceback
     traceback.print_exc()
 
-# Import debug print from config
-try:
-    from config import debug_print
-except ImportError:
-    def debug_print(msg, data=None):
-        print(msg)
-        if data:
-            print(data)
+from frame_pool import FrameBufferPool, pooled_buffer
+from log_manager import get_logger
+from metrics import metrics
+from ocr_preprocess import RoiPreprocessor
+from ocr_profiles import get_ocr_profile
+
+logger = get_logger(__name__)
 
 # Try to import win32 modules
 try:
@@ -89,26 +89,55 @@ try:
     import win32ui
     import win32con
     import win32api
+    import win32process
 
     WIN32_AVAILABLE = True
-    debug_print("✓ win32 modules loaded")
+    logger.debug("✓ win32 modules loaded")
 except ImportError:
     WIN32_AVAILABLE = False
-    debug_print("✗ win32 modules not available - some features disabled")
+    logger.warning("✗ win32 modules not available - some features disabled")
+
+# capture_backend values: "screen" grabs the desktop area (window must be uncovered),
+# "window" renders the window's client area via PrintWindow (works behind other windows)
+CAPTURE_BACKENDS = ("screen", "window")
+
+PW_CLIENTONLY = 0x1
+PW_RENDERFULLCONTENT = 0x2
 
 
 class ScreenDetector:
     """Detects game elements by actually capturing and analyzing the screen"""
 
-    def __init__(self):
-        self.last_screenshot = None
+    def __init__(self, use_buffer_pool=False, capture_backend="screen", thumbnail_width=320, memory_budget_mb=32):
+        if capture_backend not in CAPTURE_BACKENDS:
+            logger.warning("⚠ Unknown capture_backend %r, using 'screen'", capture_backend)
+            capture_backend = "screen"
+        self.capture_backend = capture_backend
+        self._window_capture_failed = False
+        # Full frames are released after analysis (release_frame); only a
+        # downscaled thumbnail of the last one is kept (thumbnail_width 0 = none)
+        self.thumbnail_width = thumbnail_width
+        self.memory_budget_bytes = int(memory_budget_mb * 1024 * 1024)
+        self.last_thumbnail = None
         self.last_screenshot_time = None
-        debug_print("ScreenDetector initialized")
-
-    def find_game_window(self):
-        """Find the game window and return its handle and dimensions"""
+        self.last_frame_size = None
+        # ROI rectangles and resize/threshold parameters, cached per window size
+        self.preprocessor = RoiPreprocessor()
+        # Reused grayscale/resize/threshold buffers (None = let OpenCV allocate each time).
+        # Off by default: the allocator already recycles these between checks, so
+        # the pool saves Python-level churn but not page faults or peak RSS.
+        self.buffers = FrameBufferPool() if use_buffer_pool else None
+        logger.debug("ScreenDetector initialized")
+
+    def find_game_window(self, pid=None, include_minimized=False):
+        """
+        Find the game window and return its handle and dimensions.
+        If pid is given, only windows owned by that process are considered
+        (used when several game instances run at once). A minimized game
+        window is only returned with include_minimized (marked "minimized").
+        """
         if not WIN32_AVAILABLE:
-            debug_print("✗ Cannot find window - win32gui not available")
+            logger.debug("✗ Cannot find window - win32gui not available")
             return None
 
         try:
@@ -120,12 +149,17 @@ class ScreenDetector:
                 return True
 
             windows = []
-            win32gui.EnumWindows(enum_windows_callback, windows)
+            with metrics.span("window_enum"):
+                win32gui.EnumWindows(enum_windows_callback, windows)
 
-            debug_print(f"Scanning {len(windows)} visible windows...")
+            logger.debug("Scanning %d visible windows...", len(windows))
 
             # Look for game window
+            minimized = None
             for hwnd, title in windows:
+                if pid is not None and win32process.GetWindowThreadProcessId(hwnd)[1] != pid:
+                    continue
+
                 title_lower = title.lower()
                 # Check for Wuthering Waves related keywords
                 keywords = ["wuthering", "kuro", "client", "鸣潮", "waves"]
@@ -138,12 +172,8 @@ class ScreenDetector:
 
                         # Check if window is reasonably sized (not minimized)
                         if width > 800 and height > 600:
-                            debug_print(f"✓ Found game window: '{title}'", {
-                                "hwnd": hwnd,
-                                "width": width,
-                                "height": height,
-                                "position": (rect[0], rect[1])
-                            })
+                            logger.debug("✓ Found game window: '%s' (hwnd=%s, %dx%d at %s)",
+                                         title, hwnd, width, height, (rect[0], rect[1]))
                             return {
                                 "hwnd": hwnd,
                                 "title": title,
@@ -151,21 +181,44 @@ class ScreenDetector:
                                 "width": width,
                                 "height": height
                             }
+                        if include_minimized and minimized is None and win32gui.IsIconic(hwnd):
+                            minimized = {
+                                "hwnd": hwnd,
+                                "title": title,
+                                "rect": rect,
+                                "width": width,
+                                "height": height,
+                                "minimized": True
+                            }
                     except Exception as e:
-                        debug_print(f"✗ Error checking window '{title}': {e}")
+                        logger.warning("✗ Error checking window '%s': %s", title, e)
                         continue
 
-            debug_print("✗ Game window not found")
+            if minimized is not None:
+                logger.debug("Game window is minimized: '%s' (hwnd=%s)", minimized["title"], minimized["hwnd"])
+                return minimized
+
+            logger.debug("✗ Game window not found")
             return None
 
         except Exception as e:
-            debug_print(f"✗ Error finding game window: {e}")
+            logger.error("✗ Error finding game window: %s", e)
             return None
 
-    def capture_window(self, window_info):
-        """Capture screenshot of the game window"""
+    @property
+    def background_capture_available(self):
+        """Whether the "window" backend can be tried (win32 present, no black frames seen)"""
+        return WIN32_AVAILABLE and not self._window_capture_failed
+
+    def capture_window(self, window_info, backend=None, screen_fallback=True):
+        """
+        Capture screenshot of the game window. backend overrides the
+        configured capture_backend for this call; screen_fallback=False
+        returns None instead of grabbing the desktop when the window
+        backend fails (the window is known to be covered or off-screen).
+        """
         if not window_info:
-            debug_print("✗ Cannot capture - no window info")
+            logger.warning("✗ Cannot capture - no window info")
             return None
 
         try:
@@ -177,131 +230,262 @@ class ScreenDetector:
 
             # Capture the screen area
             try:
-                screenshot = ImageGrab.grab(bbox=(left, top, right, bottom))
+                with metrics.span("capture"):
+                    screenshot = None
+                    if (backend or self.capture_backend) == "window" and WIN32_AVAILABLE:
+                        screenshot = self.capture_window_background(hwnd)
+                    # Tells send_click whether frame coordinates are client or window-relative
+                    window_info["client_area"] = screenshot is not None
+                    if screenshot is None:
+                        if not screen_fallback:
+                            logger.debug("✗ Background capture failed and the screen can't be used")
+                            return None
+                        screenshot = ImageGrab.grab(bbox=(left, top, right, bottom))
 
-                self.last_screenshot = screenshot
                 self.last_screenshot_time = datetime.now()
+                self.last_frame_size = screenshot.size
 
-                debug_print(f"✓ Screenshot captured: {screenshot.size[0]}x{screenshot.size[1]}")
+                logger.debug("✓ Screenshot captured: %dx%d", screenshot.size[0], screenshot.size[1])
                 return screenshot
             except Exception as e:
-                debug_print(f"✗ ImageGrab failed: {e}")
+                logger.error("✗ ImageGrab failed: %s", e)
+                return None
+
+        except Exception as e:
+            logger.error("✗ Error capturing window: %s", e)
+            return None
+
+    def capture_window_background(self, hwnd):
+        """
+        Render the window's client area with PrintWindow (BitBlt from the
+        client DC as a fallback). Works while the game is covered by other
+        windows; image coordinates are client coordinates, as posted clicks use.
+        Returns None if nothing usable was captured (e.g. minimized window).
+        """
+        hwnd_dc = mfc_dc = save_dc = bitmap = None
+        try:
+            left, top, right, bottom = win32gui.GetClientRect(hwnd)
+            width, height = right - left, bottom - top
+            if width <= 0 or height <= 0:
+                return None
+
+            hwnd_dc = win32gui.GetDC(hwnd)
+            mfc_dc = win32ui.CreateDCFromHandle(hwnd_dc)
+            save_dc = mfc_dc.CreateCompatibleDC()
+            bitmap = win32ui.CreateBitmap()
+            bitmap.CreateCompatibleBitmap(mfc_dc, width, height)
+            save_dc.SelectObject(bitmap)
+
+            printed = ctypes.windll.user32.PrintWindow(hwnd, save_dc.GetSafeHdc(),
+                                                       PW_CLIENTONLY | PW_RENDERFULLCONTENT)
+            if not printed:
+                save_dc.BitBlt((0, 0), (width, height), mfc_dc, (0, 0), win32con.SRCCOPY)
+
+            bits = bitmap.GetBitmapBits(True)
+            screenshot = Image.frombuffer("RGB", (width, height), bits, "raw", "BGRX", 0, 1)
+
+            # Some renderers leave the bitmap black when drawn off-screen
+            if all(high == 0 for _, high in screenshot.getextrema()):
+                if not self._window_capture_failed:
+                    logger.warning("⚠ Window capture returned a black frame - falling back to screen capture")
+                    self._window_capture_failed = True
                 return None
+            return screenshot
 
         except Exception as e:
-            debug_print(f"✗ Error capturing window: {e}")
+            logger.debug("Window capture failed: %s", e)
             return None
+        finally:
+            if bitmap is not None:
+                win32gui.DeleteObject(bitmap.GetHandle())
+            if save_dc is not None:
+                save_dc.DeleteDC()
+            if mfc_dc is not None:
+                mfc_dc.DeleteDC()
+            if hwnd_dc is not None:
+                win32gui.ReleaseDC(hwnd, hwnd_dc)
+
+    def release_frame(self, screenshot, keep_thumbnail=True):
+        """
+        Free an analysed frame's full-resolution pixels. With keep_thumbnail,
+        a downscaled copy is kept as last_thumbnail first. Then retained memory
+        is brought back under the budget (see enforce_memory_budget).
+        """
+        if screenshot is None:
+            return
+        if isinstance(screenshot, Image.Image):
+            if keep_thumbnail and self.thumbnail_width:
+                try:
+                    self.last_thumbnail = screenshot.reduce(max(1, screenshot.size[0] // self.thumbnail_width))
+                except Exception as e:
+                    logger.debug("Thumbnail failed: %s", e)
+            screenshot.close()
+        self.enforce_memory_budget()
+
+    @property
+    def thumbnail_bytes(self):
+        thumbnail = self.last_thumbnail
+        return thumbnail.size[0] * thumbnail.size[1] * len(thumbnail.getbands()) if thumbnail else 0
+
+    @property
+    def pool_bytes(self):
+        """Steady-state size of the buffer pool (one window size's intermediates)"""
+        return self.buffers.nbytes if self.buffers is not None else 0
+
+    @property
+    def retained_bytes(self):
+        """Memory held between checks: the thumbnail plus the buffer pool"""
+        return self.thumbnail_bytes + self.pool_bytes
+
+    def enforce_memory_budget(self):
+        """
+        Bring retained memory under memory_budget_bytes. The pool is refilled
+        by the very next check, so the thumbnail goes first; a pool that is
+        over the budget on its own is turned off rather than cleared and
+        refilled every check.
+        """
+        if self.retained_bytes <= self.memory_budget_bytes:
+            return
+        self.last_thumbnail = None
+        if self.pool_bytes > self.memory_budget_bytes:
+            logger.warning("⚠ Frame buffers need %.1f MB, over frame_memory_budget_mb - buffer pool turned off",
+                           self.pool_bytes / (1024 * 1024))
+            self.buffers = None
+
+    def memory_status_text(self):
+        """Diagnostics line for the frame memory kept between checks"""
+        thumbnail = self.last_thumbnail
+        text = (f"Frames: {self.retained_bytes / (1024 * 1024):.1f} MB kept "
+                f"(budget {self.memory_budget_bytes / (1024 * 1024):g} MB), "
+                f"thumbnail {'%dx%d' % thumbnail.size if thumbnail else 'none'}")
+        if self.buffers is not None:
+            text += f", buffers {self.pool_bytes / (1024 * 1024):.1f} MB"
+        return text
+
+    def decode_frame(self, screenshot):
+        """
+        RGB numpy array of a screenshot. Arrays are returned as-is, so a frame
+        decoded once can be handed to every detector without another copy.
+        """
+        if screenshot is None or isinstance(screenshot, np.ndarray):
+            return screenshot
+        with metrics.span("numpy_convert"):
+            return np.asarray(screenshot)
+
+    def text_density(self, img_np, rect, threshold, name):
+        """Fraction of ROI pixels brighter than threshold (grayscale of the ROI view only)"""
+        left, top, right, bottom = rect
+        roi = img_np[top:bottom, left:right]
+        gray = cv2.cvtColor(roi, cv2.COLOR_RGB2GRAY,
+                            dst=pooled_buffer(self.buffers, "gray", roi.shape[:2]))
+        _, thresh = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY,
+                                  dst=pooled_buffer(self.buffers, "binary", gray.shape))
+        return cv2.countNonZero(thresh) / thresh.size
 
     def detect_login_ready(self, screenshot):
         """
         Step 1: Check if "Login Status: 0" is visible (key indicator)
         Uses OCR to actually read the text
+        Accepts a PIL screenshot or an already decoded frame (see decode_frame)
         Returns: (detected: bool, text_found: str)
         """
         if screenshot is None:
             return False, ""
 
         try:
-            img_np = np.array(screenshot)
+            img_np = self.decode_frame(screenshot)
             height, width = img_np.shape[:2]
 
-            # Extract bottom-right region where "Login Status: 0" appears
-            bottom_right_region = img_np[int(height * 0.9):height, int(width * 0.75):width]
+            # Bottom-right region where "Login Status: 0" appears
+            left, top, right, bottom = self.preprocessor.roi_rect("login_status", width, height)
 
             if OCR_AVAILABLE:
                 # Use OCR to read text
                 try:
-                    pil_region = Image.fromarray(bottom_right_region)
-                    text = pytesseract.image_to_string(pil_region, config='--psm 6')
+                    with metrics.span("preprocess.login_status"):
+                        region = self.preprocessor.preprocess(img_np, "login_status", self.buffers)
+                    pil_region = Image.fromarray(region)
+                    with metrics.span("ocr.login_status"):
+                        text = pytesseract.image_to_string(pil_region, config=get_ocr_profile("login_status").config)
                     text_clean = text.strip()
 
-                    debug_print("OCR: Bottom-right region text", text_clean[:50] if text_clean else "")
+                    logger.debug("OCR: Bottom-right region text: %r", text_clean[:50])
                 except Exception as ocr_error:
-                    debug_print(f"✗ OCR failed: {ocr_error}")
+                    logger.error("✗ OCR failed: %s", ocr_error)
                     return False, f"OCR Error: {ocr_error}"
 
                 # Check if "login status" and "0" are present
                 text_lower = text_clean.lower()
                 if "login" in text_lower and "status" in text_lower and "0" in text_lower:
-                    debug_print("✓ 'Login Status: 0' detected!")
+                    logger.info("✓ 'Login Status: 0' detected!")
                     return True, text_clean
 
                 return False, text_clean
             else:
                 # Fallback: pixel-based detection (less reliable)
-                gray = cv2.cvtColor(cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR), cv2.COLOR_BGR2GRAY)
-                bottom_right_gray = gray[int(height * 0.9):height, int(width * 0.75):width]
-
-                _, text_thresh = cv2.threshold(bottom_right_gray, 150, 255, cv2.THRESH_BINARY)
-                text_pixels = np.sum(text_thresh == 255)
-                text_density = text_pixels / (bottom_right_gray.shape[0] * bottom_right_gray.shape[1])
+                text_density = self.text_density(img_np, (left, top, right, bottom), 150, "login_status")
 
                 if text_density > 0.02:
-                    debug_print("✓ Text detected in bottom-right")
+                    logger.info("✓ Text detected in bottom-right")
                     return True, f"[No OCR - density: {text_density:.3f}]"
 
                 return False, f"[No OCR - density: {text_density:.3f}]"
 
         except Exception as e:
-            debug_print(f"✗ Error checking login status: {e}")
+            logger.error("✗ Error checking login status: %s", e)
             return False, ""
 
     def detect_tap_to_land_text(self, screenshot):
         """
         Step 2: Check if "Tap to land in Solaris-3" text is visible
         Uses OCR to actually read the text
+        Accepts a PIL screenshot or an already decoded frame (see decode_frame)
         Returns: (detected: bool, text_found: str)
         """
         if screenshot is None:
             return False, ""
 
         try:
-            img_np = np.array(screenshot)
+            img_np = self.decode_frame(screenshot)
             height, width = img_np.shape[:2]
 
             # Focus on lower center where the text appears
-            lower_center_y = int(height * 0.65)
-            center_x_start = int(width * 0.25)
-            center_x_end = int(width * 0.75)
-
-            roi = img_np[lower_center_y:height, center_x_start:center_x_end]
+            left, top, right, bottom = self.preprocessor.roi_rect("tap_to_land", width, height)
 
             if OCR_AVAILABLE:
                 # Use OCR to read text
                 try:
-                    pil_region = Image.fromarray(roi)
-                    text = pytesseract.image_to_string(pil_region, config='--psm 6')
+                    with metrics.span("preprocess.tap_to_land"):
+                        region = self.preprocessor.preprocess(img_np, "tap_to_land", self.buffers)
+                    pil_region = Image.fromarray(region)
+                    with metrics.span("ocr.tap_to_land"):
+                        text = pytesseract.image_to_string(pil_region, config=get_ocr_profile("tap_to_land").config)
                     text_clean = text.strip()
 
-                    debug_print("OCR: Center-bottom text", text_clean[:50] if text_clean else "")
+                    logger.debug("OCR: Center-bottom text: %r", text_clean[:50])
                 except Exception as ocr_error:
-                    debug_print(f"✗ OCR failed: {ocr_error}")
+                    logger.error("✗ OCR failed: %s", ocr_error)
                     return False, f"OCR Error: {ocr_error}"
 
                 # Check if "tap" and "land" and "solaris" are present
                 text_lower = text_clean.lower()
                 if "tap" in text_lower and "land" in text_lower and "solaris" in text_lower:
-                    debug_print("✓ 'Tap to land in Solaris-3' detected!")
+                    logger.info("✓ 'Tap to land in Solaris-3' detected!")
                     return True, text_clean
 
                 return False, text_clean
             else:
                 # Fallback: pixel-based detection (less reliable)
-                gray = cv2.cvtColor(cv2.cvtColor(img_np, cv2.COLOR_RGB2BGR), cv2.COLOR_BGR2GRAY)
-                roi_gray = gray[lower_center_y:height, center_x_start:center_x_end]
-
-                _, thresh = cv2.threshold(roi_gray, 180, 255, cv2.THRESH_BINARY)
-                text_pixels = np.sum(thresh == 255)
-                text_density = text_pixels / (roi_gray.shape[0] * roi_gray.shape[1])
+                text_density = self.text_density(img_np, (left, top, right, bottom), 180, "tap_to_land")
 
                 if text_density > 0.03:
-                    debug_print("✓ Text detected in center")
+                    logger.info("✓ Text detected in center")
                     return True, f"[No OCR - density: {text_density:.3f}]"
 
                 return False, f"[No OCR - density: {text_density:.3f}]"
 
         except Exception as e:
-            debug_print(f"✗ Error checking tap to land text: {e}")
+            logger.error("✗ Error checking tap to land text: %s", e)
             return False, ""
 
     def get_click_position(self, screenshot):
@@ -313,30 +497,75 @@ class ScreenDetector:
             return None, None
 
         try:
-            width, height = screenshot.size
+            if isinstance(screenshot, np.ndarray):
+                height, width = screenshot.shape[:2]
+            else:
+                width, height = screenshot.size
 
             # Click in upper-left empty area to avoid buttons
             click_x = int(width * 0.35)
             click_y = int(height * 0.45)
 
-            debug_print(f"Click position: ({click_x}, {click_y})")
+            logger.debug("Click position: (%d, %d)", click_x, click_y)
             return click_x, click_y
 
         except Exception as e:
-            debug_print(f"✗ Error calculating click position: {e}")
+            logger.error("✗ Error calculating click position: %s", e)
             return None, None
 
+    def read_text(self, screenshot, profile_name):
+        """OCR a whole screenshot with a named OCR profile; None when OCR is unavailable or fails"""
+        if screenshot is None or not OCR_AVAILABLE:
+            return None
+        try:
+            with metrics.span(f"ocr.{profile_name}"):
+                return pytesseract.image_to_string(screenshot, config=get_ocr_profile(profile_name).config).strip()
+        except Exception as e:
+            logger.error("✗ OCR failed: %s", e)
+            return None
+
+    def roi_density(self, screenshot, roi_name, threshold=180):
+        """text_density of a named ROI in a screenshot or decoded frame"""
+        try:
+            img_np = self.decode_frame(screenshot)
+            height, width = img_np.shape[:2]
+            rect = self.preprocessor.roi_rect(roi_name, width, height)
+            return self.text_density(img_np, rect, threshold, roi_name)
+        except Exception as e:
+            logger.debug("ROI density failed: %s", e)
+            return None
+
+    def roi_signature(self, screenshot, roi_name, size=(32, 8)):
+        """Tiny grayscale thumbnail (bytes) of one ROI, e.g. to see if the login text went away"""
+        try:
+            img_np = self.decode_frame(screenshot)
+            roi = self.preprocessor.crop(img_np, roi_name)
+            gray = cv2.cvtColor(roi, cv2.COLOR_RGB2GRAY,
+                                dst=pooled_buffer(self.buffers, "gray", roi.shape[:2]))
+            return cv2.resize(gray, size, interpolation=cv2.INTER_AREA).tobytes()
+        except Exception as e:
+            logger.debug("ROI signature failed: %s", e)
+            return None
+
+    def frame_signature(self, screenshot, size=(16, 9)):
+        """Tiny grayscale thumbnail (bytes) for cheap "did the screen change" checks"""
+        try:
+            return screenshot.convert("L").resize(size, Image.BILINEAR).tobytes()
+        except Exception as e:
+            logger.debug("Frame signature failed: %s", e)
+            return None
+
     def save_debug_screenshot(self, screenshot, filename="debug_screenshot.png"):
         """Save screenshot for debugging"""
         try:
             if screenshot:
                 abs_path = os.path.abspath(filename)
                 screenshot.save(abs_path)
-                debug_print(f"✓ Debug screenshot saved: {abs_path}")
+                logger.debug("✓ Debug screenshot saved: %s", abs_path)
                 return abs_path
             else:
-                debug_print("✗ No screenshot to save")
+                logger.warning("✗ No screenshot to save")
                 return None
         except Exception as e:
-            debug_print(f"✗ Error saving debug screenshot: {e}")
+            logger.error("✗ Error saving debug screenshot: %s", e)
             return None
\ No newline at end of file
@@ -0,0 +1,142 @@
+# ============================================================
+# File: single_instance.py
+# ============================================================
+"""
+Single-instance guard and command hand-off.
+
+The first launcher takes a lock file and listens on a local socket
+(QLocalServer: a named pipe on Windows, a Unix socket elsewhere). A second
+start finds the lock taken, sends its command-line intent to the running
+instance and exits instead of starting a second automation loop:
+
+    python main.py --show          # bring the running launcher to the front (default)
+    python main.py --launch-now    # start the game now
+    python main.py --reset         # reset today's progress
+    python main.py --status        # print the running launcher's status as JSON
+
+Lock and socket names include a hash of the working folder, so separate
+installs (with their own tracking files) don't block each other. A lock
+left behind by a crashed launcher is detected by its PID and taken over.
+"""
+import hashlib
+import json
+import os
+
+from PySide6.QtCore import QDir, QLockFile, QObject
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+COMMANDS = ("show", "launch_now", "reset", "status")
+REPLY_TIMEOUT_MS = 3000
+
+
+def instance_key(folder=None):
+    """Per-install name for the lock file and the socket"""
+    folder = os.path.normcase(os.path.abspath(folder or os.getcwd()))
+    return "wwlauncher-" + hashlib.sha1(folder.encode("utf-8")).hexdigest()[:12]
+
+
+class InstanceLock:
+    """Lock file held for the life of the running launcher"""
+
+    def __init__(self, key=None):
+        self.key = key or instance_key()
+        self.path = os.path.join(QDir.tempPath(), f"{self.key}.lock")
+        self._lock = QLockFile(self.path)
+        # 0: never treat a held lock as stale by age, only when its owner PID is gone
+        self._lock.setStaleLockTime(0)
+
+    def acquire(self):
+        """False if another launcher holds the lock (a crashed owner's lock is taken over)"""
+        return self._lock.tryLock(100)
+
+    def release(self):
+        self._lock.unlock()
+
+
+def send_command(command, key=None, timeout_ms=REPLY_TIMEOUT_MS):
+    """Send one command to the running instance; its reply dict, or None if it did not answer"""
+    socket = QLocalSocket()
+    socket.connectToServer(key or instance_key())
+    if not socket.waitForConnected(timeout_ms):
+        logger.debug("Could not connect to running launcher: %s", socket.errorString())
+        return None
+
+    socket.write((json.dumps({"command": command}) + "\n").encode("utf-8"))
+    socket.flush()
+
+    data = b""
+    while not data.endswith(b"\n"):
+        if not socket.waitForReadyRead(timeout_ms):
+            break
+        data += bytes(socket.readAll())
+    socket.disconnectFromServer()
+
+    try:
+        return json.loads(data.decode("utf-8")) if data else None
+    except ValueError:
+        return None
+
+
+class CommandServer(QObject):
+    """
+    Local socket server for commands from later launches. handler(command)
+    runs on the GUI thread and returns a JSON-serialisable reply dict.
+    """
+
+    def __init__(self, handler, key=None, parent=None):
+        super().__init__(parent)
+        self.handler = handler
+        self.key = key or instance_key()
+        self._server = QLocalServer(self)
+        self._server.setSocketOptions(QLocalServer.UserAccessOption)
+        self._server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def start(self):
+        # Only reached while holding the instance lock, so a leftover socket is from a crashed run
+        QLocalServer.removeServer(self.key)
+        if not self._server.listen(self.key):
+            logger.error("✗ Could not listen for launcher commands: %s", self._server.errorString())
+        return self
+
+    def stop(self):
+        self._server.close()
+
+    def _on_new_connection(self):
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._forget(s))
+
+    def _forget(self, socket):
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
+
+    def _on_ready_read(self, socket):
+        self._buffers[socket] = self._buffers.get(socket, b"") + bytes(socket.readAll())
+        if not self._buffers[socket].endswith(b"\n"):
+            return
+
+        try:
+            command = json.loads(self._buffers[socket].decode("utf-8")).get("command")
+        except (ValueError, AttributeError):
+            command = None
+        self._buffers[socket] = b""
+
+        if command not in COMMANDS:
+            reply = {"ok": False, "message": f"Unknown command: {command!r}"}
+        else:
+            logger.info("Command from another launch: %s", command)
+            try:
+                reply = self.handler(command)
+            except Exception as e:
+                logger.exception("✗ Error handling command %s: %s", command, e)
+                reply = {"ok": False, "message": str(e)}
+
+        socket.write((json.dumps(reply, default=str) + "\n").encode("utf-8"))
+        socket.flush()
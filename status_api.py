@@ -0,0 +1,101 @@
+# ============================================================
+# File: status_api.py
+# ============================================================
+"""
+Local read-only status endpoint for external monitoring.
+
+    GET http://127.0.0.1:8771/status   -> current state snapshot (JSON)
+    GET http://127.0.0.1:8771/health   -> {"ok": true, "snapshot_age_seconds": ...}
+
+The launcher publishes one snapshot per tick; request threads only hand out
+the pre-serialised bytes, so any number of pollers never reach psutil, Win32
+or the Qt widgets.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_STATUS_PORT = 8771
+
+
+class StatusSnapshot:
+    """Latest status, serialised once when published"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._body = b"{}"
+        self._published_at = None
+
+    def publish(self, status):
+        body = json.dumps(status, default=str).encode("utf-8")
+        with self._lock:
+            self._body = body
+            self._published_at = time.monotonic()
+
+    def get(self):
+        """(json bytes, age in seconds or None)"""
+        with self._lock:
+            age = None if self._published_at is None else time.monotonic() - self._published_at
+            return self._body, age
+
+
+class _StatusHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class StatusServer:
+    """Serves a StatusSnapshot over HTTP on the loopback interface"""
+
+    def __init__(self, snapshot, port=DEFAULT_STATUS_PORT, host="127.0.0.1"):
+        self.snapshot = snapshot
+        self._server = _StatusHTTPServer((host, port), self._make_handler())
+        self._thread = None
+
+    @property
+    def address(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        snapshot = self.snapshot
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, fmt, *args):
+                logger.debug("status api %s - %s", self.address_string(), fmt % args)
+
+            def _send(self, code, body):
+                self.send_response(code)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Cache-Control", "no-store")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/status":
+                    body, _ = snapshot.get()
+                    self._send(200, body)
+                elif path == "/health":
+                    _, age = snapshot.get()
+                    age = round(age, 3) if age is not None else None
+                    self._send(200, json.dumps({"ok": age is not None, "snapshot_age_seconds": age}).encode("utf-8"))
+                else:
+                    self._send(404, b'{"error": "not found"}')
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name="status-api", daemon=True)
+        self._thread.start()
+        logger.info("✓ Status API listening on %s/status", self.address)
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
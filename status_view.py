@@ -0,0 +1,136 @@
+# ============================================================
+# File: status_view.py
+# ============================================================
+"""
+Status view-model: the main window labels, tray tooltip and tray menu
+texts are computed once per tick as plain values, and only fields that
+changed since they were last pushed to their widgets are handed out.
+
+Fields are grouped by where they are shown. A group whose widgets are
+hidden (window in the tray, tray menu closed) is simply not taken; its
+changes accumulate and are applied in one go when it is shown again.
+"""
+
+WINDOW_FIELDS = ("status_text", "status_color", "playtime_text", "game_status_text", "game_status_color",
+                 "timer_text", "profiles_text")
+TOOLTIP_FIELDS = ("tooltip",)
+TRAY_MENU_FIELDS = ("tray_status_text", "tray_playtime_text", "tray_toggle_text")
+
+_UNSET = object()
+
+FIELD_GROUPS = {
+    "window": WINDOW_FIELDS,
+    "tooltip": TOOLTIP_FIELDS,
+    "tray_menu": TRAY_MENU_FIELDS,
+}
+
+
+def format_timedelta(td):
+    """HH:MM:SS, clamped at zero"""
+    total_seconds = int(td.total_seconds())
+    if total_seconds < 0:
+        return "00:00:00"
+    hours = total_seconds // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+
+
+def build_status_view(tracking, config, now, game_running, next_reset, patcher_status=None,
+                      patch_progress=None, patch_wait=None, launch_queued_reason=None, profile_texts=None):
+    """
+    Compute every displayed status value.
+    patch_progress is a short progress text (e.g. "45% (~6m left)") while a patch runs;
+    patch_wait is (reason, seconds_remaining) while waiting to relaunch after a patcher exit;
+    launch_queued_reason is set while the default profile waits in the launch queue.
+    """
+    system_enabled = config.get("system_enabled", True)
+    requirement_met = tracking["requirement_met"]
+    game_started = tracking["game_started"]
+    total_seconds = tracking["total_playtime_seconds"] or 0
+    required = config["required_playtime_minutes"] or 30
+
+    if not system_enabled:
+        status_text, status_color = "⏸ System DISABLED", "red"
+    elif patch_wait:
+        remaining = patch_wait[1]
+        status_text, status_color = f"⏳ Waiting to relaunch ({remaining // 60}m {remaining % 60}s)", "orange"
+    elif requirement_met:
+        status_text, status_color = "✓ Daily requirement completed!", "green"
+    elif game_running:
+        status_text, status_color = "⏱ Playing now...", "blue"
+    elif game_started:
+        status_text, status_color = "⏸ Game closed (played today)", "gray"
+    else:
+        status_text, status_color = "⚠ Not started today", "orange"
+
+    playtime_text = f"Playtime: {total_seconds // 60}m {total_seconds % 60}s / {required}m"
+    if tracking["start_method"]:
+        playtime_text += f" ({tracking['start_method']})"
+
+    if not system_enabled:
+        game_status_text, game_status_color = "⏸ Automation disabled", "red"
+    elif patch_wait:
+        game_status_text, game_status_color = f"⏳ Will relaunch after {patch_wait[0]} ({patch_wait[1]}s)", "orange"
+    elif patcher_status == "patching":
+        game_status_text = f"⏳ Game is updating/patching... {patch_progress}" if patch_progress \
+            else "⏳ Game is updating/patching..."
+        game_status_color = "orange"
+    elif launch_queued_reason:
+        game_status_text, game_status_color = f"⏳ Launch queued ({launch_queued_reason})", "orange"
+    elif game_running:
+        game_status_text, game_status_color = "🎮 Game running", "green"
+    else:
+        game_status_text, game_status_color = "Game not running", "gray"
+
+    if not system_enabled:
+        tray_status = "⏸ DISABLED"
+    elif requirement_met:
+        tray_status = "✓ Complete"
+    elif game_running:
+        tray_status = "⏱ Playing"
+    elif game_started:
+        tray_status = "⏸ Closed"
+    else:
+        tray_status = "⚠ Pending"
+
+    return {
+        "status_text": status_text,
+        "status_color": status_color,
+        "playtime_text": playtime_text,
+        "game_status_text": game_status_text,
+        "game_status_color": game_status_color,
+        "timer_text": f"Next reset: {format_timedelta(next_reset - now)}",
+        "profiles_text": " | ".join(profile_texts) if profile_texts else None,
+        "tooltip": f"WW Launcher - {tray_status}\nPlaytime: {total_seconds // 60}m",
+        "tray_status_text": f"Status: {tray_status}",
+        "tray_playtime_text": f"Playtime: {total_seconds // 60}m/{config['required_playtime_minutes']}m",
+        "tray_toggle_text": "Disable System" if system_enabled else "Enable System",
+    }
+
+
+class StatusViewModel:
+    """Latest computed view state plus what each widget group last received"""
+
+    def __init__(self):
+        self.state = {}
+        self._applied = {group: {} for group in FIELD_GROUPS}
+
+    def update(self, state):
+        self.state = state
+
+    def take_changes(self, group):
+        """Fields of `group` that differ from what was last applied; marks them applied"""
+        applied = self._applied[group]
+        changes = {}
+        for field in FIELD_GROUPS[group]:
+            if field in self.state and applied.get(field, _UNSET) != self.state[field]:
+                changes[field] = self.state[field]
+        applied.update(changes)
+        return changes
+
+    def invalidate(self, group=None):
+        """Forget what was applied, so the next take_changes returns every field"""
+        for name in ([group] if group else FIELD_GROUPS):
+            self._applied[name].clear()
+
@@ -0,0 +1,230 @@
+# ============================================================
+# File: window_state.py
+# ============================================================
+"""
+Window-state probe run before each login-check capture.
+
+A desktop grab (capture_backend "screen") of a window that is minimized,
+cloaked (on another virtual desktop), covered by the foreground window or
+partly off every monitor returns whatever else is on screen, and OCR still
+spends its time on it. The probe reads the window's state first:
+
+- minimized or cloaked: nothing can be captured, the check is skipped;
+- covered or off-screen: the window is rendered with the background
+  backend (PrintWindow) instead, or skipped if that isn't available.
+
+Skipped checks are reported with a reason ("minimized", "cloaked",
+"covered", "off_screen") and don't count against the login-check budget.
+The Win32 calls sit behind a small backend interface; FakeWindowBackend
+stands in for them on other platforms and in the check script.
+"""
+import ctypes
+
+from log_manager import get_logger
+
+logger = get_logger(__name__)
+
+try:
+    import win32api
+    import win32gui
+    import win32process
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+DWMWA_CLOAKED = 14
+
+SKIP_MINIMIZED = "minimized"
+SKIP_CLOAKED = "cloaked"
+SKIP_COVERED = "covered"
+SKIP_OFF_SCREEN = "off_screen"
+
+REASON_TEXT = {
+    SKIP_MINIMIZED: "game window is minimized",
+    SKIP_CLOAKED: "game window is on another desktop",
+    SKIP_COVERED: "game window is covered",
+    SKIP_OFF_SCREEN: "game window is off-screen",
+}
+
+
+def intersection_area(a, b):
+    """Overlap of two (left, top, right, bottom) rectangles"""
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    return width * height if width > 0 and height > 0 else 0
+
+
+class Win32WindowBackend:
+    """Window state from user32/dwmapi"""
+
+    def is_minimized(self, hwnd):
+        return bool(win32gui.IsIconic(hwnd))
+
+    def is_cloaked(self, hwnd):
+        cloaked = ctypes.c_int(0)
+        try:
+            result = ctypes.windll.dwmapi.DwmGetWindowAttribute(
+                hwnd, DWMWA_CLOAKED, ctypes.byref(cloaked), ctypes.sizeof(cloaked))
+        except (AttributeError, OSError):
+            return False  # no DWM (pre-Vista) - nothing is cloaked
+        return result == 0 and cloaked.value != 0
+
+    def foreground_window(self):
+        return win32gui.GetForegroundWindow() or None
+
+    def window_rect(self, hwnd):
+        return win32gui.GetWindowRect(hwnd)
+
+    def window_pid(self, hwnd):
+        return win32process.GetWindowThreadProcessId(hwnd)[1]
+
+    def monitor_rects(self):
+        return [tuple(rect) for _, _, rect in win32api.EnumDisplayMonitors()]
+
+
+class FakeWindowBackend:
+    """
+    Scripted window state for tests and non-Windows runs:
+        backend = FakeWindowBackend(monitors=[(0, 0, 1920, 1080)])
+        backend.add_window(1, (0, 0, 1280, 720), pid=100)
+        backend.add_window(2, (100, 100, 900, 700), pid=200)
+        backend.foreground = 2                  # window 2 now covers the game
+    """
+
+    def __init__(self, monitors=((0, 0, 1920, 1080),)):
+        self.monitors = [tuple(rect) for rect in monitors]
+        self.windows = {}
+        self.foreground = None
+
+    def add_window(self, hwnd, rect, pid=0, minimized=False, cloaked=False):
+        self.windows[hwnd] = {"rect": tuple(rect), "pid": pid, "minimized": minimized, "cloaked": cloaked}
+        return hwnd
+
+    def set(self, hwnd, **state):
+        self.windows[hwnd].update(state)
+
+    def is_minimized(self, hwnd):
+        return self.windows[hwnd]["minimized"]
+
+    def is_cloaked(self, hwnd):
+        return self.windows[hwnd]["cloaked"]
+
+    def foreground_window(self):
+        return self.foreground
+
+    def window_rect(self, hwnd):
+        return self.windows[hwnd]["rect"]
+
+    def window_pid(self, hwnd):
+        return self.windows[hwnd]["pid"]
+
+    def monitor_rects(self):
+        return list(self.monitors)
+
+
+class WindowState:
+    """What the probe saw of one window"""
+
+    __slots__ = ("minimized", "cloaked", "foreground", "covered", "visible_fraction")
+
+    def __init__(self, minimized=False, cloaked=False, foreground=True, covered=False, visible_fraction=1.0):
+        self.minimized = minimized
+        self.cloaked = cloaked
+        self.foreground = foreground
+        self.covered = covered
+        self.visible_fraction = visible_fraction
+
+    def __repr__(self):
+        return (f"WindowState(minimized={self.minimized}, cloaked={self.cloaked}, "
+                f"foreground={self.foreground}, covered={self.covered}, "
+                f"visible={self.visible_fraction:.2f})")
+
+
+class WindowStateProbe:
+    """Decides, per login check, whether and how the game window can be captured"""
+
+    def __init__(self, backend=None, min_visible_fraction=0.98):
+        self.backend = backend if backend is not None else (Win32WindowBackend() if WIN32_AVAILABLE else None)
+        self.min_visible_fraction = min_visible_fraction
+        self.last_reason = None
+        self.skips = {}
+
+    @classmethod
+    def from_config(cls, config, backend=None):
+        return cls(backend, min_visible_fraction=config.get("window_min_visible_fraction", 0.98))
+
+    def probe(self, hwnd):
+        """WindowState of hwnd, or None when there is no backend to ask"""
+        backend = self.backend
+        if backend is None:
+            return None
+
+        state = WindowState(minimized=backend.is_minimized(hwnd), cloaked=backend.is_cloaked(hwnd))
+        if state.minimized:
+            return state
+
+        rect = backend.window_rect(hwnd)
+        area = max(1, (rect[2] - rect[0]) * (rect[3] - rect[1]))
+        # Monitors don't overlap, so the per-monitor overlaps add up
+        visible = sum(intersection_area(rect, monitor) for monitor in backend.monitor_rects())
+        state.visible_fraction = min(1.0, visible / area)
+
+        foreground = backend.foreground_window()
+        state.foreground = foreground == hwnd
+        if foreground and not state.foreground:
+            # The game's own dialogs (e.g. Notice) don't count as covering it
+            same_process = backend.window_pid(foreground) == backend.window_pid(hwnd)
+            state.covered = not same_process and intersection_area(rect, backend.window_rect(foreground)) > 0
+        return state
+
+    def decide(self, state, capture_backend="screen", background_capture=True):
+        """
+        (backend, reason) for one check: backend is None to skip the check.
+        A reason alongside a backend means the screen can't be used, so a
+        failed background capture must not fall back to a desktop grab.
+        """
+        if state is None:
+            return capture_backend, None
+        if state.minimized:
+            return None, SKIP_MINIMIZED
+        if state.cloaked:
+            return None, SKIP_CLOAKED
+
+        reason = None
+        if state.visible_fraction < self.min_visible_fraction:
+            reason = SKIP_OFF_SCREEN
+        elif state.covered:
+            reason = SKIP_COVERED
+        if reason is None:
+            return capture_backend, None
+        if capture_backend == "window" or background_capture:
+            return "window", reason
+        return None, reason
+
+    def check(self, hwnd, capture_backend="screen", background_capture=True):
+        """probe() + decide(), logging when the outcome changes and counting skips"""
+        try:
+            state = self.probe(hwnd)
+        except Exception as e:
+            logger.debug("Window state probe failed: %s", e)
+            state = None
+        backend, reason = self.decide(state, capture_backend, background_capture)
+
+        if reason != self.last_reason:
+            if reason is None:
+                logger.debug("Game window capturable again")
+            elif backend is None:
+                logger.info("⚠ Login check skipped: %s", REASON_TEXT[reason])
+            elif backend != capture_backend:
+                logger.info("%s - using background capture", REASON_TEXT[reason].capitalize())
+            self.last_reason = reason
+        if backend is None:
+            self.skips[reason] = self.skips.get(reason, 0) + 1
+            logger.debug("Window state %s: skipped (%s)", state, reason)
+        return backend, reason
+
+    def status_text(self):
+        """Diagnostics line with skipped checks per reason, or None"""
+        if not self.skips:
+            return None
+        return "Skipped checks: " + ", ".join(f"{reason} {count}" for reason, count in sorted(self.skips.items()))